@@ -1,6 +1,6 @@
 """Coordinator agent - determines onboarding phase and routes to appropriate agents."""
 
-from datetime import datetime, date
+from datetime import date, datetime, timedelta
 from typing import Literal
 
 from langchain_core.messages import HumanMessage
@@ -29,6 +29,21 @@ def determine_phase(days_until_start: int) -> Literal[
         return "post_start"
 
 
+# Days until start at which determine_phase moves to the next phase
+PHASE_BOUNDARIES = (14, 7, -1)
+
+
+def next_phase_boundary(start_date_str: str, today: date | None = None) -> date | None:
+    """Date of the hire's next phase change after ``today``, or None once post-start."""
+    start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+    today = today or date.today()
+    for days in PHASE_BOUNDARIES:
+        boundary = start_date - timedelta(days=days)
+        if boundary > today:
+            return boundary
+    return None
+
+
 def coordinator_agent(state: OnboardingState) -> OnboardingState:
     """
     Coordinator agent that determines the onboarding phase.
@@ -0,0 +1 @@
+"""Offline benchmarks for the onboarding backend."""
@@ -0,0 +1,124 @@
+"""Benchmark the streaming task export against loading every state.
+
+Fills an in-memory store with hires carrying a full task list, then exports
+one row per task and reports throughput and peak traced memory for the
+streaming exporter (CSV, and Parquet when pyarrow is installed) against the
+``list_states`` approach it replaces. The exporter's peak should stay flat as
+the number of hires grows. Run from the backend directory:
+    python -m benchmarks.bench_analytics --hires 2000 10000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any, TypeVar, cast
+
+from agents.hr_agent import HR_TASKS
+from agents.it_agent import IT_TASKS
+from agents.manager_agent import MANAGER_TASKS
+from agents.state import OnboardingState
+from agents.training_agent import TRAINING_TASKS
+from integrations.analytics import CSV, PARQUET, CompletionReport, default_format, export_tasks
+from integrations.local_store import InMemoryOnboardingStore
+
+ALL_TASKS = IT_TASKS + HR_TASKS + MANAGER_TASKS + TRAINING_TASKS
+DEPARTMENTS = ["Engineering", "Sales", "Finance", "Operations", "HR"]
+
+T = TypeVar("T")
+
+
+def make_state(i: int) -> OnboardingState:
+    """A hire whose tasks completed at random offsets from creation."""
+    created = datetime(2026, 1, 1) + timedelta(hours=i % 500)
+    tasks: list[dict[str, Any]] = []
+    for task in ALL_TASKS:
+        done = random.random() < 0.8
+        tasks.append(
+            {
+                **task,
+                "status": "completed" if done else "pending",
+                "assigned_to": "IT Department",
+                "due_date": "2026-03-01",
+                "completed_at": (created + timedelta(hours=random.expovariate(1 / 36))).isoformat()
+                if done
+                else None,
+                "notes": f"Auto-provisioned for Hire {i}",
+            }
+        )
+    state = {
+        "new_hire_id": f"nh-{i}",
+        "new_hire_name": f"Hire {i}",
+        "email": f"hire{i}@company.com",
+        "role": "Engineer",
+        "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+        "start_date": "2026-03-01",
+        "manager_id": f"mgr-{i % 200}",
+        "current_phase": "active_preparation",
+        "tasks": tasks,
+        "completed_tasks": [t["id"] for t in tasks if t["status"] == "completed"],
+        "pending_tasks": [t["id"] for t in tasks if t["status"] != "completed"],
+        "messages": [],
+        "created_at": created.isoformat(),
+        "updated_at": created.isoformat(),
+        "errors": [],
+    }
+    return cast(OnboardingState, state)
+
+
+def traced(run: Callable[[], T]) -> tuple[T, float, float]:
+    """Run ``run`` twice: timed, then under tracemalloc. Returns (result, seconds, peak MB)."""
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hires", type=int, nargs="+", default=[2000, 10000])
+    args = parser.parse_args()
+
+    formats = [CSV] + ([PARQUET] if default_format() == PARQUET else [])
+    for hires in args.hires:
+        store = InMemoryOnboardingStore()
+        for i in range(hires):
+            store.create_state(make_state(i))
+
+        _, elapsed, peak = traced(lambda st=store, n=hires: st.list_states(limit=n))
+        print(f"{hires} hires, list_states:        {elapsed * 1000:9.1f} ms  peak {peak:7.1f} MB")
+
+        for file_format in formats:
+            with tempfile.TemporaryDirectory() as directory:
+                result, elapsed, peak = traced(
+                    lambda st=store, d=directory, f=file_format: export_tasks(st, d, file_format=f)
+                )
+            print(
+                f"{hires} hires, export {file_format:8s}:    {elapsed * 1000:9.1f} ms  "
+                f"peak {peak:7.1f} MB  ({result.rows / elapsed / 1000:.0f}k rows/s)"
+            )
+
+        report = CompletionReport(by=("department", "category"))
+        with tempfile.TemporaryDirectory() as directory:
+            export_tasks(store, directory, file_format=CSV, reports=[report])
+        samples = report.samples
+        try:
+            start = time.perf_counter()
+            groups = report.percentiles()
+            print(
+                f"  percentiles, {len(groups)} groups over {samples} completions "
+                f"({samples * 8 / 1e6:.1f} MB): {(time.perf_counter() - start) * 1000:.1f} ms"
+            )
+        except ImportError as e:
+            print(f"  percentiles skipped: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark bulk state creation against the per-item create loop.
+
+Uses a stand-in container that sleeps for a fixed round-trip latency per
+request, so the numbers reflect round trips saved and concurrency gained
+rather than local CPU. Run from the backend directory:
+    python -m benchmarks.bench_bulk_writes --documents 10000 --latency-ms 5
+"""
+
+import argparse
+import os
+import time
+from typing import Any
+from unittest.mock import patch
+
+from agents.state import OnboardingState
+from integrations.cosmos import OnboardingCosmosClient
+from integrations.throttling import AdaptiveRateLimiter
+
+
+class LatencyContainer:
+    """Container stand-in that simulates one network round trip per call."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.round_trips = 0
+
+    def _round_trip(self) -> None:
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def create_item(self, body: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+        self._round_trip()
+        return body
+
+    def upsert_item(self, body: dict[str, Any], **kwargs: Any) -> dict[str, Any]:
+        self._round_trip()
+        return body
+
+
+def make_state(i: int) -> OnboardingState:
+    """Build a synthetic onboarding state."""
+    return {
+        "new_hire_id": f"nh-{i}",
+        "new_hire_name": f"Hire {i}",
+        "email": f"hire{i}@company.com",
+        "role": "Engineer",
+        "department": "Engineering",
+        "start_date": "2026-03-01",
+        "manager_id": f"mgr-{i % 100}",
+        "current_phase": "pre_onboarding",
+        "tasks": [],
+        "completed_tasks": [],
+        "pending_tasks": [],
+        "messages": [],
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+        "errors": [],
+    }
+
+
+def make_client(container: LatencyContainer) -> OnboardingCosmosClient:
+    """Build a client wired to the stand-in container without throttling."""
+    os.environ.setdefault("COSMOS_ENDPOINT", "https://localhost:8081/")
+    os.environ.setdefault("COSMOS_KEY", "benchmark")
+    with patch("integrations.cosmos.CosmosClient"):
+        client = OnboardingCosmosClient(rate_limiter=AdaptiveRateLimiter(rate=1_000_000))
+    client.container = container  # type: ignore[assignment]
+    return client
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    states = [make_state(i) for i in range(args.documents)]
+    latency = args.latency_ms / 1000
+
+    container = LatencyContainer(latency)
+    client = make_client(container)
+    start = time.perf_counter()
+    for state in states:
+        client.create_state(state)
+    loop_seconds = time.perf_counter() - start
+    print(
+        f"per-item loop:   {args.documents / loop_seconds:10.0f} docs/s "
+        f"({container.round_trips} round trips, {loop_seconds:.2f}s)"
+    )
+
+    container = LatencyContainer(latency)
+    client = make_client(container)
+    start = time.perf_counter()
+    results = client.create_states_bulk(states, max_concurrency=args.concurrency)
+    bulk_seconds = time.perf_counter() - start
+    assert all(r.ok for r in results)
+    print(
+        f"bulk (c={args.concurrency}):   {args.documents / bulk_seconds:10.0f} docs/s "
+        f"({container.round_trips} round trips, {bulk_seconds:.2f}s)"
+    )
+    print(f"speedup:         {loop_seconds / bulk_seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark response compression on realistic onboarding states.
+
+Builds serialized states of increasing size (tasks with notes, agent
+messages), then reports bytes on the wire and CPU time per response for
+pretty-printed and compact JSON at several gzip levels and, when the brotli
+package is installed, brotli qualities. Run from the backend directory:
+    python -m benchmarks.bench_compression --repeat 200
+"""
+
+import argparse
+import gzip
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from agents.hr_agent import HR_TASKS
+from agents.it_agent import IT_TASKS
+from agents.manager_agent import MANAGER_TASKS
+from agents.training_agent import TRAINING_TASKS
+from integrations.compression import brotli
+
+ALL_TASKS = IT_TASKS + HR_TASKS + MANAGER_TASKS + TRAINING_TASKS
+
+Codec = Callable[[bytes], bytes]
+
+
+def make_state(index: int, tasks: int, messages: int) -> dict[str, Any]:
+    """A serialized state shaped like serialize_state output."""
+    name = f"Hire Number {index}"
+    now = datetime(2026, 2, 1, 9, 30).isoformat()
+    task_docs = [
+        {
+            **ALL_TASKS[i % len(ALL_TASKS)],
+            "status": "completed",
+            "assigned_to": "IT Department",
+            "due_date": "2026-03-01",
+            "completed_at": now,
+            "notes": f"Auto-provisioned for {name}",
+        }
+        for i in range(tasks)
+    ]
+    return {
+        "new_hire_id": f"nh-{index:06d}",
+        "new_hire_name": name,
+        "email": f"hire.{index}@company.com",
+        "role": "Senior Software Engineer",
+        "department": "Engineering",
+        "start_date": "2026-03-01",
+        "manager_id": "mgr-001",
+        "current_phase": "active_preparation",
+        "tasks": task_docs,
+        "completed_tasks": [t["id"] for t in task_docs],
+        "pending_tasks": [],
+        "messages": [
+            f"[{['IT', 'HR', 'Manager', 'Training'][i % 4]} Agent] Completed: "
+            f"{ALL_TASKS[i % len(ALL_TASKS)]['name']} for {name}"
+            for i in range(messages)
+        ],
+        "created_at": now,
+        "updated_at": now,
+        "errors": [],
+    }
+
+
+def timed(compress: Codec, body: bytes, repeat: int) -> tuple[int, float]:
+    out = b""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = compress(body)
+    return len(out), (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    codecs: list[tuple[str, Codec]] = [
+        (f"gzip-{level}", lambda b, level=level: gzip.compress(b, level, mtime=0))
+        for level in (1, 5, 6, 9)
+    ]
+    if brotli is not None:
+        codecs.extend(
+            (f"br-{q}", lambda b, q=q: brotli.compress(b, quality=q)) for q in (1, 4, 6, 11)
+        )
+
+    for label, tasks, messages in [("small", 5, 5), ("typical", 24, 40), ("large", 60, 120)]:
+        state = make_state(1, tasks, messages)
+        for layout, body in [
+            ("pretty", json.dumps(state, indent=2).encode()),
+            ("compact", json.dumps(state, separators=(",", ":")).encode()),
+        ]:
+            print(f"{label} ({tasks} tasks, {messages} messages), {layout}: {len(body)} bytes")
+            for name, compress in codecs:
+                size, micros = timed(compress, body, args.repeat)
+                print(f"  {name:8s} {size:7d} bytes ({size / len(body):5.1%})  {micros:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
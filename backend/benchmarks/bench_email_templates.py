@@ -0,0 +1,72 @@
+"""Benchmark welcome email rendering throughput.
+
+Compares the previous inline f-string construction with the cached template
+subsystem, both per message and through ``render_bulk``, plus a worst case
+that re-checks template modification times on every render. Run from the
+backend directory:
+    python -m benchmarks.bench_email_templates --messages 10000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from integrations.email_templates import EmailTemplates
+
+
+def inline(context: dict[str, str]) -> tuple[str, str, str]:
+    """The original f-string construction, for reference."""
+    name, start_date = context["name"], context["start_date"]
+    return (
+        f"Welcome to the team, {name}!",
+        (
+            f"Hi {name},\n\nWelcome to the company! We're excited to have you join us on "
+            f"{start_date}.\n\nYour onboarding process has been initiated. You'll receive "
+            f"updates as tasks are completed.\n\nBest regards,\nHR Team\n"
+        ),
+        (
+            f"<html>\n<body>\n<h1>Welcome, {name}!</h1>\n<p>We're excited to have you join us "
+            f"on <strong>{start_date}</strong>.</p>\n<p>Your onboarding process has been "
+            f"initiated.</p>\n<p>Best regards,<br>HR Team</p>\n</body>\n</html>"
+        ),
+    )
+
+
+def timed(label: str, count: int, render: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+    print(f"{label:28s} {count / elapsed:10.0f} msgs/s ({elapsed * 1000:.1f} ms)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=10000)
+    args = parser.parse_args()
+
+    contexts = [
+        {"name": f"Hire {i}", "start_date": "2026-03-01", "department": "Engineering"}
+        for i in range(args.messages)
+    ]
+    cached = EmailTemplates()
+    uncached = EmailTemplates(check_interval=0)
+    cached.render("welcome_email", contexts[0])  # warm the cache
+
+    timed("inline f-strings", args.messages, lambda: [inline(c) for c in contexts])
+    timed(
+        "render (cached)",
+        args.messages,
+        lambda: [cached.render("welcome_email", c) for c in contexts],
+    )
+    timed(
+        "render_bulk (cached)", args.messages, lambda: cached.render_bulk("welcome_email", contexts)
+    )
+    timed(
+        "render (mtime check each)",
+        args.messages,
+        lambda: [uncached.render("welcome_email", c) for c in contexts],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark SMTP delivery with and without session pooling.
+
+Runs a local SMTP stand-in that delays each new connection to simulate the
+TCP/TLS handshake of a real relay, then sends the same messages once opening
+a session per message and once over pooled sessions. Run from the backend
+directory:
+    python -m benchmarks.bench_email_transport --messages 500 --handshake-ms 20
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.smtp_stub import LocalSMTPServer
+from integrations.email import EmailMessage
+from integrations.email_transport import SMTPTransport
+
+
+def run(server: LocalSMTPServer, messages: list[EmailMessage], pooled: bool, senders: int) -> float:
+    """Send every message and return messages per second."""
+    transport = SMTPTransport(
+        "127.0.0.1", server.port, starttls=False, pool_size=senders, pooled=pooled
+    )
+
+    def deliver(message: EmailMessage) -> bool:
+        return transport.send(message, "noreply@company.com")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=senders) as executor:
+        assert all(executor.map(deliver, messages))
+    elapsed = time.perf_counter() - start
+    transport.close()
+    label = "pooled" if pooled else "unpooled"
+    print(
+        f"{label:9s} {len(messages) / elapsed:10.0f} msgs/s "
+        f"({transport.connections_opened} connections, {elapsed:.2f}s)"
+    )
+    return len(messages) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    parser.add_argument("--senders", type=int, default=4)
+    args = parser.parse_args()
+
+    messages = [
+        EmailMessage(to=f"hire{i}@company.com", subject=f"Welcome {i}", body="Hello")
+        for i in range(args.messages)
+    ]
+    with LocalSMTPServer(connect_delay=args.handshake_ms / 1000) as server:
+        unpooled = run(server, messages, pooled=False, senders=args.senders)
+        pooled = run(server, messages, pooled=True, senders=args.senders)
+    print(f"speedup:  {pooled / unpooled:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark request latency in synchronous and background job mode.
+
+Simulates a burst of create requests against a handler that spends
+``--agent-ms`` per request (standing in for agent I/O). In synchronous mode
+each request waits for the handler; in job mode the request only records the
+job, and a pool of in-process workers drains the queue. Reports request
+latency and the time until every request has finished. Run from the backend
+directory:
+    python -m benchmarks.bench_jobs --requests 200 --agent-ms 50
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any
+
+from integrations.jobs import InProcessJobQueue, JobService
+from integrations.local_store import InMemoryOnboardingStore
+
+
+def report(label: str, latencies: list[float], total: float) -> None:
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(
+        f"{label:10s} request p50={statistics.median(latencies):8.2f} ms  "
+        f"p99={p99:8.2f} ms  all done in {total:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--agent-ms", type=float, default=50.0)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    def handler(request: dict[str, Any]) -> dict[str, Any]:
+        time.sleep(args.agent_ms / 1000)
+        return request
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for i in range(args.requests):
+        begin = time.perf_counter()
+        handler({"new_hire_id": f"nh-{i}"})
+        latencies.append((time.perf_counter() - begin) * 1000)
+    report("sync", latencies, time.perf_counter() - start)
+
+    service = JobService(InMemoryOnboardingStore(), {"create": handler})
+    service.job_queue = InProcessJobQueue(service.run, args.workers)
+    latencies = []
+    start = time.perf_counter()
+    for i in range(args.requests):
+        begin = time.perf_counter()
+        service.submit("create", f"nh-{i}", {"new_hire_id": f"nh-{i}"})
+        latencies.append((time.perf_counter() - begin) * 1000)
+    service.job_queue.join()
+    report("job mode", latencies, time.perf_counter() - start)
+    service.job_queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark task ledger replay with and without snapshots.
+
+Generates a long history of task transitions for one hire, then reports the
+time to fold every event from the base snapshot and the latency of a ledger
+read when snapshots are taken every N events (worst case: N - 1 events since
+the last snapshot). Also compares the bytes written per transition with
+rewriting the full task list. Run from the backend directory:
+    python -m benchmarks.bench_ledger --events 1000000
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from integrations.ledger import TaskLedger, TaskView, task_event_id
+from integrations.local_store import InMemoryOnboardingStore
+
+HIRE = "nh-000001"
+STATUSES = ["pending", "in_progress", "completed"]
+
+
+def make_events(count: int, tasks: int) -> Iterator[dict[str, Any]]:
+    """Transitions cycling through ``tasks`` tasks; first sight carries the task fields."""
+    for seq in range(1, count + 1):
+        task = f"task-{seq % tasks:03d}"
+        event: dict[str, Any] = {
+            "id": task_event_id(HIRE, seq),
+            "partitionKey": HIRE,
+            "type": "task_event",
+            "new_hire_id": HIRE,
+            "seq": seq,
+            "task_id": task,
+            "status": STATUSES[(seq // tasks) % len(STATUSES)],
+            "actor": "IT Department",
+            "at": "2026-02-01T09:00:00",
+        }
+        if seq <= tasks:
+            event["fields"] = {
+                "name": f"Task {task}",
+                "category": "it",
+                "assigned_to": "IT Department",
+                "due_date": "2026-03-01",
+                "completed_at": None,
+                "notes": "",
+            }
+        yield event
+
+
+def load_store(
+    events: list[dict[str, Any]], snapshot_every: int, chunk: int = 10000
+) -> InMemoryOnboardingStore:
+    """Store holding ``events`` with the last snapshot ``snapshot_every - 1`` events back."""
+    store = InMemoryOnboardingStore()
+    view = TaskView()
+    store.append_task_events(HIRE, [], view.snapshot(HIRE, "2026-02-01T09:00:00"))
+    cut = len(events) - (snapshot_every - 1)
+    for start in range(0, cut, chunk):
+        batch = events[start : min(start + chunk, cut)]
+        for event in batch:
+            view.apply(event)
+        snapshot = view.snapshot(HIRE, "2026-02-01T09:00:00") if start + chunk >= cut else None
+        store.append_task_events(HIRE, batch, snapshot)
+    store.append_task_events(HIRE, events[cut:])
+    return store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    events = list(make_events(args.events, args.tasks))
+
+    start = time.perf_counter()
+    view = TaskView()
+    for event in events:
+        view.apply(event)
+    full = time.perf_counter() - start
+    print(
+        f"full replay ({args.events} events):  {full * 1000:10.1f} ms "
+        f"({args.events / full / 1e6:.2f} M events/s)"
+    )
+
+    for snapshot_every in (50, 1000):
+        ledger = TaskLedger(load_store(events, snapshot_every), snapshot_every)
+        current = None
+        start = time.perf_counter()
+        for _ in range(args.reads):
+            current = ledger.view(HIRE)
+        read = (time.perf_counter() - start) / args.reads
+        assert current is not None and current.state_fields() == view.state_fields()
+        print(f"read, snapshot every {snapshot_every:5d}:    {read * 1e6:10.1f} us")
+
+    transition = json.dumps(events[-1], separators=(",", ":"))
+    task_list = json.dumps(view.state_fields(), separators=(",", ":"))
+    print(f"bytes per transition: event {len(transition)}, full task fields {len(task_list)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark MCP tool latency under concurrent HTTP clients.
+
+Serves the MCP server over streamable HTTP in-process and drives it with N
+simulated clients, each issuing a mix of slow ``advance_phase`` calls (the
+graph is replaced by a stand-in that spends ``--step-ms`` per superstep) and
+fast ``get_onboarding_status`` calls. Reports p50/p99 latency per tool, which
+shows whether slow graph runs hold up quick lookups. Run from the backend
+directory:
+    python -m benchmarks.bench_mcp_http --clients 20 --calls 10
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import uvicorn
+from fastmcp import Client
+
+import mcp_server
+from agents.state import OnboardingState
+from integrations.local_store import InMemoryOnboardingStore
+
+
+def slow_graph(steps: int, step_seconds: float) -> MagicMock:
+    """Graph stand-in that blocks for a fixed time per superstep."""
+
+    def stream(state: dict[str, Any], stream_mode: list[str]) -> Iterator[tuple[str, Any]]:
+        for _ in range(steps):
+            time.sleep(step_seconds)
+            yield ("updates", {"coordinator": {}})
+            yield ("values", state)
+
+    graph = MagicMock()
+    graph.stream.side_effect = stream
+    return graph
+
+
+def make_state(new_hire_id: str) -> OnboardingState:
+    """Build a synthetic onboarding state."""
+    return {
+        "new_hire_id": new_hire_id,
+        "new_hire_name": f"Hire {new_hire_id}",
+        "email": f"{new_hire_id.lower()}@company.com",
+        "role": "Engineer",
+        "department": "Engineering",
+        "start_date": "2026-03-01",
+        "manager_id": "mgr-1",
+        "current_phase": "pre_onboarding",
+        "tasks": [],
+        "completed_tasks": [],
+        "pending_tasks": [],
+        "messages": [],
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+        "errors": [],
+    }
+
+
+def seeded_store(clients: int, calls: int) -> InMemoryOnboardingStore:
+    """In-memory store holding every hire the clients will look up."""
+    store = InMemoryOnboardingStore()
+    for index in range(clients):
+        for call in range(calls):
+            store.create_state(make_state(f"NH-{index}-{call}"))
+    return store
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_listening(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise TimeoutError(f"MCP server did not start on port {port}")
+
+
+async def run_client(url: str, index: int, calls: int, latencies: dict[str, list[float]]) -> None:
+    """One simulated client: every fourth call is a slow graph run."""
+    async with Client(url) as client:
+        for call in range(calls):
+            tool = "advance_phase" if call % 4 == 0 else "get_onboarding_status"
+            start = time.perf_counter()
+            await client.call_tool(tool, {"new_hire_id": f"NH-{index}-{call}"})
+            latencies[tool].append((time.perf_counter() - start) * 1000)
+
+
+def percentile(values: list[float], q: int) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=5)
+    parser.add_argument("--step-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/mcp"
+    latencies: dict[str, list[float]] = {"advance_phase": [], "get_onboarding_status": []}
+
+    with (
+        patch("agents.graph.onboarding_graph", slow_graph(args.steps, args.step_ms / 1000)),
+        patch("integrations.store._store", seeded_store(args.clients, args.calls)),
+    ):
+        server = uvicorn.Server(
+            uvicorn.Config(
+                mcp_server.mcp.http_app(transport="streamable-http"),
+                host="127.0.0.1",
+                port=port,
+                log_level="warning",
+            )
+        )
+        serving = asyncio.create_task(server.serve())
+        await wait_until_listening(port)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(run_client(url, i, args.calls, latencies) for i in range(args.clients))
+        )
+        elapsed = time.perf_counter() - start
+        server.should_exit = True
+        await serving
+
+    total = sum(len(v) for v in latencies.values())
+    print(
+        f"{args.clients} clients, {total} calls in {elapsed:.2f}s ({total / elapsed:.0f} calls/s)"
+    )
+    for tool, values in latencies.items():
+        print(
+            f"{tool:24s} n={len(values):5d}  p50={percentile(values, 50):8.1f} ms  "
+            f"p99={percentile(values, 99):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
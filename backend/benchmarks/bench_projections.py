@@ -0,0 +1,100 @@
+"""Benchmark change-feed projections against full scans.
+
+Run from the backend directory:
+    python -m benchmarks.bench_projections --hires 20000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from typing import Literal
+
+from agents.state import OnboardingState
+from integrations.local_store import InMemoryOnboardingStore
+from integrations.projections import ChangeFeedProcessor, OnboardingProjections
+
+Phase = Literal["pre_onboarding", "active_preparation", "immediate_prep", "post_start"]
+PHASES: list[Phase] = ["pre_onboarding", "active_preparation", "immediate_prep", "post_start"]
+DEPARTMENTS = ["Engineering", "Sales", "Finance", "Operations", "HR"]
+
+
+def make_state(i: int) -> OnboardingState:
+    """Build a synthetic onboarding state."""
+    return {
+        "new_hire_id": f"nh-{i}",
+        "new_hire_name": f"Hire {i}",
+        "email": f"hire{i}@company.com",
+        "role": "Engineer",
+        "department": random.choice(DEPARTMENTS),
+        "start_date": "2026-03-01",
+        "manager_id": f"mgr-{i % 200}",
+        "current_phase": random.choice(PHASES),
+        "tasks": [
+            {
+                "id": f"it-00{n}",
+                "name": "task",
+                "category": "it",
+                "status": "pending",
+                "assigned_to": None,
+                "due_date": "2026-02-20",
+                "completed_at": None,
+                "notes": "",
+            }
+            for n in range(5)
+        ],
+        "completed_tasks": [],
+        "pending_tasks": [],
+        "messages": [],
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+        "errors": [],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hires", type=int, default=20000)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    store = InMemoryOnboardingStore()
+    for i in range(args.hires):
+        store.create_state(make_state(i))
+
+    projections = OnboardingProjections()
+    processor = ChangeFeedProcessor(store, projections, batch_size=args.batch_size)
+    start = time.perf_counter()
+    processor.run_until_caught_up()
+    initial = time.perf_counter() - start
+
+    for i in random.sample(range(args.hires), args.updates):
+        state = make_state(i)
+        state["current_phase"] = "immediate_prep"
+        store.update_state(state)
+
+    start = time.perf_counter()
+    processor.run_until_caught_up()
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    projections.count("immediate_prep", "Engineering")
+    projection_read = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan = Counter(
+        (s["current_phase"], s["department"]) for s in store.list_states(limit=args.hires)
+    )
+    full_scan = time.perf_counter() - start
+    assert scan[("immediate_prep", "Engineering")] == projections.count(
+        "immediate_prep", "Engineering"
+    )
+
+    print(f"initial catch-up ({args.hires} docs):   {initial * 1000:10.1f} ms")
+    print(f"incremental ({args.updates} changes):     {incremental * 1000:10.1f} ms")
+    print(f"projection read:                  {projection_read * 1e6:10.1f} us")
+    print(f"full scan equivalent:             {full_scan * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
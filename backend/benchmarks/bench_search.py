@@ -0,0 +1,170 @@
+"""Benchmark the hire search index against scanning every state.
+
+Indexes synthetic hires, then reports the cost of indexing one update and the
+latency of typical queries (full name, first-name prefix, name plus
+department) next to the ``list_states`` scan that name lookups needed before.
+A department-only query, matching a fifth of all hires, shows the worst case.
+Run from the backend directory:
+    python -m benchmarks.bench_search --hires 10000 100000
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from functools import partial
+from typing import Any, cast
+
+from agents.state import OnboardingState
+from integrations.local_store import InMemoryOnboardingStore
+from integrations.search import SearchIndex
+
+SYLLABLES = [
+    "a",
+    "ri",
+    "ya",
+    "sam",
+    "lex",
+    "ma",
+    "wei",
+    "fa",
+    "ti",
+    "jo",
+    "ai",
+    "sha",
+    "lu",
+    "ca",
+    "no",
+    "ah",
+    "li",
+    "vi",
+    "te",
+    "yu",
+    "ki",
+    "o",
+    "mar",
+    "so",
+    "fi",
+    "ar",
+    "jun",
+    "chlo",
+    "e",
+    "di",
+    "go",
+    "ha",
+    "na",
+    "i",
+    "van",
+    "pri",
+    "ka",
+    "ra",
+    "be",
+    "en",
+]
+LAST = [
+    "Sharma",
+    "Lee",
+    "Garcia",
+    "Chen",
+    "Khan",
+    "Smith",
+    "Okafor",
+    "Rossi",
+    "Tanaka",
+    "Novak",
+    "Silva",
+    "Patel",
+    "Nguyen",
+    "Kowalski",
+    "Haddad",
+    "Berg",
+    "Moreau",
+    "Ali",
+]
+ROLES = [
+    "Software Engineer",
+    "Account Executive",
+    "Data Analyst",
+    "Recruiter",
+    "Product Manager",
+    "Designer",
+    "Support Specialist",
+]
+DEPARTMENTS = ["Engineering", "Sales", "Finance", "Operations", "HR"]
+
+
+def first_name() -> str:
+    """One of ~1,600 two-syllable first names."""
+    return (random.choice(SYLLABLES) + random.choice(SYLLABLES)).capitalize()
+
+
+def make_summary(i: int) -> dict[str, Any]:
+    """A hire document with the indexed fields."""
+    return {
+        "id": f"nh-{i}",
+        "new_hire_id": f"nh-{i}",
+        "new_hire_name": f"{first_name()} {random.choice(LAST)}{i % 97 or ''}",
+        "role": random.choice(ROLES),
+        "department": random.choice(DEPARTMENTS),
+        "manager_id": f"mgr-{i % 500:03d}",
+        "start_date": "2026-03-01",
+        "current_phase": "pre_onboarding",
+        "updated_at": "2026-02-01T09:00:00",
+    }
+
+
+def scan_names(store: InMemoryOnboardingStore, name: str, limit: int) -> list[OnboardingState]:
+    """States whose name contains ``name``, found the way lookups worked before the index."""
+    return [s for s in store.list_states(limit=limit) if name in s["new_hire_name"].lower()]
+
+
+def per_call(run: Callable[[], object], repeat: int) -> float:
+    """Microseconds per call of ``run``."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hires", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    hire_counts: list[int] = args.hires
+    random.seed(7)
+    for hires in hire_counts:
+        documents = [make_summary(i) for i in range(hires)]
+        index = SearchIndex()
+        start = time.perf_counter()
+        for document in documents:
+            index.apply(document)
+        build = time.perf_counter() - start
+        print(
+            f"{hires} hires: build {build * 1000:.0f} ms, "
+            f"update {per_call(partial(index.apply, documents[0]), args.repeat):.1f} us"
+        )
+
+        target = documents[hires // 2]
+        queries = {
+            "full name": target["new_hire_name"],
+            "first-name prefix": target["new_hire_name"][:3],
+            "name + department": f"{target['new_hire_name'].split()[0]} {target['department']}",
+            "department only": target["department"],
+        }
+        for label, query in queries.items():
+            micros = per_call(partial(index.search, query, k=10), args.repeat)
+            print(f"  {label:18s} {query!r:28s} {micros:10.1f} us")
+
+        store = InMemoryOnboardingStore()
+        store.create_states_bulk(
+            [cast(OnboardingState, {**d, "tasks": [], "messages": []}) for d in documents]
+        )
+        name = target["new_hire_name"].lower()
+        micros = per_call(partial(scan_names, store, name, hires), max(1, args.repeat // 100))
+        print(f"  {'list_states scan':18s} {name!r:28s} {micros:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Minimal local SMTP server used by the transport tests and benchmarks.
+
+Speaks just enough SMTP for ``smtplib`` (EHLO, MAIL, RCPT, DATA, RSET, NOOP,
+QUIT) and can delay each new connection to simulate the TCP/TLS handshake
+cost of a real relay.
+"""
+
+import socketserver
+import threading
+import time
+from typing import Self
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """One SMTP session."""
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server: LocalSMTPServer = self.server  # type: ignore[assignment]
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.connect_delay)
+        self._reply("220 localhost ESMTP stub")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250-localhost")
+                self._reply("250 8BITMIME")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines: list[bytes] = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line)
+                with server.lock:
+                    server.messages.append(b"".join(lines))
+                self._reply("250 Queued")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Threaded SMTP stand-in listening on localhost."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, connect_delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.connect_delay = connect_delay
+        self.connections = 0
+        self.messages: list[bytes] = []
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+        self.server_close()
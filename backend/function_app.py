@@ -1,18 +1,46 @@
 """Azure Functions entry point for HR Onboarding API."""
 
+import functools
 import json
 import logging
-from datetime import datetime
-from typing import Any
+import math
+import os
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, cast
 
 import azure.functions as func
 
 from agents.graph import onboarding_graph
-from agents.state import OnboardingState
-from agents.it_agent import IT_TASKS
 from agents.hr_agent import HR_TASKS
+from agents.it_agent import IT_TASKS
 from agents.manager_agent import MANAGER_TASKS
+from agents.state import OnboardingState
 from agents.training_agent import TRAINING_TASKS
+from integrations.admission import READ, WRITE, client_identity, get_admission_controller
+from integrations.compression import get_response_compressor
+from integrations.cosmos_metrics import cosmos_metrics_enabled, get_cosmos_metrics
+from integrations.email import get_email_service
+from integrations.idempotency import (
+    IdempotencyKeyReused,
+    IdempotentRequestInProgress,
+    StoredResponse,
+    get_idempotency_keys,
+)
+from integrations.jobs import JOB_QUEUE_NAME, JobService, job_status
+from integrations.ledger import get_task_ledger
+from integrations.outbox import OutboxRelay
+from integrations.persistence import (
+    persist_advanced,
+    persist_created,
+    phase_scheduler,
+    serialize_state,
+)
+from integrations.search import get_onboarding_search
+from integrations.singleflight import SingleFlight
+from integrations.store import get_onboarding_store
+from integrations.warmup import Warmup
 
 app = func.FunctionApp()
 logger = logging.getLogger(__name__)
@@ -21,11 +49,69 @@ logger = logging.getLogger(__name__)
 CORS_HEADERS = {
     "Access-Control-Allow-Origin": "*",
     "Access-Control-Allow-Methods": "GET, POST, PUT, OPTIONS",
-    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, Idempotency-Key",
     "Content-Type": "application/json"
 }
 
 
+def admission(request_class: str) -> Callable[[Callable[..., func.HttpResponse]], Any]:
+    """
+    Shed requests from clients that exceeded their budget for ``request_class``.
+
+    Reads and graph-executing writes have separate per-client token buckets
+    (see integrations.admission). Off unless ADMISSION_ENABLED=true; callers
+    that cannot be identified are not limited.
+    """
+    def decorator(handler: Callable[..., func.HttpResponse]) -> Callable[..., func.HttpResponse]:
+        @functools.wraps(handler)
+        def wrapper(req: func.HttpRequest) -> func.HttpResponse:
+            client = None
+            if req.method != "OPTIONS" and (
+                os.environ.get("ADMISSION_ENABLED", "false").lower() == "true"
+            ):
+                client = client_identity(
+                    req.headers, int(os.environ.get("ADMISSION_TRUSTED_PROXY_HOPS", "1"))
+                )
+            if client is not None:
+                retry_after = get_admission_controller().check(client, request_class)
+                if retry_after > 0:
+                    seconds = max(1, math.ceil(retry_after))
+                    return func.HttpResponse(
+                        json.dumps({"error": "Too many requests", "retry_after": seconds}),
+                        status_code=429,
+                        headers={**CORS_HEADERS, "Retry-After": str(seconds)}
+                    )
+            return handler(req)
+        return wrapper
+    return decorator
+
+
+def compressed(handler: Callable[..., func.HttpResponse]) -> Callable[..., func.HttpResponse]:
+    """
+    Compress large response bodies with the best encoding the client accepts.
+
+    Applied inside ``admission`` so shed requests skip the work; small bodies
+    and clients without a usable Accept-Encoding get the body unchanged. Every
+    response carries ``Vary: Accept-Encoding``, compressed or not, so shared
+    caches never hand one client's encoding to another.
+    """
+    @functools.wraps(handler)
+    def wrapper(req: func.HttpRequest) -> func.HttpResponse:
+        resp = handler(req)
+        resp.headers["Vary"] = "Accept-Encoding"
+        body, encoding = get_response_compressor().compress(
+            resp.get_body(), req.headers.get("Accept-Encoding")
+        )
+        if encoding is None:
+            return resp
+        return func.HttpResponse(
+            body,
+            status_code=resp.status_code,
+            headers={**dict(resp.headers), "Content-Encoding": encoding}
+        )
+    return wrapper
+
+
 def create_initial_state(data: dict[str, Any]) -> OnboardingState:
     """Create initial onboarding state from request data."""
     now = datetime.utcnow().isoformat()
@@ -39,7 +125,7 @@ def create_initial_state(data: dict[str, Any]) -> OnboardingState:
     )
     
     state: OnboardingState = {
-        "new_hire_id": data.get("id", f"nh-{datetime.utcnow().timestamp()}"),
+        "new_hire_id": data.get("id", f"nh-{int(datetime.now(UTC).timestamp())}-{uuid.uuid4().hex[:8]}"),
         "new_hire_name": data["name"],
         "email": data.get("email", f"{data['name'].lower().replace(' ', '.')}@company.com"),
         "role": data["role"],
@@ -59,28 +145,78 @@ def create_initial_state(data: dict[str, Any]) -> OnboardingState:
     return state
 
 
-def serialize_state(state: OnboardingState) -> dict[str, Any]:
-    """Convert state to JSON-serializable dict."""
-    return {
-        "new_hire_id": state["new_hire_id"],
-        "new_hire_name": state["new_hire_name"],
-        "email": state["email"],
-        "role": state["role"],
-        "department": state["department"],
-        "start_date": state["start_date"],
-        "manager_id": state["manager_id"],
-        "current_phase": state["current_phase"],
-        "tasks": state["tasks"],
-        "completed_tasks": state["completed_tasks"],
-        "pending_tasks": state["pending_tasks"],
-        "messages": [m.content if hasattr(m, 'content') else str(m) for m in state.get("messages", [])],
-        "created_at": state["created_at"],
-        "updated_at": state["updated_at"],
-        "errors": state["errors"],
-    }
+def run_create(state: OnboardingState) -> dict[str, Any]:
+    """Run a new hire through the graph, persist it and arm its phase timer."""
+    logger.info(f"Starting onboarding for {state['new_hire_name']}")
+    result = cast(OnboardingState, onboarding_graph.invoke(state))
+    return persist_created(state, serialize_state(result))
+
+
+def run_advance(new_hire_id: str) -> dict[str, Any]:
+    """Re-run a stored hire through the graph and persist the result."""
+    state = get_onboarding_store().get_state(new_hire_id)
+    if state is None:
+        raise LookupError(f"Onboarding not found: {new_hire_id}")
+    result = cast(OnboardingState, onboarding_graph.invoke(state))
+    return persist_advanced(state, serialize_state(result))
+
+
+# Concurrent reads of the same hire share one storage fetch
+_state_reads = SingleFlight()
+
+
+def read_state(new_hire_id: str) -> OnboardingState | None:
+    """Load a stored state for read-only use, coalescing concurrent reads."""
+    return _state_reads.do(new_hire_id, lambda: get_onboarding_store().get_state(new_hire_id))
+
+
+# Id of a document that never exists; reading it opens the store's connections
+WARMUP_PROBE_ID = "warmup-probe"
+
+# Per-instance resources the first requests would otherwise pay for. The graph
+# itself is compiled when this module is imported, which the warmup trigger forces.
+_warmup = Warmup([
+    ("store", lambda: get_onboarding_store().get_state(WARMUP_PROBE_ID)),
+    ("admission", get_admission_controller),
+    ("compression", get_response_compressor),
+    ("email", lambda: get_email_service().warm_up()),
+    ("search", lambda: get_onboarding_search().refresh()),
+])
+
+
+def job_mode_enabled() -> bool:
+    """Whether create and advance run as background jobs (ONBOARDING_JOB_MODE)."""
+    return os.environ.get("ONBOARDING_JOB_MODE", "false").lower() == "true"
+
+
+# Singleton instance
+_job_service: JobService | None = None
+
+
+def get_job_service() -> JobService:
+    """Get or create the background job service singleton."""
+    global _job_service
+    if _job_service is None:
+        _job_service = JobService(get_onboarding_store(), {
+            "create": lambda request: run_create(cast(OnboardingState, request)),
+            "advance": lambda request: run_advance(request["new_hire_id"]),
+        })
+    return _job_service
+
+
+def accepted(job: dict[str, Any]) -> func.HttpResponse:
+    """202 response pointing at the job-status endpoint."""
+    status_url = f"/api/jobs/{job['id']}"
+    return func.HttpResponse(
+        json.dumps({**job_status(job), "status_url": status_url}, indent=2),
+        status_code=202,
+        headers={**CORS_HEADERS, "Location": status_url, "Retry-After": "1"}
+    )
 
 
 @app.route(route="onboarding/create", methods=["POST", "OPTIONS"])
+@admission(WRITE)
+@compressed
 def create_onboarding(req: func.HttpRequest) -> func.HttpResponse:
     """
     Create new onboarding workflow.
@@ -93,6 +229,13 @@ def create_onboarding(req: func.HttpRequest) -> func.HttpResponse:
         "department": "Engineering",
         "manager_id": "mgr-001"
     }
+
+    With ONBOARDING_JOB_MODE=true the request is queued instead and 202
+    Accepted is returned with the job-status URL in ``Location``.
+
+    Send an ``Idempotency-Key`` header to make retries safe: a repeated key
+    with the same body returns the original response (marked
+    ``Idempotent-Replayed: true``) without creating another onboarding.
     """
     # Handle CORS preflight
     if req.method == "OPTIONS":
@@ -104,36 +247,28 @@ def create_onboarding(req: func.HttpRequest) -> func.HttpResponse:
     try:
         # Parse request body
         req_body = req.get_json()
-        
-        # Validate required fields
-        required_fields = ["name", "role", "start_date"]
-        missing_fields = [f for f in required_fields if f not in req_body]
-        if missing_fields:
-            return func.HttpResponse(
-                json.dumps({
-                    "error": "Missing required fields",
-                    "missing": missing_fields
-                }),
-                status_code=400,
-                headers=CORS_HEADERS
-            )
-        
-        # Create initial state
-        initial_state = create_initial_state(req_body)
-        
-        # Execute the workflow
-        logger.info(f"Starting onboarding for {initial_state['new_hire_name']}")
-        result_state = onboarding_graph.invoke(initial_state)
-        
-        # Serialize response
-        response_data = serialize_state(result_state)
-        
+
+        idempotency_key = req.headers.get("Idempotency-Key")
+        if not idempotency_key:
+            return _create(req_body)
+
+        # Retries with the same key get the first response back without
+        # re-running the graph; concurrent duplicates wait for it
+        stored, replayed = get_idempotency_keys().execute(
+            "onboarding/create",
+            idempotency_key,
+            req_body,
+            lambda: _stored_response(_create(req_body)),
+        )
+        headers = {**stored.headers, "Idempotent-Replayed": "true"} if replayed else stored.headers
+        return func.HttpResponse(stored.body, status_code=stored.status_code, headers=headers)
+
+    except (IdempotencyKeyReused, IdempotentRequestInProgress) as e:
         return func.HttpResponse(
-            json.dumps(response_data, indent=2),
-            status_code=201,
+            json.dumps({"error": str(e)}),
+            status_code=e.status_code,
             headers=CORS_HEADERS
         )
-        
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         return func.HttpResponse(
@@ -150,7 +285,50 @@ def create_onboarding(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+def _create(req_body: dict[str, Any]) -> func.HttpResponse:
+    """Validate a create request and run or queue the workflow."""
+    # Validate required fields
+    required_fields = ["name", "role", "start_date"]
+    missing_fields = [f for f in required_fields if f not in req_body]
+    if missing_fields:
+        return func.HttpResponse(
+            json.dumps({
+                "error": "Missing required fields",
+                "missing": missing_fields
+            }),
+            status_code=400,
+            headers=CORS_HEADERS
+        )
+
+    # Create initial state
+    initial_state = create_initial_state(req_body)
+
+    if job_mode_enabled():
+        job = get_job_service().submit("create", initial_state["new_hire_id"], initial_state)
+        return accepted(job)
+
+    # Execute the workflow
+    response_data = run_create(initial_state)
+
+    return func.HttpResponse(
+        json.dumps(response_data, indent=2),
+        status_code=201,
+        headers=CORS_HEADERS
+    )
+
+
+def _stored_response(response: func.HttpResponse) -> StoredResponse:
+    """Capture a response so it can be replayed to retries."""
+    return StoredResponse(
+        status_code=response.status_code,
+        body=response.get_body().decode(),
+        headers=dict(response.headers),
+    )
+
+
 @app.route(route="onboarding/{id}", methods=["GET", "OPTIONS"])
+@admission(READ)
+@compressed
 def get_onboarding(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get onboarding status by ID.
@@ -165,17 +343,19 @@ def get_onboarding(req: func.HttpRequest) -> func.HttpResponse:
         )
     
     try:
-        onboarding_id = req.route_params.get('id')
+        onboarding_id = req.route_params['id']
         
-        # TODO: Implement Cosmos DB lookup
-        # For now, return a mock response
+        state = read_state(onboarding_id)
+        if state is None:
+            return func.HttpResponse(
+                json.dumps({"error": "Onboarding not found", "id": onboarding_id}),
+                status_code=404,
+                headers=CORS_HEADERS
+            )
+
         return func.HttpResponse(
-            json.dumps({
-                "error": "Not implemented",
-                "message": "Cosmos DB integration pending",
-                "id": onboarding_id
-            }),
-            status_code=501,
+            json.dumps(serialize_state(state), indent=2),
+            status_code=200,
             headers=CORS_HEADERS
         )
         
@@ -189,11 +369,16 @@ def get_onboarding(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="onboarding/{id}/advance", methods=["PUT", "OPTIONS"])
+@admission(WRITE)
+@compressed
 def advance_onboarding(req: func.HttpRequest) -> func.HttpResponse:
     """
     Advance onboarding to next phase.
     
     PUT /api/onboarding/{id}/advance
+
+    With ONBOARDING_JOB_MODE=true the request is queued instead and 202
+    Accepted is returned with the job-status URL in ``Location``.
     """
     # Handle CORS preflight
     if req.method == "OPTIONS":
@@ -202,20 +387,28 @@ def advance_onboarding(req: func.HttpRequest) -> func.HttpResponse:
             headers=CORS_HEADERS
         )
     
+    onboarding_id = req.route_params['id']
     try:
-        onboarding_id = req.route_params.get('id')
-        
-        # TODO: Implement workflow advancement
+        if job_mode_enabled():
+            if get_onboarding_store().get_state(onboarding_id) is None:
+                raise LookupError(f"Onboarding not found: {onboarding_id}")
+            job = get_job_service().submit(
+                "advance", onboarding_id, {"new_hire_id": onboarding_id}
+            )
+            return accepted(job)
+
         return func.HttpResponse(
-            json.dumps({
-                "error": "Not implemented",
-                "message": "Workflow advancement pending",
-                "id": onboarding_id
-            }),
-            status_code=501,
+            json.dumps(run_advance(onboarding_id), indent=2),
+            status_code=200,
+            headers=CORS_HEADERS
+        )
+
+    except LookupError as e:
+        return func.HttpResponse(
+            json.dumps({"error": str(e), "id": onboarding_id}),
+            status_code=404,
             headers=CORS_HEADERS
         )
-        
     except Exception as e:
         logger.error(f"Error advancing onboarding: {e}")
         return func.HttpResponse(
@@ -226,6 +419,8 @@ def advance_onboarding(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="onboarding/{id}/status", methods=["GET", "OPTIONS"])
+@admission(READ)
+@compressed
 def get_status(req: func.HttpRequest) -> func.HttpResponse:
     """
     Get quick status summary.
@@ -240,16 +435,27 @@ def get_status(req: func.HttpRequest) -> func.HttpResponse:
         )
     
     try:
-        onboarding_id = req.route_params.get('id')
+        onboarding_id = req.route_params['id']
         
-        # TODO: Implement status lookup
+        state = read_state(onboarding_id)
+        if state is None:
+            return func.HttpResponse(
+                json.dumps({"error": "Onboarding not found", "id": onboarding_id}),
+                status_code=404,
+                headers=CORS_HEADERS
+            )
+
         return func.HttpResponse(
             json.dumps({
-                "error": "Not implemented",
-                "message": "Status lookup pending",
-                "id": onboarding_id
+                "new_hire_id": state["new_hire_id"],
+                "new_hire_name": state["new_hire_name"],
+                "start_date": state["start_date"],
+                "current_phase": state["current_phase"],
+                "completed_count": len(state["completed_tasks"]),
+                "pending_count": len(state["pending_tasks"]),
+                "updated_at": state["updated_at"],
             }),
-            status_code=501,
+            status_code=200,
             headers=CORS_HEADERS
         )
         
@@ -262,15 +468,221 @@ def get_status(req: func.HttpRequest) -> func.HttpResponse:
         )
 
 
+@app.route(route="onboarding/{id}/history", methods=["GET", "OPTIONS"])
+@admission(READ)
+@compressed
+def get_task_history(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get the recorded task transitions, oldest first.
+    
+    GET /api/onboarding/{id}/history?task_id=it-001
+    """
+    # Handle CORS preflight
+    if req.method == "OPTIONS":
+        return func.HttpResponse(
+            status_code=204,
+            headers=CORS_HEADERS
+        )
+
+    try:
+        onboarding_id = req.route_params['id']
+        if read_state(onboarding_id) is None:
+            return func.HttpResponse(
+                json.dumps({"error": "Onboarding not found", "id": onboarding_id}),
+                status_code=404,
+                headers=CORS_HEADERS
+            )
+
+        events = get_task_ledger().history(onboarding_id, req.params.get('task_id'))
+        return func.HttpResponse(
+            json.dumps({"new_hire_id": onboarding_id, "events": events}, indent=2),
+            status_code=200,
+            headers=CORS_HEADERS
+        )
+
+    except Exception as e:
+        logger.exception("Error fetching task history")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=500,
+            headers=CORS_HEADERS
+        )
+
+
+@app.route(route="search", methods=["GET", "OPTIONS"])
+@admission(READ)
+@compressed
+def search_onboardings(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Find hires by name, role, department or manager.
+    
+    GET /api/search?q=priya&limit=10
+    """
+    # Handle CORS preflight
+    if req.method == "OPTIONS":
+        return func.HttpResponse(
+            status_code=204,
+            headers=CORS_HEADERS
+        )
+
+    try:
+        query = req.params.get('q', '')
+        limit = int(req.params.get('limit', '10'))
+    except ValueError:
+        return func.HttpResponse(
+            json.dumps({"error": "limit must be an integer"}),
+            status_code=400,
+            headers=CORS_HEADERS
+        )
+
+    try:
+        hits = get_onboarding_search().search(query, max(1, min(limit, 100)))
+        return func.HttpResponse(
+            json.dumps({"query": query, "items": hits}, indent=2),
+            status_code=200,
+            headers=CORS_HEADERS
+        )
+
+    except Exception as e:
+        logger.exception("Error searching onboardings")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=500,
+            headers=CORS_HEADERS
+        )
+
+
+@app.route(route="jobs/{id}", methods=["GET", "OPTIONS"])
+@admission(READ)
+@compressed
+def get_job(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Get background job status.
+    
+    GET /api/jobs/{id}
+    """
+    # Handle CORS preflight
+    if req.method == "OPTIONS":
+        return func.HttpResponse(
+            status_code=204,
+            headers=CORS_HEADERS
+        )
+
+    try:
+        job_id = req.route_params['id']
+        job = get_job_service().get(job_id)
+        if job is None:
+            return func.HttpResponse(
+                json.dumps({"error": "Job not found", "id": job_id}),
+                status_code=404,
+                headers=CORS_HEADERS
+            )
+        return func.HttpResponse(
+            json.dumps(job_status(job), indent=2),
+            status_code=200,
+            headers=CORS_HEADERS
+        )
+
+    except Exception as e:
+        logger.exception("Error fetching job")
+        return func.HttpResponse(
+            json.dumps({"error": str(e)}),
+            status_code=500,
+            headers=CORS_HEADERS
+        )
+
+
+@app.queue_trigger(arg_name="msg", queue_name=JOB_QUEUE_NAME, connection="AzureWebJobsStorage")
+def run_job(msg: func.QueueMessage) -> None:
+    """Run a queued background job; exceptions leave the message for retry."""
+    job = get_job_service().run(msg.get_body().decode())
+    if job is not None:
+        logger.info(f"Job {job['id']} finished with status {job['status']}")
+
+
+@app.timer_trigger(schedule="0 */1 * * * *", arg_name="timer", run_on_startup=False)
+def relay_outbox(timer: func.TimerRequest) -> None:
+    """Deliver pending onboarding notifications from the outbox."""
+    try:
+        sent = OutboxRelay(get_onboarding_store()).run_until_empty()
+        logger.info(f"Outbox relay sent {sent} notifications")
+    except Exception:
+        logger.exception("Outbox relay failed")
+
+
+@app.timer_trigger(schedule="0 0 * * * *", arg_name="timer", run_on_startup=False)
+def advance_due_phases(timer: func.TimerRequest) -> None:
+    """Advance hires whose next phase boundary has passed."""
+    try:
+        advanced = phase_scheduler(get_onboarding_store()).run_until_idle()
+        logger.info(f"Phase scheduler advanced {advanced} hires")
+    except Exception:
+        logger.exception("Phase scheduler failed")
+
+
+@app.timer_trigger(schedule="0 */5 * * * *", arg_name="timer", run_on_startup=False)
+def export_cosmos_metrics(timer: func.TimerRequest) -> None:
+    """Push this instance's Cosmos latency and RU metrics to the registered exporters."""
+    if cosmos_metrics_enabled():
+        get_cosmos_metrics().export()
+
+
+@app.warm_up_trigger(arg_name="warmup")
+def warm_up_instance(warmup: func.warmup.WarmUpContext) -> None:
+    """Warm a new instance before the host routes traffic to it (Premium/Dedicated plans)."""
+    ready = _warmup.run()
+    logger.info(f"Instance warm-up finished, ready={ready}")
+
+
+@app.route(route="warmup", methods=["GET", "POST"])
+def warm_up(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Warm this instance and report each step.
+
+    GET|POST /api/warmup
+    For hosts without the warmup trigger (e.g. App Service application
+    initialization). Returns 503 while any step is failing.
+    """
+    ready = _warmup.run()
+    return func.HttpResponse(
+        json.dumps(_warmup.snapshot(), indent=2),
+        status_code=200 if ready else 503,
+        headers=CORS_HEADERS
+    )
+
+
 @app.route(route="health", methods=["GET"])
 def health_check(req: func.HttpRequest) -> func.HttpResponse:
-    """Health check endpoint."""
+    """Liveness: the worker is up, whether or not it has warmed yet."""
     return func.HttpResponse(
         json.dumps({
             "status": "healthy",
             "service": "hr-onboarding-api",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(UTC).isoformat(),
         }),
         status_code=200,
         headers=CORS_HEADERS
     )
+
+
+@app.route(route="health/ready", methods=["GET"])
+def readiness_check(req: func.HttpRequest) -> func.HttpResponse:
+    """
+    Readiness: 200 once warm-up has succeeded, 503 before.
+
+    GET /api/health/ready
+    A cold instance starts warming in the background on the first probe, so
+    load balancers that only probe still bring it into rotation.
+    """
+    snapshot = _warmup.snapshot()
+    if not snapshot["ready"]:
+        _warmup.start()
+    return func.HttpResponse(
+        json.dumps({
+            "status": "ready" if snapshot["ready"] else "warming",
+            "timestamp": datetime.now(UTC).isoformat(),
+            **snapshot,
+        }),
+        status_code=200 if snapshot["ready"] else 503,
+        headers=CORS_HEADERS
+    )
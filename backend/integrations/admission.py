@@ -0,0 +1,239 @@
+"""Per-client admission control for the HTTP API.
+
+Each client, identified by its function key or else its IP address as recorded
+by the trusted proxy in front of the app, gets two token buckets: one for reads
+and a much smaller one for writes that execute the graph. A request that finds its bucket empty is shed with 429 and a
+``Retry-After`` hint instead of queueing behind everyone else's work.
+
+Buckets live in Redis when ADMISSION_REDIS_URL is set, so every Functions
+instance enforces the same budget; refill and take happen atomically in a Lua
+script. If Redis is unreachable the controller falls back to per-process
+buckets (reusing ``TokenBucket``) and tries Redis again after a pause.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Protocol
+
+from .throttling import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+
+# Refill and take in one round trip. Returns the seconds to wait as a string
+# (Lua numbers are truncated to integers in Redis replies).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Sustained rate and burst size for one request class."""
+
+    rate: float
+    burst: float
+
+
+class BucketStore(Protocol):
+    """Takes tokens from named buckets."""
+
+    def try_acquire(self, key: str, budget: Budget) -> float:
+        """Take one token. Returns 0.0 if admitted, else seconds until one is available."""
+        ...
+
+
+class LocalBuckets:
+    """Per-process token buckets, bounded to the most recently seen clients."""
+
+    def __init__(self, max_clients: int = 10000, clock: Callable[[], float] = time.monotonic):
+        """Keep buckets for at most ``max_clients`` keys; the least recent are dropped."""
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, key: str, budget: Budget) -> float:
+        """Take one token. Returns 0.0 if admitted, else seconds until one is available."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(budget.rate, budget.burst, self.clock)
+                while len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+        return bucket.try_acquire()
+
+
+class RedisBuckets:
+    """Token buckets shared by every instance through Redis."""
+
+    def __init__(self, url: str, prefix: str = "admission", timeout: float = 0.05):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis URL, e.g. ``rediss://:key@host:6380/0``
+            prefix: Namespace for bucket keys
+            timeout: Socket timeout; a slow Redis must not slow every request
+
+        Raises:
+            ImportError: If the redis package is not installed
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RedisBuckets requires the redis package") from e
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+        self._script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def try_acquire(self, key: str, budget: Budget) -> float:
+        """Take one token. Returns 0.0 if admitted, else seconds until one is available."""
+        return float(
+            self._script(keys=[f"{self.prefix}:{key}"], args=[budget.rate, budget.burst, 1])
+        )
+
+
+class AdmissionController:
+    """Admits or sheds requests per client and request class."""
+
+    def __init__(
+        self,
+        budgets: Mapping[str, Budget],
+        shared: BucketStore | None = None,
+        local: LocalBuckets | None = None,
+        retry_shared_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            budgets: Budget per request class (``read`` and ``write``)
+            shared: Cross-instance bucket store, or None for local buckets only
+            local: Per-process buckets, also the fallback while ``shared`` fails
+            retry_shared_after: Seconds to stay on the fallback after an error
+            clock: Monotonic time source
+        """
+        self.budgets = dict(budgets)
+        self.shared = shared
+        self.local = local or LocalBuckets(clock=clock)
+        self.retry_shared_after = retry_shared_after
+        self.clock = clock
+        self._shared_down_until = 0.0
+
+    def check(self, client: str, request_class: str) -> float:
+        """
+        Take a token for one request.
+
+        Returns:
+            0.0 if the request is admitted, otherwise the seconds the client
+            should wait before retrying
+        """
+        budget = self.budgets[request_class]
+        key = f"{request_class}:{client}"
+        if self.shared is not None and self.clock() >= self._shared_down_until:
+            try:
+                return self.shared.try_acquire(key, budget)
+            except Exception:
+                logger.warning(
+                    "Shared rate limiter unavailable, using local buckets", exc_info=True
+                )
+                self._shared_down_until = self.clock() + self.retry_shared_after
+        return self.local.try_acquire(key, budget)
+
+
+def _strip_port(address: str) -> str:
+    """Drop a port from ``host:port`` or ``[v6]:port``; bare IPv6 is kept whole."""
+    if address.startswith("["):
+        return address[1:].split("]", 1)[0]
+    if address.count(":") == 1:
+        return address.split(":", 1)[0]
+    return address
+
+
+def client_identity(headers: Mapping[str, str], trusted_hops: int = 1) -> str | None:
+    """
+    Identify the caller from request headers.
+
+    A function key (``x-functions-key``) is hashed so it never reaches logs
+    or Redis. Only that header is trusted, because the Functions host rejects
+    requests with an invalid key; any other key header is caller-chosen and
+    would hand out a fresh bucket per value. Otherwise the client address is
+    read from
+    ``X-Forwarded-For`` counting ``trusted_hops`` entries from the right: the
+    entries a trusted proxy appended, not ones the client sent. Ports are
+    stripped, since Azure front ends record ``ip:port``.
+
+    Returns:
+        The identity, or None when the request carries neither (local runs
+        without a proxy); such requests cannot be told apart and are not limited
+    """
+    function_key = headers.get("x-functions-key")
+    if function_key:
+        return "key:" + hashlib.sha256(function_key.encode()).hexdigest()[:16]
+    hops = [hop.strip() for hop in (headers.get("x-forwarded-for") or "").split(",") if hop.strip()]
+    if hops:
+        return "ip:" + _strip_port(hops[-min(trusted_hops, len(hops))])
+    client_ip = headers.get("x-client-ip")
+    if client_ip:
+        return "ip:" + _strip_port(client_ip.strip())
+    return None
+
+
+# Singleton instance
+_admission_controller: AdmissionController | None = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the admission controller singleton from ADMISSION_* settings."""
+    global _admission_controller
+    if _admission_controller is None:
+        budgets = {
+            READ: Budget(
+                rate=float(os.environ.get("ADMISSION_READ_RATE", "20")),
+                burst=float(os.environ.get("ADMISSION_READ_BURST", "40")),
+            ),
+            WRITE: Budget(
+                rate=float(os.environ.get("ADMISSION_WRITE_RATE", "1")),
+                burst=float(os.environ.get("ADMISSION_WRITE_BURST", "5")),
+            ),
+        }
+        shared = None
+        redis_url = os.environ.get("ADMISSION_REDIS_URL")
+        if redis_url:
+            try:
+                shared = RedisBuckets(redis_url)
+            except ImportError as e:
+                logger.warning(f"{e}; using local rate limiting only")
+        _admission_controller = AdmissionController(budgets, shared)
+    return _admission_controller
@@ -0,0 +1,301 @@
+"""Columnar export of onboarding tasks for analytics.
+
+Leadership reporting (time to complete per task category and department)
+needs one row per task, not one JSON document per hire. The exporter pages
+through the store's change feed, which yields each hire's latest document
+once, and flattens every page into task rows as it goes, so memory stays
+bounded by the page and row-group sizes however many hires there are.
+
+Rows are written as Parquet when the optional ``pyarrow`` package is
+installed (one row group per ``row_group_size`` rows), otherwise as CSV files
+of at most ``rows_per_file`` rows each. ``CompletionReport`` collects
+completion times while the rows stream past, keeping one 8-byte float per
+completed task, and computes percentiles with the optional ``numpy``
+package.
+"""
+
+import csv
+import importlib.util
+import logging
+import os
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PARQUET = "parquet"
+CSV = "csv"
+
+# Columns of the task table, in file order
+TASK_COLUMNS = (
+    "new_hire_id",
+    "department",
+    "role",
+    "manager_id",
+    "current_phase",
+    "start_date",
+    "hire_created_at",
+    "task_id",
+    "task_name",
+    "category",
+    "status",
+    "assigned_to",
+    "due_date",
+    "completed_at",
+    "completion_hours",
+)
+
+
+def completion_hours(created_at: str | None, completed_at: str | None) -> float | None:
+    """Hours from the hire's creation to a task's completion, or None if unknown."""
+    if not created_at or not completed_at:
+        return None
+    try:
+        delta = datetime.fromisoformat(completed_at) - datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return None
+    return delta.total_seconds() / 3600
+
+
+def task_rows(document: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Flatten one onboarding document into task rows."""
+    for task in document.get("tasks", []):
+        yield {
+            "new_hire_id": document.get("new_hire_id"),
+            "department": document.get("department"),
+            "role": document.get("role"),
+            "manager_id": document.get("manager_id"),
+            "current_phase": document.get("current_phase"),
+            "start_date": document.get("start_date"),
+            "hire_created_at": document.get("created_at"),
+            "task_id": task.get("id"),
+            "task_name": task.get("name"),
+            "category": task.get("category"),
+            "status": task.get("status"),
+            "assigned_to": task.get("assigned_to"),
+            "due_date": task.get("due_date"),
+            "completed_at": task.get("completed_at"),
+            "completion_hours": completion_hours(
+                document.get("created_at"), task.get("completed_at")
+            ),
+        }
+
+
+def iter_documents(store: Any, page_size: int = 100) -> Iterator[list[dict[str, Any]]]:
+    """Page through every document in the store's change feed, one page at a time."""
+    continuation = None
+    while True:
+        documents, continuation = store.read_change_feed(continuation, max_item_count=page_size)
+        if not documents:
+            return
+        yield documents
+
+
+class CsvTaskWriter:
+    """Writes task rows to numbered CSV files of bounded size."""
+
+    def __init__(self, directory: str, rows_per_file: int = 100_000):
+        """Write ``tasks-00000.csv``, ``tasks-00001.csv``, ... under ``directory``."""
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        self.files: list[str] = []
+        self._rows_in_file = 0
+
+    def write(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Append rows, starting a new file whenever the current one is full."""
+        remaining = iter(rows)
+        row = next(remaining, None)
+        while row is not None:
+            if not self.files or self._rows_in_file >= self.rows_per_file:
+                self._start_file()
+            # One open per call (a change feed page), not per row
+            with open(self.files[-1], "a", newline="", encoding="utf-8") as handle:
+                writer: csv.DictWriter[str] = csv.DictWriter(handle, fieldnames=TASK_COLUMNS)
+                while row is not None and self._rows_in_file < self.rows_per_file:
+                    writer.writerow(row)
+                    self._rows_in_file += 1
+                    row = next(remaining, None)
+
+    def _start_file(self) -> None:
+        path = os.path.join(self.directory, f"tasks-{len(self.files):05d}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            csv.DictWriter(handle, fieldnames=TASK_COLUMNS).writeheader()
+        self._rows_in_file = 0
+        self.files.append(path)
+
+    def close(self) -> None:
+        """Nothing to flush: each ``write`` closes the file it appended to."""
+
+
+class ParquetTaskWriter:
+    """Writes task rows to one Parquet file, a row group at a time."""
+
+    def __init__(self, directory: str, row_group_size: int = 50_000):
+        """
+        Open ``tasks.parquet`` under ``directory``.
+
+        Raises:
+            ImportError: If the pyarrow package is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("ParquetTaskWriter requires the pyarrow package") from e
+        self._pa = pa
+        self.schema = pa.schema(
+            [
+                (name, pa.float64() if name == "completion_hours" else pa.string())
+                for name in TASK_COLUMNS
+            ]
+        )
+        self.row_group_size = row_group_size
+        path = os.path.join(directory, "tasks.parquet")
+        self.files = [path]
+        self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        self._columns: dict[str, list[Any]] = {name: [] for name in TASK_COLUMNS}
+        self._buffered = 0
+
+    def write(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Buffer rows column by column, flushing a row group whenever the buffer is full."""
+        for row in rows:
+            for name, values in self._columns.items():
+                values.append(row[name])
+            self._buffered += 1
+            if self._buffered >= self.row_group_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffered and self._writer is not None:
+            self._writer.write_table(self._pa.Table.from_pydict(self._columns, schema=self.schema))
+            self._columns = {name: [] for name in TASK_COLUMNS}
+            self._buffered = 0
+
+    def close(self) -> None:
+        """Write the last row group and the file footer."""
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+
+def default_format() -> str:
+    """Parquet when pyarrow is installed, else CSV."""
+    return PARQUET if importlib.util.find_spec("pyarrow") is not None else CSV
+
+
+class CompletionReport:
+    """Completion-time percentiles per group, collected while rows stream past."""
+
+    def __init__(self, by: Sequence[str] = ("category",)):
+        """Group completed tasks by the ``by`` columns (e.g. department and category)."""
+        self.by = tuple(by)
+        self._hours: dict[tuple[Any, ...], array[float]] = {}
+
+    def add(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Record the completion time of every completed row."""
+        for row in rows:
+            hours = row["completion_hours"]
+            if row["status"] == "completed" and hours is not None:
+                key = tuple(row[column] for column in self.by)
+                values = self._hours.get(key)
+                if values is None:
+                    values = self._hours[key] = array("d")
+                values.append(hours)
+
+    @property
+    def samples(self) -> int:
+        """Completion times recorded so far."""
+        return sum(len(values) for values in self._hours.values())
+
+    def percentiles(self, q: Sequence[float] = (50, 90, 99)) -> list[dict[str, Any]]:
+        """
+        Completion-time percentiles per group.
+
+        Returns:
+            One dict per group, sorted by group: the ``by`` columns, ``count``,
+            ``mean_hours`` and ``p<q>_hours`` for each requested percentile
+
+        Raises:
+            ImportError: If the numpy package is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("CompletionReport requires the numpy package") from e
+
+        report: list[dict[str, Any]] = []
+        for key, values in sorted(self._hours.items(), key=lambda item: [str(v) for v in item[0]]):
+            hours = np.frombuffer(values, dtype=np.float64)
+            row: dict[str, Any] = dict(zip(self.by, key))
+            row["count"] = int(hours.size)
+            row["mean_hours"] = float(hours.mean())
+            for value, percentile in zip(q, np.percentile(hours, q)):
+                row[f"p{value:g}_hours"] = float(percentile)
+            report.append(row)
+        return report
+
+
+@dataclass
+class ExportResult:
+    """Summary of an export run."""
+
+    file_format: str
+    files: list[str] = field(default_factory=list[str])
+    hires: int = 0
+    rows: int = 0
+
+
+def export_tasks(
+    store: Any,
+    directory: str,
+    file_format: str | None = None,
+    page_size: int = 100,
+    reports: Sequence[CompletionReport] = (),
+    rows_per_file: int = 100_000,
+) -> ExportResult:
+    """
+    Stream every hire's tasks from the store into columnar files.
+
+    Args:
+        store: Onboarding store exposing ``read_change_feed``
+        directory: Output directory (created if missing)
+        file_format: ``parquet`` or ``csv``; defaults to Parquet when pyarrow is installed
+        page_size: Documents read per change feed page
+        reports: Completion reports fed with every row as it is written
+        rows_per_file: Rows per CSV file, or per Parquet row group
+
+    Returns:
+        ExportResult with the files written and row counts
+    """
+    file_format = file_format or default_format()
+    os.makedirs(directory, exist_ok=True)
+    if file_format == PARQUET:
+        writer: ParquetTaskWriter | CsvTaskWriter = ParquetTaskWriter(
+            directory, row_group_size=rows_per_file
+        )
+    elif file_format == CSV:
+        writer = CsvTaskWriter(directory, rows_per_file=rows_per_file)
+    else:
+        raise ValueError(f"Unknown export format: {file_format}")
+
+    result = ExportResult(file_format=file_format)
+    try:
+        for documents in iter_documents(store, page_size):
+            for document in documents:
+                if "type" in document:
+                    continue  # Outbox, timers and other auxiliary documents
+                rows = list(task_rows(document))
+                writer.write(rows)
+                for report in reports:
+                    report.add(rows)
+                result.hires += 1
+                result.rows += len(rows)
+    finally:
+        writer.close()
+    result.files = list(writer.files)
+    logger.info(f"Exported {result.rows} task rows for {result.hires} hires as {file_format}")
+    return result
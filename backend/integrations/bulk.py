@@ -0,0 +1,89 @@
+"""Partitioned, bounded-concurrency bulk writes shared by the onboarding stores.
+
+Documents are grouped by partition key and each group is split into chunks of
+at most ``MAX_BATCH_OPERATIONS`` (the Cosmos DB transactional batch limit).
+Chunks run on a bounded thread pool; a failing chunk only fails its own items.
+
+Onboarding states are partitioned by hire ID, so for them every group holds a
+single document (unless the input repeats an ID) and this amounts to running
+point writes in parallel; the grouping only decides which writes may share a
+chunk.
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Cosmos DB limit on operations per transactional batch
+MAX_BATCH_OPERATIONS = 100
+
+DEFAULT_BULK_CONCURRENCY = 16
+
+
+@dataclass
+class BulkItemResult:
+    """Outcome of one document in a bulk write."""
+
+    id: str
+    status_code: int
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+
+PartitionWriter = Callable[[str, list[dict[str, Any]]], list[BulkItemResult]]
+
+
+def run_partitioned(
+    documents: list[dict[str, Any]],
+    write_partition: PartitionWriter,
+    max_concurrency: int = DEFAULT_BULK_CONCURRENCY,
+) -> list[BulkItemResult]:
+    """
+    Write documents partition by partition with bounded concurrency.
+
+    Args:
+        documents: Documents carrying ``id`` and ``partitionKey``
+        write_partition: Writes one chunk of a single partition atomically and
+            returns one result per document, in order
+        max_concurrency: Maximum chunks in flight
+
+    Returns:
+        One result per input document, in input order
+    """
+    groups: dict[str, list[int]] = {}
+    for index, document in enumerate(documents):
+        groups.setdefault(document["partitionKey"], []).append(index)
+
+    chunks = [
+        (partition_key, indexes[start : start + MAX_BATCH_OPERATIONS])
+        for partition_key, indexes in groups.items()
+        for start in range(0, len(indexes), MAX_BATCH_OPERATIONS)
+    ]
+
+    def write_chunk(partition_key: str, indexes: list[int]) -> list[BulkItemResult]:
+        chunk = [documents[i] for i in indexes]
+        try:
+            return write_partition(partition_key, chunk)
+        except Exception as e:
+            logger.exception(f"Bulk write failed for partition {partition_key}")
+            status_code = getattr(e, "status_code", None) or 500
+            return [BulkItemResult(d["id"], status_code, str(e)) for d in chunk]
+
+    results: list[BulkItemResult | None] = [None] * len(documents)
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        futures = [
+            (indexes, pool.submit(write_chunk, partition_key, indexes))
+            for partition_key, indexes in chunks
+        ]
+        for indexes, future in futures:
+            for index, result in zip(indexes, future.result()):
+                results[index] = result
+
+    return results  # type: ignore[return-value]
@@ -0,0 +1,109 @@
+"""HTTP response compression negotiated from ``Accept-Encoding``.
+
+Full onboarding states (tasks, agent messages, pretty-printed JSON) run to
+tens of kilobytes and compress very well. Bodies at or above a size threshold
+are compressed with the best encoding the client accepts: brotli when the
+optional ``brotli`` package is installed, else gzip. Levels favour latency
+over ratio (gzip 5, brotli quality 4); higher settings cost several times the
+CPU for a few percent fewer bytes on these payloads. See
+``benchmarks/bench_compression.py``.
+"""
+
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP = "gzip"
+BROTLI = "br"
+
+
+def available_encodings() -> list[str]:
+    """Supported encodings, most preferred first."""
+    return [BROTLI, GZIP] if brotli is not None else [GZIP]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """
+    Pick the encoding for a response from the request's Accept-Encoding.
+
+    Quality values are honoured (``q=0`` refuses an encoding); on a tie the
+    server's preference wins.
+
+    Returns:
+        The encoding to use, or None to send the body uncompressed
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class ResponseCompressor:
+    """Compresses response bodies above a size threshold."""
+
+    def __init__(self, min_bytes: int = 1024, gzip_level: int = 5, brotli_quality: int = 4):
+        """
+        Initialize the compressor.
+
+        Args:
+            min_bytes: Smaller bodies are sent as is; compressing them saves
+                little and costs a round of CPU
+            gzip_level: zlib level 1-9
+            brotli_quality: brotli quality 0-11
+        """
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compress(self, body: bytes, accept_encoding: str | None) -> tuple[bytes, str | None]:
+        """
+        Compress ``body`` if it is large enough and the client accepts it.
+
+        Returns:
+            Tuple of (body to send, Content-Encoding or None)
+        """
+        if len(body) < self.min_bytes:
+            return body, None
+        encoding = negotiate(accept_encoding)
+        if encoding == BROTLI and brotli is not None:
+            return brotli.compress(body, quality=self.brotli_quality), BROTLI
+        if encoding == GZIP:
+            return gzip.compress(body, compresslevel=self.gzip_level, mtime=0), GZIP
+        return body, None
+
+
+# Singleton instance
+_response_compressor: ResponseCompressor | None = None
+
+
+def get_response_compressor() -> ResponseCompressor:
+    """Get or create the response compressor singleton from RESPONSE_COMPRESSION_* settings."""
+    global _response_compressor
+    if _response_compressor is None:
+        _response_compressor = ResponseCompressor(
+            min_bytes=int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", "1024")),
+            gzip_level=int(os.environ.get("RESPONSE_GZIP_LEVEL", "5")),
+            brotli_quality=int(os.environ.get("RESPONSE_BROTLI_QUALITY", "4")),
+        )
+    return _response_compressor
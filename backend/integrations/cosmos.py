@@ -1,18 +1,78 @@
 """Cosmos DB client for onboarding state persistence."""
 
+import base64
 import os
-from typing import Optional
+from collections.abc import Callable
+from typing import Any, Optional, cast
+from azure.core import MatchConditions
+from azure.core.paging import PageIterator
 from azure.cosmos import CosmosClient, PartitionKey
-from azure.cosmos.exceptions import CosmosResourceNotFoundError
+from azure.cosmos.documents import ConnectionPolicy
+from azure.cosmos.exceptions import (
+    CosmosAccessConditionFailedError,
+    CosmosBatchOperationError,
+    CosmosHttpResponseError,
+    CosmosResourceExistsError,
+    CosmosResourceNotFoundError,
+)
 
 from agents.state import OnboardingState
+from .cosmos_metrics import (
+    CosmosMetrics,
+    Measurement,
+    cosmos_metrics_enabled,
+    get_cosmos_metrics,
+)
+from .bulk import (
+    DEFAULT_BULK_CONCURRENCY,
+    MAX_BATCH_OPERATIONS,
+    BulkItemResult,
+    run_partitioned,
+)
+from .ledger import task_snapshot_id
+from .throttling import (
+    BULK,
+    INTERACTIVE,
+    AdaptiveRateLimiter,
+    call_with_retry,
+    get_rate_limiter,
+)
+from .queries import (
+    BY_DEPARTMENT_QUERY,
+    BY_MANAGER_QUERY,
+    BY_PHASE_QUERY,
+    DUE_TIMERS_QUERY,
+    EXISTING_OUTBOX_IDS_QUERY,
+    INDEXING_POLICY,
+    LIST_STATES_QUERY,
+    MAX_PAGE_SIZE,
+    PENDING_OUTBOX_QUERY,
+    STARTING_BETWEEN_QUERY,
+    TASK_EVENTS_QUERY,
+    QueryResult,
+    StateFilters,
+    build_list_page_query,
+)
 
 
 class OnboardingCosmosClient:
     """Client for persisting onboarding state to Cosmos DB."""
     
-    def __init__(self):
-        """Initialize Cosmos DB client."""
+    def __init__(
+        self,
+        metrics: CosmosMetrics | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+    ):
+        """
+        Initialize Cosmos DB client.
+
+        Args:
+            metrics: Sink for per-operation latency and RU samples. Defaults to
+                the process-wide metrics when COSMOS_METRICS_ENABLED=true,
+                otherwise instrumentation is skipped entirely.
+            rate_limiter: Limiter applied to every call and fed with 429
+                signals. Defaults to the process-wide limiter.
+        """
         # Get connection details from environment
         endpoint = os.environ.get("COSMOS_ENDPOINT")
         key = os.environ.get("COSMOS_KEY")
@@ -22,10 +82,65 @@ class OnboardingCosmosClient:
         if not endpoint or not key:
             raise ValueError("COSMOS_ENDPOINT and COSMOS_KEY must be set")
         
-        # Initialize client
-        self.client = CosmosClient(endpoint, key)
+        # Initialize client. 429s must reach call_with_retry so the adaptive
+        # limiter sees them; the SDK would otherwise retry up to 9 times over
+        # 30s first. Set on the policy because retry_throttle_total=0 is read as unset.
+        policy = ConnectionPolicy()
+        retry_options = type(policy.RetryOptions)  # The SDK does not re-export RetryOptions
+        policy.RetryOptions = retry_options(max_retry_attempt_count=0, max_wait_time_in_seconds=0)
+        self.client = CosmosClient(endpoint, key, connection_policy=policy)
         self.database = self.client.get_database_client(database_name)
         self.container = self.database.get_container_client(container_name)
+
+        if metrics is None and cosmos_metrics_enabled():
+            metrics = get_cosmos_metrics()
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+    def _call(
+        self,
+        operation: str,
+        method: Callable[..., Any],
+        lazy: bool = False,
+        priority: str = INTERACTIVE,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Invoke a container method under the rate limiter, retrying 429s.
+
+        Args:
+            operation: Metric label for the call
+            method: Bound container method
+            lazy: The method returns a lazy iterable (queries) that must be
+                drained inside the measurement
+            priority: Rate limiter priority (interactive or bulk)
+        """
+        return call_with_retry(
+            lambda: self._invoke(operation, method, lazy, **kwargs),
+            self.rate_limiter,
+            priority
+        )
+
+    def _invoke(
+        self, operation: str, method: Callable[..., Any], lazy: bool, **kwargs: Any
+    ) -> Any:
+        """Invoke a container method, recording latency and RU when metrics are enabled."""
+        if self.metrics is None:
+            if lazy:
+                return list(method(**kwargs))
+            return method(**kwargs)
+
+        caller_hook = kwargs.pop("response_hook", None)
+        with self.metrics.measure(operation) as measurement:
+            def hook(headers: Any, page: Any) -> None:
+                measurement.capture(headers, page)
+                if caller_hook is not None:
+                    caller_hook(headers, page)
+
+            result = method(response_hook=hook, **kwargs)
+            if lazy:
+                result = list(result)
+            return result
     
     def create_state(self, state: OnboardingState) -> dict:
         """Create new onboarding state in Cosmos DB."""
@@ -35,13 +150,15 @@ class OnboardingCosmosClient:
             **state
         }
         
-        created = self.container.create_item(body=document)
+        created = self._call("create_state", self.container.create_item, body=document)
         return created
     
     def get_state(self, onboarding_id: str) -> Optional[OnboardingState]:
         """Retrieve onboarding state by ID."""
         try:
-            item = self.container.read_item(
+            item = self._call(
+                "get_state",
+                self.container.read_item,
                 item=onboarding_id,
                 partition_key=onboarding_id
             )
@@ -57,22 +174,333 @@ class OnboardingCosmosClient:
             **state
         }
         
-        updated = self.container.upsert_item(body=document)
+        updated = self._call("update_state", self.container.upsert_item, body=document)
         return updated
     
+    def create_states_bulk(
+        self, states: list[OnboardingState], max_concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> list[BulkItemResult]:
+        """
+        Create many onboarding states, e.g. for a cohort import.
+
+        Every hire is its own partition, so there is nothing to batch: this
+        runs one point write per state, ``max_concurrency`` at a time, at bulk
+        priority. Returns one result per state, in input order; a failure only
+        affects its own state.
+        """
+        return self._bulk_write("create", states, max_concurrency)
+
+    def upsert_states_bulk(
+        self, states: list[OnboardingState], max_concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> list[BulkItemResult]:
+        """Create or replace many onboarding states. See ``create_states_bulk``."""
+        return self._bulk_write("upsert", states, max_concurrency)
+
+    def _bulk_write(
+        self, operation: str, states: list[OnboardingState], max_concurrency: int
+    ) -> list[BulkItemResult]:
+        """Point-write states in parallel at bulk priority."""
+        documents: list[dict[str, Any]] = [
+            {"id": state["new_hire_id"], "partitionKey": state["new_hire_id"], **state}
+            for state in states
+        ]
+        success_code = 201 if operation == "create" else 200
+        method = self.container.create_item if operation == "create" else self.container.upsert_item
+
+        def write_partition(
+            _partition_key: str, chunk: list[dict[str, Any]]
+        ) -> list[BulkItemResult]:
+            # The partition key is the hire ID, so a chunk holds more than one
+            # document only when the input repeats an ID
+            results: list[BulkItemResult] = []
+            for document in chunk:
+                try:
+                    self._call(f"{operation}_state", method, priority=BULK, body=document)
+                    results.append(BulkItemResult(document["id"], success_code))
+                except CosmosHttpResponseError as e:
+                    results.append(BulkItemResult(document["id"], e.status_code or 500, str(e)))
+            return results
+
+        return run_partitioned(documents, write_partition, max_concurrency)
+
+    def save_state_with_outbox(
+        self, state: OnboardingState, messages: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """
+        Upsert state and enqueue outbox messages in one transactional batch.
+
+        The outbox documents share the hire's partition, so the batch commits
+        both or neither. Messages whose idempotency key is already present in
+        the partition are left untouched, including ones a concurrent save
+        creates between the lookup and the batch.
+        """
+        partition_key = state["new_hire_id"]
+        document: dict[str, Any] = {
+            "id": partition_key,
+            "partitionKey": partition_key,
+            **state
+        }
+
+        existing: set[str] = set()
+        if messages:
+            existing = {item["id"] for item in self._call(
+                "list_outbox_ids",
+                self.container.query_items,
+                lazy=True,
+                query=EXISTING_OUTBOX_IDS_QUERY,
+                parameters=[{"name": "@ids", "value": [m["id"] for m in messages]}],
+                partition_key=partition_key
+            )}
+
+        operations = [("upsert", (document,))] + [
+            ("create", (message,)) for message in messages if message["id"] not in existing
+        ]
+        while True:
+            try:
+                self._call(
+                    "save_state_with_outbox",
+                    self.container.execute_item_batch,
+                    batch_operations=operations,
+                    partition_key=partition_key
+                )
+                return document
+            except CosmosBatchOperationError as e:
+                # Another save enqueued this message after the lookup; it must not
+                # be reset to pending, so commit the state without it
+                if e.status_code != 409 or not e.error_index:
+                    raise
+                del operations[e.error_index]
+
+    def list_pending_outbox(self, limit: int, now: str) -> list[dict[str, Any]]:
+        """Pending messages, plus claimed ones whose lease has expired."""
+        return self._call(
+            "list_pending_outbox",
+            self.container.query_items,
+            lazy=True,
+            query=PENDING_OUTBOX_QUERY,
+            parameters=[
+                {"name": "@now", "value": now},
+                {"name": "@limit", "value": limit},
+            ],
+            enable_cross_partition_query=True
+        )
+
+    def claim_outbox(self, message: dict[str, Any], lease_until: str) -> dict[str, Any] | None:
+        """Lease a message if its etag is unchanged since it was read."""
+        try:
+            return self._call(
+                "claim_outbox",
+                self.container.replace_item,
+                item=message["id"],
+                body={**message, "status": "sending", "lease_until": lease_until},
+                etag=message["_etag"],
+                match_condition=MatchConditions.IfNotModified
+            )
+        except CosmosAccessConditionFailedError:
+            return None
+
+    def replace_outbox(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        """Persist a message's delivery status if its etag is unchanged; None otherwise."""
+        try:
+            return self._call(
+                "replace_outbox",
+                self.container.replace_item,
+                item=message["id"],
+                body=message,
+                etag=message["_etag"],
+                match_condition=MatchConditions.IfNotModified
+            )
+        except CosmosAccessConditionFailedError:
+            return None
+
+    def save_timer(self, timer: dict[str, Any]) -> None:
+        """Create or replace a phase timer."""
+        self._call("save_timer", self.container.upsert_item, body=timer)
+
+    def list_due_timers(self, due_by: str, now: str, limit: int) -> list[dict[str, Any]]:
+        """
+        Timers due on or before ``due_by``, earliest first.
+
+        Pending timers are returned, plus claimed ones whose lease has expired.
+        The range index on ``due_at`` keeps the query proportional to the
+        timers that are due, not to the number of hires.
+        """
+        return self._call(
+            "list_due_timers",
+            self.container.query_items,
+            lazy=True,
+            query=DUE_TIMERS_QUERY,
+            parameters=[
+                {"name": "@due_by", "value": due_by},
+                {"name": "@now", "value": now},
+                {"name": "@limit", "value": limit},
+            ],
+            enable_cross_partition_query=True
+        )
+
+    def claim_timer(self, timer: dict[str, Any], lease_until: str) -> dict[str, Any] | None:
+        """Lease a timer if its etag is unchanged since it was read."""
+        try:
+            return self._call(
+                "claim_timer",
+                self.container.replace_item,
+                item=timer["id"],
+                body={**timer, "status": "firing", "lease_until": lease_until},
+                etag=timer["_etag"],
+                match_condition=MatchConditions.IfNotModified
+            )
+        except CosmosAccessConditionFailedError:
+            return None
+
+    def delete_timer(self, timer: dict[str, Any]) -> None:
+        """Delete a phase timer."""
+        try:
+            self._call(
+                "delete_timer",
+                self.container.delete_item,
+                item=timer["id"],
+                partition_key=timer["partitionKey"]
+            )
+        except CosmosResourceNotFoundError:
+            pass
+
+    def save_job(self, job: dict[str, Any]) -> None:
+        """Create or replace a background job."""
+        self._call("save_job", self.container.upsert_item, body=job)
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """Retrieve a background job by ID (jobs are their own partition)."""
+        try:
+            return self._call(
+                "get_job",
+                self.container.read_item,
+                item=job_id,
+                partition_key=job_id
+            )
+        except CosmosResourceNotFoundError:
+            return None
+
+    def create_idempotency_record(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """Create an idempotency record; None if one already exists."""
+        try:
+            return self._call("create_idempotency_record", self.container.create_item, body=record)
+        except CosmosResourceExistsError:
+            return None
+
+    def get_idempotency_record(self, record_id: str) -> dict[str, Any] | None:
+        """Retrieve an idempotency record by ID (records are their own partition)."""
+        try:
+            return self._call(
+                "get_idempotency_record",
+                self.container.read_item,
+                item=record_id,
+                partition_key=record_id
+            )
+        except CosmosResourceNotFoundError:
+            return None
+
+    def replace_idempotency_record(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """Replace an idempotency record if its etag is unchanged; None otherwise."""
+        try:
+            return self._call(
+                "replace_idempotency_record",
+                self.container.replace_item,
+                item=record["id"],
+                body=record,
+                etag=record["_etag"],
+                match_condition=MatchConditions.IfNotModified
+            )
+        except (CosmosAccessConditionFailedError, CosmosResourceNotFoundError):
+            return None
+
+    def delete_idempotency_record(self, record: dict[str, Any]) -> None:
+        """Delete an idempotency record if its etag is unchanged."""
+        try:
+            self._call(
+                "delete_idempotency_record",
+                self.container.delete_item,
+                item=record["id"],
+                partition_key=record["id"],
+                etag=record["_etag"],
+                match_condition=MatchConditions.IfNotModified
+            )
+        except (CosmosAccessConditionFailedError, CosmosResourceNotFoundError):
+            pass
+
+    def append_task_events(
+        self,
+        new_hire_id: str,
+        events: list[dict[str, Any]],
+        snapshot: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Append a hire's task events, and replace its snapshot, in transactional batches.
+
+        Event IDs carry the sequence number and are created, not upserted, so
+        a concurrent writer that claimed the same numbers fails instead of
+        forking the history. The snapshot commits with the last events.
+
+        Raises:
+            ValueError: If another writer appended first
+        """
+        operations = [("create", (event,)) for event in events]
+        if snapshot is not None:
+            operations.append(("upsert", (snapshot,)))
+        for start in range(0, len(operations), MAX_BATCH_OPERATIONS):
+            try:
+                self._call(
+                    "append_task_events",
+                    self.container.execute_item_batch,
+                    batch_operations=operations[start:start + MAX_BATCH_OPERATIONS],
+                    partition_key=new_hire_id
+                )
+            except CosmosBatchOperationError as e:
+                raise ValueError(f"Task ledger conflict for {new_hire_id}") from e
+
+    def list_task_events(self, new_hire_id: str, after_seq: int = 0) -> list[dict[str, Any]]:
+        """A hire's task events with a sequence number above ``after_seq``, in order."""
+        return self._call(
+            "list_task_events",
+            self.container.query_items,
+            lazy=True,
+            query=TASK_EVENTS_QUERY,
+            parameters=[
+                {"name": "@new_hire_id", "value": new_hire_id},
+                {"name": "@after_seq", "value": after_seq},
+            ],
+            partition_key=new_hire_id
+        )
+
+    def get_task_snapshot(self, new_hire_id: str) -> dict[str, Any] | None:
+        """Retrieve a hire's latest task snapshot."""
+        try:
+            return self._call(
+                "get_task_snapshot",
+                self.container.read_item,
+                item=task_snapshot_id(new_hire_id),
+                partition_key=new_hire_id
+            )
+        except CosmosResourceNotFoundError:
+            return None
+
     def delete_state(self, onboarding_id: str) -> None:
         """Delete onboarding state."""
-        self.container.delete_item(
+        self._call(
+            "delete_state",
+            self.container.delete_item,
             item=onboarding_id,
             partition_key=onboarding_id
         )
     
     def list_states(self, limit: int = 100) -> list[OnboardingState]:
         """List all onboarding states."""
-        query = "SELECT * FROM c ORDER BY c.created_at DESC OFFSET 0 LIMIT @limit"
+        query = LIST_STATES_QUERY
         parameters = [{"name": "@limit", "value": limit}]
         
-        items = list(self.container.query_items(
+        items = list(self._call(
+            "list_states",
+            self.container.query_items,
+            lazy=True,
             query=query,
             parameters=parameters,
             enable_cross_partition_query=True
@@ -80,6 +508,149 @@ class OnboardingCosmosClient:
         
         return items
 
+    def by_manager(self, manager_id: str, limit: int = 100) -> QueryResult:
+        """List hires reporting to a manager, ordered by start date."""
+        return self._query("by_manager", BY_MANAGER_QUERY, [
+            {"name": "@value", "value": manager_id},
+            {"name": "@limit", "value": limit},
+        ])
+
+    def by_phase(self, phase: str, limit: int = 100) -> QueryResult:
+        """List hires in an onboarding phase, ordered by start date."""
+        return self._query("by_phase", BY_PHASE_QUERY, [
+            {"name": "@value", "value": phase},
+            {"name": "@limit", "value": limit},
+        ])
+
+    def by_department(self, department: str, limit: int = 100) -> QueryResult:
+        """List hires in a department, ordered by start date."""
+        return self._query("by_department", BY_DEPARTMENT_QUERY, [
+            {"name": "@value", "value": department},
+            {"name": "@limit", "value": limit},
+        ])
+
+    def starting_between(self, start: str, end: str, limit: int = 100) -> QueryResult:
+        """List hires whose start date falls within [start, end] (YYYY-MM-DD)."""
+        return self._query("starting_between", STARTING_BETWEEN_QUERY, [
+            {"name": "@start", "value": start},
+            {"name": "@end", "value": end},
+            {"name": "@limit", "value": limit},
+        ])
+
+    def list_states_page(
+        self,
+        filters: StateFilters | None = None,
+        page_size: int = 50,
+        continuation: str | None = None,
+    ) -> QueryResult:
+        """
+        Read one page of hire summaries ordered by start date.
+
+        Only one page is fetched per call; the SDK continuation token is
+        returned so callers can walk the whole container page by page. The
+        token is JSON, so it is passed out base64url-encoded and can be used
+        as a URI path segment, like the in-memory store's cursor.
+
+        Args:
+            filters: Phase, department, manager and start-date range filters
+            page_size: Maximum items returned (capped at MAX_PAGE_SIZE)
+            continuation: Opaque token from the previous page, or None
+
+        Returns:
+            QueryResult whose ``continuation`` is None on the last page
+        """
+        query, parameters = build_list_page_query(filters or StateFilters())
+        measurement = Measurement()
+        if continuation:
+            continuation = base64.urlsafe_b64decode(continuation).decode()
+
+        def fetch_page(**kwargs: Any) -> tuple[list[dict[str, Any]], str | None]:
+            # The SDK's pager exposes the token, but ``by_page`` is typed as a plain iterator
+            pages = cast(
+                PageIterator[dict[str, Any]],
+                self.container.query_items(**kwargs).by_page(continuation),
+            )
+            page = next(pages, None)
+            items: list[dict[str, Any]] = [] if page is None else list(page)
+            return items, pages.continuation_token
+
+        items, token = self._call(
+            "list_states_page",
+            fetch_page,
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=True,
+            max_item_count=max(1, min(page_size, MAX_PAGE_SIZE)),
+            response_hook=measurement.capture
+        )
+
+        return QueryResult(
+            items=items,
+            request_charge=measurement.request_charge,
+            continuation=base64.urlsafe_b64encode(token.encode()).decode() if token else None
+        )
+
+    def _query(
+        self, operation: str, query: str, parameters: list[dict[str, Any]]
+    ) -> QueryResult:
+        """Run a parameterized query, summing request charge across pages."""
+        measurement = Measurement()
+
+        items = list(self._call(
+            operation,
+            self.container.query_items,
+            lazy=True,
+            query=query,
+            parameters=parameters,
+            enable_cross_partition_query=True,
+            response_hook=measurement.capture
+        ))
+
+        return QueryResult(items=items, request_charge=measurement.request_charge)
+
+    def ensure_indexing_policy(self) -> None:
+        """Apply the tuned indexing policy to the onboarding container."""
+        self.database.replace_container(
+            self.container,
+            partition_key=PartitionKey(path="/partitionKey"),
+            indexing_policy=INDEXING_POLICY
+        )
+
+    def read_change_feed(
+        self, continuation: str | None = None, max_item_count: int = 100
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Read the next batch of changed documents from the container change feed.
+
+        Args:
+            continuation: Token returned by the previous call, or None to
+                start from the beginning of the feed
+            max_item_count: Maximum number of documents to return
+
+        Returns:
+            Tuple of (documents in modification order, continuation token)
+        """
+        if continuation:
+            feed = self.container.query_items_change_feed(
+                continuation=continuation,
+                max_item_count=max_item_count
+            )
+        else:
+            feed = self.container.query_items_change_feed(
+                start_time="Beginning",
+                max_item_count=max_item_count
+            )
+
+        pages = feed.by_page()
+        try:
+            items = list(next(pages))
+        except StopIteration:
+            items = []
+
+        # The change feed continuation is returned as the response etag
+        headers = self.container.client_connection.last_response_headers
+        return items, headers.get("etag", continuation)
+
 
 # Singleton instance
 _cosmos_client: Optional[OnboardingCosmosClient] = None
@@ -0,0 +1,175 @@
+"""Latency and request-charge instrumentation for Cosmos DB operations.
+
+``OnboardingCosmosClient`` records one sample per call, labeled by operation
+name and status, when it is given a ``CosmosMetrics`` instance. Samples feed a
+fixed-bucket latency histogram and request unit (RU) counters. Exporters are
+plain callables that receive ``snapshot()`` output, so the metrics can be
+pushed into whatever surface the host uses (logs, Application Insights, ...).
+The process-wide instance exports through ``logging_exporter``; function_app
+pushes it on a timer.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (milliseconds) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+Exporter = Callable[[dict[str, Any]], None]
+
+
+@dataclass
+class _Series:
+    """Histogram and counters for one (operation, status) label pair."""
+
+    buckets: list[int]
+    count: int = 0
+    latency_ms_sum: float = 0.0
+    request_charge: float = 0.0
+
+
+@dataclass
+class Measurement:
+    """Collects response headers for a single in-flight operation."""
+
+    request_charge: float = 0.0
+    status: str = "ok"
+    headers: dict[str, str] = field(default_factory=dict[str, str])
+
+    def capture(self, headers: Mapping[str, str], _result: Any = None) -> None:
+        """Response hook passed to the Cosmos SDK; called once per page."""
+        self.headers = dict(headers)
+        self.request_charge += float(headers.get("x-ms-request-charge", 0))
+
+
+class CosmosMetrics:
+    """Thread-safe latency histograms and RU counters keyed by operation and status."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        """Initialize empty metrics with the given histogram bucket bounds."""
+        self.buckets_ms = buckets_ms
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._exporters: list[Exporter] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self, operation: str, status: str, latency_ms: float, request_charge: float = 0.0
+    ) -> None:
+        """Record one completed operation."""
+        index = bisect.bisect_left(self.buckets_ms, latency_ms)
+        with self._lock:
+            series = self._series.get((operation, status))
+            if series is None:
+                series = _Series(buckets=[0] * (len(self.buckets_ms) + 1))
+                self._series[(operation, status)] = series
+            series.buckets[index] += 1
+            series.count += 1
+            series.latency_ms_sum += latency_ms
+            series.request_charge += request_charge
+
+    @contextmanager
+    def measure(self, operation: str) -> Generator[Measurement, None, None]:
+        """Time a block and record it with the request charge captured from headers."""
+        measurement = Measurement()
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except Exception as e:
+            status_code = getattr(e, "status_code", None)
+            measurement.status = str(status_code) if status_code else "error"
+            headers = getattr(e, "headers", None) or getattr(
+                getattr(e, "response", None), "headers", None
+            )
+            if headers:
+                measurement.capture(headers)
+            raise
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            self.record(operation, measurement.status, latency_ms, measurement.request_charge)
+
+    def quantile(self, operation: str, q: float, status: str = "ok") -> float | None:
+        """Estimate a latency quantile (bucket upper bound) for an operation."""
+        with self._lock:
+            series = self._series.get((operation, status))
+            if series is None or series.count == 0:
+                return None
+            target = q * series.count
+            seen = 0
+            for bound, n in zip(self.buckets_ms, series.buckets):
+                seen += n
+                if seen >= target:
+                    return float(bound)
+            return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable view of all series."""
+        with self._lock:
+            return {
+                "buckets_ms": list(self.buckets_ms),
+                "series": [
+                    {
+                        "operation": operation,
+                        "status": status,
+                        "count": series.count,
+                        "latency_ms_sum": round(series.latency_ms_sum, 3),
+                        "request_charge": round(series.request_charge, 3),
+                        "buckets": list(series.buckets),
+                    }
+                    for (operation, status), series in sorted(self._series.items())
+                ],
+            }
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        """Register a callable that receives snapshots on ``export()``."""
+        self._exporters.append(exporter)
+
+    def export(self) -> None:
+        """Push the current snapshot to every registered exporter."""
+        snapshot = self.snapshot()
+        for exporter in self._exporters:
+            try:
+                exporter(snapshot)
+            except Exception:
+                logger.exception("Metrics exporter failed")
+
+    def reset(self) -> None:
+        """Drop all recorded samples."""
+        with self._lock:
+            self._series.clear()
+
+
+def logging_exporter(snapshot: dict[str, Any]) -> None:
+    """Exporter that writes one log line per series (picked up by Application Insights)."""
+    for series in snapshot["series"]:
+        logger.info(
+            f"[COSMOS METRICS] operation={series['operation']} status={series['status']} "
+            f"count={series['count']} latency_ms_sum={series['latency_ms_sum']} "
+            f"request_charge={series['request_charge']}"
+        )
+
+
+def cosmos_metrics_enabled() -> bool:
+    """Whether Cosmos operations are instrumented (COSMOS_METRICS_ENABLED)."""
+    return os.environ.get("COSMOS_METRICS_ENABLED", "false").lower() == "true"
+
+
+# Singleton instance
+_cosmos_metrics: CosmosMetrics | None = None
+
+
+def get_cosmos_metrics() -> CosmosMetrics:
+    """Get or create the process-wide Cosmos metrics singleton, exporting to the log."""
+    global _cosmos_metrics
+    if _cosmos_metrics is None:
+        _cosmos_metrics = CosmosMetrics()
+        _cosmos_metrics.add_exporter(logging_exporter)
+    return _cosmos_metrics
@@ -1,12 +1,23 @@
 """Email service for sending onboarding notifications."""
 
 import os
+import atexit
 import logging
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
 from dataclasses import dataclass
 
+from .email_digest import ManagerDigestCoalescer, PendingNotification, digest_key
+from .email_queue import EmailDispatcher
+from .email_templates import EmailTemplates, RenderedEmail, get_email_templates
+from .email_transport import EmailTransport, HTTPTransport, SMTPTransport
+
 logger = logging.getLogger(__name__)
 
+# Idempotency keys remembered per process to suppress repeated sends within it
+SENT_KEY_CAPACITY = 10_000
+
 
 @dataclass
 class EmailMessage:
@@ -15,72 +26,284 @@ class EmailMessage:
     subject: str
     body: str
     html_body: Optional[str] = None
+    idempotency_key: str | None = None
+    # Keys of the notifications a digest covers, recorded as sent with it
+    member_keys: tuple[str, ...] = ()
 
 
 class EmailService:
     """Service for sending onboarding emails."""
     
-    def __init__(self):
-        """Initialize email service."""
+    def __init__(
+        self,
+        dispatcher: EmailDispatcher | None = None,
+        transport: EmailTransport | None = None,
+        coalescer: ManagerDigestCoalescer | None = None,
+        templates: EmailTemplates | None = None,
+    ):
+        """
+        Initialize email service.
+
+        Args:
+            dispatcher: Queue that send_* methods enqueue into. When omitted and
+                EMAIL_ASYNC=true, a dispatcher is started that delivers through
+                this service; otherwise messages are sent inline.
+            transport: Pooled delivery transport. When omitted, one is built
+                from EMAIL_PROVIDER settings on the first real send.
+            coalescer: Groups manager notifications into digests. When omitted
+                and EMAIL_DIGEST_WINDOW_SECONDS > 0, one is created that
+                delivers through ``send_manager_digest``.
+            templates: Template cache (defaults to the shared instance)
+        """
         self.from_address = os.environ.get("EMAIL_FROM", "noreply@company.com")
         self.enabled = os.environ.get("EMAIL_ENABLED", "false").lower() == "true"
+        self.provider = os.environ.get("EMAIL_PROVIDER", "smtp")
+        self.templates = templates or get_email_templates()
+        self.transport = transport
+        self._transport_lock = threading.Lock()
+
+        if dispatcher is None and os.environ.get("EMAIL_ASYNC", "false").lower() == "true":
+            rate_limit = float(os.environ.get("EMAIL_RATE_LIMIT_PER_SECOND", "10"))
+            dispatcher = EmailDispatcher(
+                send=self.send_message,
+                workers=int(os.environ.get("EMAIL_WORKERS", "4")),
+                max_queue_size=int(os.environ.get("EMAIL_QUEUE_SIZE", "1000")),
+                rate_limits={self.provider: rate_limit},
+            )
+            atexit.register(dispatcher.shutdown)
+        self.dispatcher = dispatcher
+
+        digest_window = float(os.environ.get("EMAIL_DIGEST_WINDOW_SECONDS", "0"))
+        if coalescer is None and digest_window > 0:
+            coalescer = ManagerDigestCoalescer(
+                send_digest=self.send_manager_digest,
+                window_seconds=digest_window,
+                max_batch=int(os.environ.get("EMAIL_DIGEST_MAX_BATCH", "20")),
+            )
+            atexit.register(coalescer.close)
+        self.coalescer = coalescer
+        self._sent_keys: OrderedDict[str, None] = OrderedDict()
+        self._sent_keys_lock = threading.Lock()
     
-    def send_welcome_email(self, name: str, email: str, start_date: str) -> bool:
+    def send_welcome_email(
+        self, name: str, email: str, start_date: str, idempotency_key: str | None = None
+    ) -> bool:
         """Send welcome email to new hire."""
-        message = EmailMessage(
-            to=email,
-            subject=f"Welcome to the team, {name}!",
-            body=f"""Hi {name},
-
-Welcome to the company! We're excited to have you join us on {start_date}.
-
-Your onboarding process has been initiated. You'll receive updates as tasks are completed.
-
-Best regards,
-HR Team
-""",
-            html_body=f"""<html>
-<body>
-<h1>Welcome, {name}!</h1>
-<p>We're excited to have you join us on <strong>{start_date}</strong>.</p>
-<p>Your onboarding process has been initiated.</p>
-<p>Best regards,<br>HR Team</p>
-</body>
-</html>"""
+        return self._dispatch(self.build_welcome_email(name, email, start_date, idempotency_key))
+
+    def build_welcome_email(
+        self,
+        name: str,
+        email: str,
+        start_date: str,
+        idempotency_key: str | None = None,
+        locale: str | None = None,
+        department: str | None = None,
+    ) -> EmailMessage:
+        """Build the welcome email for a new hire."""
+        rendered = self.templates.render(
+            "welcome_email", {"name": name, "start_date": start_date}, locale, department
         )
-        
-        return self._send(message)
-    
-    def send_manager_notification(self, manager_email: str, new_hire_name: str, start_date: str) -> bool:
-        """Notify manager about new hire."""
-        message = EmailMessage(
-            to=manager_email,
-            subject=f"New Team Member: {new_hire_name}",
-            body=f"""Hello,
-
-{new_hire_name} will be joining your team on {start_date}.
-
-Please ensure you're prepared for their arrival:
-- Schedule welcome 1:1
-- Assign a buddy/mentor
-- Prepare first week schedule
-
-Best regards,
-HR Team
-"""
+        return self._from_rendered(email, rendered, idempotency_key)
+
+    def build_welcome_emails(self, hires: list[dict[str, Any]]) -> list[EmailMessage]:
+        """
+        Build welcome emails for a cohort in one pass.
+
+        Each hire needs ``name``, ``email`` and ``start_date`` and may carry
+        ``idempotency_key``, ``locale`` and ``department``.
+        """
+        rendered = self.templates.render_bulk("welcome_email", hires)
+        return [
+            self._from_rendered(hire["email"], r, hire.get("idempotency_key"))
+            for hire, r in zip(hires, rendered)
+        ]
+
+    def send_manager_notification(
+        self,
+        manager_email: str,
+        new_hire_name: str,
+        start_date: str,
+        idempotency_key: str | None = None
+    ) -> bool:
+        """Notify manager about new hire, coalesced into a digest when enabled."""
+        if self.coalescer is not None:
+            return self.coalescer.add(manager_email, new_hire_name, start_date, idempotency_key)
+        return self._dispatch(self.build_manager_notification(
+            manager_email, new_hire_name, start_date, idempotency_key
+        ))
+
+    def build_manager_notification(
+        self,
+        manager_email: str,
+        new_hire_name: str,
+        start_date: str,
+        idempotency_key: str | None = None,
+        locale: str | None = None,
+    ) -> EmailMessage:
+        """Build the new-team-member notification for a manager."""
+        rendered = self.templates.render(
+            "manager_notification",
+            {"new_hire_name": new_hire_name, "start_date": start_date},
+            locale,
         )
-        
-        return self._send(message)
-    
+        return self._from_rendered(manager_email, rendered, idempotency_key)
+
+    def send_manager_digest(
+        self,
+        manager_email: str,
+        notifications: list[PendingNotification],
+        window_start: str | None = None,
+    ) -> bool:
+        """
+        Send one email announcing every pending new hire to a manager.
+
+        Hires whose notification key was already sent by this process are left
+        out; nothing is sent if that leaves none.
+        """
+        with self._sent_keys_lock:
+            notifications = [
+                n for n in notifications
+                if n.idempotency_key is None or n.idempotency_key not in self._sent_keys
+            ]
+        if not notifications:
+            return True
+        if len(notifications) == 1:
+            only = notifications[0]
+            return self._dispatch(self.build_manager_notification(
+                manager_email, only.new_hire_name, only.start_date, only.idempotency_key
+            ))
+        return self._dispatch(
+            self.build_manager_digest(manager_email, notifications, window_start=window_start)
+        )
+
+    def build_manager_digest(
+        self,
+        manager_email: str,
+        notifications: list[PendingNotification],
+        locale: str | None = None,
+        window_start: str | None = None,
+    ) -> EmailMessage:
+        """
+        Build a single notification covering several new team members.
+
+        The digest is keyed on the manager and ``window_start`` (unkeyed when
+        omitted); the notifications' own keys are carried as ``member_keys``.
+        """
+        hires = "\n".join(
+            f"- {n.new_hire_name} (starting {n.start_date})" for n in notifications
+        )
+        rendered = self.templates.render(
+            "manager_digest", {"hires": hires, "count": len(notifications)}, locale
+        )
+        key = digest_key(manager_email, window_start) if window_start else None
+        message = self._from_rendered(manager_email, rendered, key)
+        message.member_keys = tuple(n.idempotency_key for n in notifications if n.idempotency_key)
+        return message
+
+    @staticmethod
+    def _from_rendered(
+        to: str, rendered: RenderedEmail, idempotency_key: str | None
+    ) -> EmailMessage:
+        return EmailMessage(
+            to=to,
+            subject=rendered.subject,
+            body=rendered.body,
+            html_body=rendered.html_body,
+            idempotency_key=idempotency_key,
+        )
+
+    def _dispatch(self, message: EmailMessage) -> bool:
+        """Enqueue the message when a dispatcher is configured, else send inline."""
+        if self.dispatcher is not None:
+            return self.dispatcher.submit(message, provider=self.provider)
+        return self.send_message(message)
+
+    def send_message(self, message: EmailMessage) -> bool:
+        """
+        Send a message synchronously.
+
+        A message whose key was already sent by this process, or a digest all
+        of whose members were, is skipped and reported as delivered. A sent
+        digest records its members' keys as sent too. The record is in memory
+        only, so it does not survive a restart or span instances; the outbox
+        relay's delivery marker is what keeps other processes from sending a
+        message again.
+        """
+        key = message.idempotency_key
+        with self._sent_keys_lock:
+            if key in self._sent_keys or (
+                message.member_keys and all(k in self._sent_keys for k in message.member_keys)
+            ):
+                logger.info(f"[EMAIL] Skipping duplicate message {key} to {message.to}")
+                return True
+
+        sent = self._send(message)
+
+        if sent:
+            with self._sent_keys_lock:
+                for sent_key in (key, *message.member_keys):
+                    if sent_key is not None:
+                        self._sent_keys[sent_key] = None
+                while len(self._sent_keys) > SENT_KEY_CAPACITY:
+                    self._sent_keys.popitem(last=False)
+        return sent
+
+    def shutdown(self, timeout: float = 30.0) -> bool:
+        """Flush digests, drain queued messages, stop the workers and close the transport."""
+        if self.coalescer is not None:
+            self.coalescer.close()
+        drained = True
+        if self.dispatcher is not None:
+            drained = self.dispatcher.shutdown(drain=True, timeout=timeout)
+        if self.transport is not None:
+            self.transport.close()
+        return drained
+
+    def warm_up(self) -> None:
+        """Compile templates and, when sending is enabled, build the transport before the first send."""
+        self.templates.preload()
+        if self.enabled:
+            self._get_transport()
+
+    def _get_transport(self) -> EmailTransport | None:
+        """Return the transport, building it from the environment on first use."""
+        with self._transport_lock:
+            if self.transport is not None:
+                return self.transport
+            if self.provider == "smtp" and os.environ.get("EMAIL_SMTP_HOST"):
+                self.transport = SMTPTransport(
+                    host=os.environ["EMAIL_SMTP_HOST"],
+                    port=int(os.environ.get("EMAIL_SMTP_PORT", "587")),
+                    username=os.environ.get("EMAIL_SMTP_USERNAME"),
+                    password=os.environ.get("EMAIL_SMTP_PASSWORD"),
+                    starttls=os.environ.get("EMAIL_SMTP_STARTTLS", "true").lower() == "true",
+                    pool_size=int(os.environ.get("EMAIL_POOL_SIZE", "4")),
+                    pooled=os.environ.get("EMAIL_POOLING", "true").lower() == "true",
+                )
+            elif self.provider == "http" and os.environ.get("EMAIL_API_ENDPOINT"):
+                self.transport = HTTPTransport(
+                    endpoint=os.environ["EMAIL_API_ENDPOINT"],
+                    api_key=os.environ.get("EMAIL_API_KEY", ""),
+                    max_connections=int(os.environ.get("EMAIL_POOL_SIZE", "4")),
+                )
+            return self.transport
+
     def _send(self, message: EmailMessage) -> bool:
         """Send email message."""
         if not self.enabled:
             logger.info(f"[EMAIL MOCK] To: {message.to}, Subject: {message.subject}")
             return True
-        
-        # TODO: Implement actual email sending (Azure Communication Services, SendGrid, etc.)
-        logger.warning("Email sending not implemented, set EMAIL_ENABLED=true to use")
-        return False
+
+        transport = self._get_transport()
+        if transport is None:
+            logger.warning(f"No transport configured for email provider {self.provider}")
+            return False
+        try:
+            return transport.send(message, self.from_address)
+        except Exception:
+            logger.exception(f"Failed to send email to {message.to}")
+            return False
 
 
 # Singleton instance
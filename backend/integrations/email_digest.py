@@ -0,0 +1,161 @@
+"""Coalescing of manager notifications into per-manager digests.
+
+When a cohort is imported, a manager with five new reports would otherwise get
+five separate "New Team Member" emails. ``ManagerDigestCoalescer`` holds
+pending notifications per recipient for a short window and then flushes one
+digest per manager, either when the window since the first pending
+notification elapses or as soon as a manager reaches the size cap.
+
+A digest's idempotency key is derived from the manager and the window it
+covers, not from its members, so a retried digest keeps its key even if its
+membership changed. Members are deduplicated individually by their own keys.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingNotification:
+    """A new hire waiting to be announced to their manager."""
+
+    new_hire_name: str
+    start_date: str
+    idempotency_key: str | None = None
+
+
+def digest_key(manager_email: str, window_start: str) -> str:
+    """Idempotency key for a manager's digest covering the window opened at ``window_start``."""
+    return hashlib.sha256(f"digest:{manager_email}:{window_start}".encode()).hexdigest()[:32]
+
+
+class ManagerDigestCoalescer:
+    """Groups manager notifications by recipient and flushes them as digests."""
+
+    def __init__(
+        self,
+        send_digest: Callable[[str, list[PendingNotification], str], bool],
+        window_seconds: float = 30.0,
+        max_batch: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the coalescer; the flusher thread starts on first use.
+
+        Args:
+            send_digest: Delivers one digest to a manager, given the batch and
+                when its window opened (ISO 8601, UTC); returns True when sent
+            window_seconds: How long the first pending notification may wait
+            max_batch: Pending notifications that trigger an immediate flush
+            clock: Monotonic time source
+        """
+        self.send_digest = send_digest
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.clock = clock
+        self._pending: dict[str, list[PendingNotification]] = {}
+        self._deadlines: dict[str, float] = {}
+        self._windows: dict[str, str] = {}
+        self._condition = threading.Condition()
+        self._flusher: threading.Thread | None = None
+        self._closed = False
+
+    def add(
+        self,
+        manager_email: str,
+        new_hire_name: str,
+        start_date: str,
+        idempotency_key: str | None = None,
+    ) -> bool:
+        """Queue a notification. Returns False if the coalescer is closed."""
+        notification = PendingNotification(new_hire_name, start_date, idempotency_key)
+        with self._condition:
+            if self._closed:
+                return False
+            batch = self._pending.setdefault(manager_email, [])
+            if not batch:
+                self._deadlines[manager_email] = self.clock() + self.window_seconds
+                self._windows[manager_email] = datetime.now(UTC).isoformat()
+            batch.append(notification)
+            full = self._take(manager_email) if len(batch) >= self.max_batch else None
+            self._ensure_flusher()
+            self._condition.notify()
+        if full is not None:
+            self._send(manager_email, *full)
+        return True
+
+    def flush_due(self, now: float | None = None) -> int:
+        """Flush every manager whose window has elapsed. Returns digests sent."""
+        now = self.clock() if now is None else now
+        with self._condition:
+            due = [
+                (manager, self._take(manager))
+                for manager, deadline in list(self._deadlines.items())
+                if deadline <= now
+            ]
+        return sum(self._send(manager, *batch) for manager, batch in due)
+
+    def flush_all(self) -> int:
+        """Flush every pending manager regardless of window. Returns digests sent."""
+        with self._condition:
+            batches = [(manager, self._take(manager)) for manager in list(self._pending)]
+        return sum(self._send(manager, *batch) for manager, batch in batches)
+
+    def close(self) -> int:
+        """Stop the flusher and send everything still pending."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._flusher is not None:
+            self._flusher.join(timeout=1.0)
+        return self.flush_all()
+
+    @property
+    def pending(self) -> int:
+        """Notifications waiting to be flushed."""
+        with self._condition:
+            return sum(len(batch) for batch in self._pending.values())
+
+    def _take(self, manager_email: str) -> tuple[list[PendingNotification], str]:
+        """Remove and return a manager's batch and window start. Caller holds the lock."""
+        self._deadlines.pop(manager_email, None)
+        return self._pending.pop(manager_email, []), self._windows.pop(manager_email, "")
+
+    def _send(
+        self, manager_email: str, batch: list[PendingNotification], window_start: str
+    ) -> bool:
+        try:
+            return bool(self.send_digest(manager_email, batch, window_start))
+        except Exception:
+            logger.exception(f"Manager digest to {manager_email} failed")
+            return False
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flusher. Caller holds the lock."""
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._run, name="manager-digest-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _run(self) -> None:
+        """Flusher loop: sleep until the earliest deadline, then flush due managers."""
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                if self._deadlines:
+                    timeout = max(0.0, min(self._deadlines.values()) - self.clock())
+                else:
+                    timeout = None
+                self._condition.wait(timeout)
+                if self._closed:
+                    return
+            self.flush_due()
@@ -0,0 +1,172 @@
+"""Asynchronous email dispatch with a bounded queue and worker pool.
+
+``EmailService`` hands messages to an ``EmailDispatcher`` instead of sending
+them inline, so request handlers such as ``create_onboarding`` never wait on
+mail delivery. Workers send through the service's delivery function, each
+provider is held to its own token-bucket rate limit, and a full queue pushes
+back on producers rather than growing without bound.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .throttling import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROVIDER = "default"
+
+
+@dataclass
+class DispatcherStats:
+    """Counters for dispatched messages."""
+
+    enqueued: int = 0
+    sent: int = 0
+    failed: int = 0
+    rejected: int = 0
+
+
+class EmailDispatcher:
+    """Bounded queue drained by a pool of worker threads."""
+
+    def __init__(
+        self,
+        send: Callable[..., bool],
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        rate_limits: dict[str, float] | None = None,
+        enqueue_timeout: float = 1.0,
+    ):
+        """
+        Initialize and start the worker pool.
+
+        Args:
+            send: Delivery function; returns True when the message was sent
+            workers: Number of worker threads
+            max_queue_size: Messages held before producers are pushed back
+            rate_limits: Messages per second allowed per provider name
+            enqueue_timeout: Seconds ``submit`` blocks on a full queue
+        """
+        self.send = send
+        self.enqueue_timeout = enqueue_timeout
+        self.stats = DispatcherStats()
+        # Items are (message, provider); None tells a worker to stop
+        self._queue: queue.Queue[tuple[object, str] | None] = queue.Queue(maxsize=max_queue_size)
+        self._buckets = {
+            provider: TokenBucket(rate) for provider, rate in (rate_limits or {}).items()
+        }
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"email-dispatch-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self, message: object, provider: str = DEFAULT_PROVIDER, timeout: float | None = None
+    ) -> bool:
+        """
+        Enqueue a message for delivery.
+
+        Blocks for up to ``timeout`` (default ``enqueue_timeout``) when the
+        queue is full. Returns False if the message was rejected.
+        """
+        if self._closed:
+            self._count("rejected")
+            return False
+        with self._idle:
+            self._pending += 1
+        try:
+            self._queue.put(
+                (message, provider),
+                timeout=self.enqueue_timeout if timeout is None else timeout,
+            )
+        except queue.Full:
+            self._done()
+            self._count("rejected")
+            logger.warning(f"Email queue full, rejected message for provider {provider}")
+            return False
+        self._count("enqueued")
+        return True
+
+    def _work(self) -> None:
+        """Worker loop: rate limit per provider, deliver, record outcome."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            message, provider = item
+            try:
+                bucket = self._buckets.get(provider)
+                if bucket is not None:
+                    bucket.acquire()
+                self._count("sent" if self.send(message) else "failed")
+            except Exception:
+                self._count("failed")
+                logger.exception("Email delivery failed")
+            finally:
+                self._done()
+
+    def _count(self, outcome: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, outcome, getattr(self.stats, outcome) + 1)
+
+    def _done(self) -> None:
+        with self._idle:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    @property
+    def pending(self) -> int:
+        """Messages enqueued or in flight."""
+        return self._pending
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every accepted message has been processed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self, drain: bool = True, timeout: float | None = 30.0) -> bool:
+        """
+        Stop accepting messages and stop the workers.
+
+        Args:
+            drain: Deliver queued messages before stopping
+            timeout: Maximum seconds to wait for the drain
+
+        Returns:
+            True if every accepted message was processed
+        """
+        if self._closed and not any(worker.is_alive() for worker in self._workers):
+            return self._pending == 0
+        self._closed = True
+        if not drain:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._count("rejected")
+                self._done()
+        drained = self.drain(timeout)
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=1.0)
+        return drained
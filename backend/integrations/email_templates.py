@@ -0,0 +1,254 @@
+"""Precompiled, cached email templates with locale and department variants.
+
+Templates live on disk under ``integrations/templates`` as one file per part:
+``<name>.subject``, ``<name>.txt`` and optionally ``<name>.html``. Each file
+is parsed once into literal and placeholder segments (``{field}`` syntax, as
+in ``str.format``) and cached; the cache re-checks the file's modification
+time at most every ``check_interval`` seconds and recompiles when it changed.
+
+Variants are looked up most specific first::
+
+    <locale>/<department>/<file>   e.g. es/engineering/welcome_email.txt
+    <locale>/<file>                e.g. es/welcome_email.txt
+    default/<department>/<file>
+    default/<file>
+
+Regional locales fall back to their language (``es-MX`` to ``es``). Values
+substituted into HTML templates are escaped.
+"""
+
+import html
+import os
+import string
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+DEFAULT_VARIANT = "default"
+PARTS = ("subject", "txt", "html")
+
+# (name, part, locale, department)
+_CacheKey = tuple[str, str, str | None, str | None]
+
+
+@dataclass
+class RenderedEmail:
+    """Rendered subject and bodies for one message."""
+
+    subject: str
+    body: str
+    html_body: str | None = None
+
+
+class CompiledTemplate:
+    """A template parsed once, then rendered with ``str.format_map``."""
+
+    def __init__(self, source: str, escape: bool = False):
+        """
+        Validate ``source`` and record its fields.
+
+        Args:
+            source: Template text with ``{field}`` placeholders
+            escape: HTML-escape substituted string values
+
+        Raises:
+            ValueError: If the placeholder syntax is malformed
+        """
+        self.source = source
+        self.escape = escape
+        self.fields = frozenset(
+            field for _, field, _, _ in string.Formatter().parse(source) if field is not None
+        )
+
+    def render(self, context: dict[str, Any]) -> str:
+        """Substitute ``context`` values into the template."""
+        if self.escape:
+            context = {
+                field: html.escape(value) if isinstance(value, str) else value
+                for field in self.fields
+                for value in (context[field],)
+            }
+        return self.source.format_map(context)
+
+
+@dataclass
+class _CacheEntry:
+    """A resolved template and when its file was last checked."""
+
+    path: Path | None
+    mtime: int | None
+    template: CompiledTemplate | None
+    checked_at: float
+
+
+def _variant_dirs(locale: str | None, department: str | None) -> list[str]:
+    """Candidate directories, most specific first."""
+    locales: list[str] = []
+    if locale:
+        locales.append(locale.lower())
+        if "-" in locale:
+            locales.append(locale.split("-")[0].lower())
+    locales.append(DEFAULT_VARIANT)
+    department_key = department.lower().replace(" ", "_") if department else None
+
+    dirs: list[str] = []
+    for name in locales:
+        if department_key:
+            dirs.append(f"{name}/{department_key}")
+        dirs.append(name)
+    return dirs
+
+
+class EmailTemplates:
+    """Loads, compiles and caches email templates from a directory."""
+
+    def __init__(
+        self,
+        directory: Path = TEMPLATE_DIR,
+        check_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the template cache.
+
+        Args:
+            directory: Root template directory
+            check_interval: Seconds between modification-time checks per template
+            clock: Monotonic time source
+        """
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self.clock = clock
+        self._cache: dict[_CacheKey, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        name: str,
+        part: str,
+        locale: str | None = None,
+        department: str | None = None,
+    ) -> CompiledTemplate | None:
+        """Return the compiled template for one part, or None if no file exists."""
+        key: _CacheKey = (name, part, locale, department)
+        now = self.clock()
+        entry = self._cache.get(key)
+        if entry is not None and now - entry.checked_at < self.check_interval:
+            return entry.template
+
+        with self._lock:
+            path = self._resolve(name, part, locale, department)
+            mtime = os.stat(path).st_mtime_ns if path is not None else None
+            if entry is None or entry.path != path or entry.mtime != mtime:
+                template = None
+                if path is not None:
+                    source = path.read_text(encoding="utf-8")
+                    # Drop the trailing newline editors add to every file
+                    template = CompiledTemplate(source.removesuffix("\n"), escape=part == "html")
+                entry = _CacheEntry(path, mtime, template, now)
+                self._cache[key] = entry
+            else:
+                entry.checked_at = now
+            return entry.template
+
+    def preload(self) -> int:
+        """Compile every default-variant template ahead of first use. Returns the count."""
+        directory = self.directory / DEFAULT_VARIANT
+        if not directory.is_dir():
+            return 0
+        loaded = 0
+        for path in sorted(directory.iterdir()):
+            name, _, part = path.name.rpartition(".")
+            if path.is_file() and part in PARTS and self.get(name, part) is not None:
+                loaded += 1
+        return loaded
+
+    def _resolve(
+        self, name: str, part: str, locale: str | None, department: str | None
+    ) -> Path | None:
+        for variant in _variant_dirs(locale, department):
+            path = self.directory / variant / f"{name}.{part}"
+            if path.is_file():
+                return path
+        return None
+
+    def render(
+        self,
+        name: str,
+        context: dict[str, Any],
+        locale: str | None = None,
+        department: str | None = None,
+    ) -> RenderedEmail:
+        """
+        Render every part of a template.
+
+        Raises:
+            LookupError: If the template has no subject or text body
+        """
+        subject = self.get(name, "subject", locale, department)
+        body = self.get(name, "txt", locale, department)
+        if subject is None or body is None:
+            raise LookupError(f"Email template {name!r} not found in {self.directory}")
+        html_body = self.get(name, "html", locale, department)
+        return RenderedEmail(
+            subject=subject.render(context),
+            body=body.render(context),
+            html_body=html_body.render(context) if html_body is not None else None,
+        )
+
+    def render_bulk(
+        self,
+        name: str,
+        contexts: Iterable[dict[str, Any]],
+        locale: str | None = None,
+        department: str | None = None,
+    ) -> list[RenderedEmail]:
+        """
+        Render a template for a whole cohort.
+
+        A context's own ``locale`` and ``department`` keys override the
+        arguments. Templates are resolved once per variant, not per message.
+        """
+        variants: dict[
+            tuple[str | None, str | None],
+            tuple[CompiledTemplate, CompiledTemplate, CompiledTemplate | None],
+        ] = {}
+        rendered: list[RenderedEmail] = []
+        for context in contexts:
+            variant = (context.get("locale", locale), context.get("department", department))
+            parts = variants.get(variant)
+            if parts is None:
+                subject = self.get(name, "subject", *variant)
+                body = self.get(name, "txt", *variant)
+                if subject is None or body is None:
+                    raise LookupError(f"Email template {name!r} not found in {self.directory}")
+                parts = (subject, body, self.get(name, "html", *variant))
+                variants[variant] = parts
+            subject, body, html_body = parts
+            rendered.append(
+                RenderedEmail(
+                    subject=subject.render(context),
+                    body=body.render(context),
+                    html_body=html_body.render(context) if html_body is not None else None,
+                )
+            )
+        return rendered
+
+
+# Singleton instance
+_email_templates: EmailTemplates | None = None
+
+
+def get_email_templates() -> EmailTemplates:
+    """Get or create the email template cache singleton."""
+    global _email_templates
+    if _email_templates is None:
+        _email_templates = EmailTemplates(
+            directory=Path(os.environ.get("EMAIL_TEMPLATE_DIR") or TEMPLATE_DIR),
+            check_interval=float(os.environ.get("EMAIL_TEMPLATE_CHECK_SECONDS", "2")),
+        )
+    return _email_templates
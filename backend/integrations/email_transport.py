@@ -0,0 +1,221 @@
+"""Persistent, pooled delivery transports for EmailService.
+
+Opening a fresh SMTP session (TCP + TLS handshake + AUTH) per message
+dominates delivery time at cohort scale. ``SMTPTransport`` keeps a small pool
+of authenticated sessions and reuses them across messages; sessions that have
+been idle are health-checked with NOOP and transparently reconnected when the
+server has dropped them. ``HTTPTransport`` does the same for API-based
+providers by keeping one keep-alive (HTTP/2 when available) client.
+"""
+
+import importlib.util
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.message import EmailMessage as MIMEMessage
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class EmailTransport(Protocol):
+    """Delivers a single message."""
+
+    def send(self, message: Any, from_address: str) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+def to_mime(message: Any, from_address: str) -> MIMEMessage:
+    """Convert an ``EmailMessage`` into a MIME message."""
+    mime = MIMEMessage()
+    mime["From"] = from_address
+    mime["To"] = message.to
+    mime["Subject"] = message.subject
+    if getattr(message, "idempotency_key", None):
+        mime["Message-ID"] = f"<{message.idempotency_key}@{from_address.split('@')[-1]}>"
+    mime.set_content(message.body)
+    if message.html_body:
+        mime.add_alternative(message.html_body, subtype="html")
+    return mime
+
+
+class _PooledSession:
+    """An SMTP session and when it was last used."""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.last_used = time.monotonic()
+
+
+class SMTPTransport:
+    """SMTP delivery over a pool of persistent sessions."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        pool_size: int = 4,
+        pooled: bool = True,
+        idle_check_seconds: float = 30.0,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize the transport; sessions are opened lazily.
+
+        Args:
+            host: SMTP relay host
+            port: SMTP relay port
+            username: AUTH user (skipped when None)
+            password: AUTH password
+            starttls: Upgrade the session with STARTTLS
+            pool_size: Maximum concurrent sessions
+            pooled: Reuse sessions across messages (False opens one per message)
+            idle_check_seconds: Idle time after which a session is NOOP-checked
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.pooled = pooled
+        self.idle_check_seconds = idle_check_seconds
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: queue.LifoQueue[_PooledSession] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+
+    def _connect(self) -> _PooledSession:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        smtp.ehlo()
+        if self.starttls and smtp.has_extn("starttls"):
+            smtp.starttls()
+            smtp.ehlo()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        with self._lock:
+            self.connections_opened += 1
+        return _PooledSession(smtp)
+
+    def _checkout(self) -> _PooledSession:
+        """Take an idle session (health-checked if stale) or open a new one."""
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - session.last_used < self.idle_check_seconds:
+                return session
+            try:
+                if session.smtp.noop()[0] == 250:
+                    return session
+            except smtplib.SMTPException:
+                pass
+            self._discard(session)
+
+    def _discard(self, session: _PooledSession) -> None:
+        try:
+            session.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            session.smtp.close()
+
+    def send(self, message: Any, from_address: str) -> bool:
+        """Send a message, reconnecting once if the pooled session was dropped."""
+        mime = to_mime(message, from_address)
+        with self._slots:
+            for attempt in range(2):
+                session = self._checkout()
+                try:
+                    session.smtp.send_message(mime)
+                except smtplib.SMTPServerDisconnected:
+                    session.smtp.close()
+                    if attempt == 0:
+                        logger.info("SMTP session dropped by server, reconnecting")
+                        continue
+                    raise
+                except Exception:
+                    self._discard(session)
+                    raise
+                session.last_used = time.monotonic()
+                if self.pooled:
+                    self._idle.put(session)
+                else:
+                    self._discard(session)
+                return True
+        return False
+
+    def close(self) -> None:
+        """Close every idle session."""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+class HTTPTransport:
+    """Delivery through an HTTP email API over one keep-alive client."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        max_connections: int = 10,
+        timeout: float = 10.0,
+    ):
+        """
+        Initialize the HTTP client.
+
+        HTTP/2 is negotiated when the optional ``h2`` package is installed;
+        otherwise HTTP/1.1 keep-alive connections are pooled.
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("HTTPTransport requires the httpx package") from e
+        http2 = importlib.util.find_spec("h2") is not None
+
+        self.endpoint = endpoint
+        self.client = httpx.Client(
+            http2=http2,
+            timeout=timeout,
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def send(self, message: Any, from_address: str) -> bool:
+        """POST the message to the provider API."""
+        headers: dict[str, str] = {}
+        if getattr(message, "idempotency_key", None):
+            # Lets the provider drop retried requests
+            headers["Idempotency-Key"] = message.idempotency_key
+            headers["Repeatability-Request-ID"] = message.idempotency_key
+        response = self.client.post(
+            self.endpoint,
+            headers=headers,
+            json={
+                "from": from_address,
+                "to": message.to,
+                "subject": message.subject,
+                "text": message.body,
+                "html": message.html_body,
+            },
+        )
+        if response.status_code >= 400:
+            logger.error(f"Email API returned {response.status_code}: {response.text[:200]}")
+            return False
+        return True
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.client.close()
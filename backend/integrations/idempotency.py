@@ -0,0 +1,215 @@
+"""Idempotency keys for retried HTTP requests.
+
+A client sends an ``Idempotency-Key`` header with a POST. The first request
+with a key claims a record for it (an atomic create, so exactly one request
+wins), runs, and stores its response in the record. Every later write to the
+record (taking over an expired or abandoned claim, storing the response,
+releasing a failed claim) is conditional on the etag read or written last, so
+a request that lost its claim cannot overwrite or delete the new owner's. Retries carrying the same
+key and body get the stored response back without running again; a request
+that arrives while the first is still running polls the record until the
+response is available. Reusing a key with a different body is rejected.
+
+Records live in their own partition and expire after a TTL. Cosmos DB removes
+them through the item ``ttl`` (the container needs a default TTL of -1, i.e.
+enabled without expiring other documents); expiry is also checked on read, so
+the in-memory store behaves the same.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_DOCUMENT_TYPE = "idempotency"
+
+# Longest accepted Idempotency-Key header value
+MAX_KEY_LENGTH = 255
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+
+@dataclass
+class StoredResponse:
+    """An HTTP response as kept for replay."""
+
+    status_code: int
+    body: str
+    headers: dict[str, str] = field(default_factory=dict[str, str])
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when a key is sent again with a different request body."""
+
+    status_code = 422
+
+
+class IdempotentRequestInProgress(Exception):
+    """Raised when the original request is still running after the wait."""
+
+    status_code = 409
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a JSON-serializable request body."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class IdempotencyKeys:
+    """Runs each keyed request once and replays its response to retries."""
+
+    def __init__(
+        self,
+        store: Any,
+        ttl_seconds: float = 86400,
+        wait_seconds: float = 30,
+        lock_seconds: float = 300,
+        poll_interval: float = 0.1,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the key registry.
+
+        Args:
+            store: Onboarding store exposing the idempotency record methods
+            ttl_seconds: How long a key and its response are remembered
+            wait_seconds: How long a duplicate waits for the original request
+            lock_seconds: After this long an unfinished request is presumed
+                crashed and its key can be claimed again
+            poll_interval: Seconds between checks while waiting
+            clock: Wall-clock time source (records are shared across hosts)
+            sleep: Sleep function used while waiting
+        """
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.lock_seconds = lock_seconds
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.sleep = sleep
+
+    @staticmethod
+    def record_id(scope: str, key: str) -> str:
+        """Document ID for a key, so keys are independent per endpoint."""
+        return "idem-" + hashlib.sha256(f"{scope}\n{key}".encode()).hexdigest()[:32]
+
+    def execute(
+        self,
+        scope: str,
+        key: str,
+        payload: Any,
+        handler: Callable[[], StoredResponse],
+    ) -> tuple[StoredResponse, bool]:
+        """
+        Run ``handler`` once per key, or return the response it stored.
+
+        Server errors (5xx) and exceptions are not remembered, so the client
+        can retry them with the same key.
+
+        Args:
+            scope: Endpoint the key belongs to
+            key: Client-supplied Idempotency-Key
+            payload: Request body, fingerprinted to detect key reuse
+            handler: Produces the response for the first request
+
+        Returns:
+            Tuple of (response, whether it was replayed)
+
+        Raises:
+            ValueError: If the key is empty or too long
+            IdempotencyKeyReused: If the key was used with a different body
+            IdempotentRequestInProgress: If the original request did not
+                finish within ``wait_seconds``
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValueError(f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+        record_id = self.record_id(scope, key)
+        request_fingerprint = fingerprint(payload)
+        deadline = self.clock() + self.wait_seconds
+
+        while True:
+            now = self.clock()
+            record = {
+                "id": record_id,
+                "partitionKey": record_id,
+                "type": IDEMPOTENCY_DOCUMENT_TYPE,
+                "fingerprint": request_fingerprint,
+                "status": IN_PROGRESS,
+                "response": None,
+                "locked_until": now + self.lock_seconds,
+                "expires_at": now + self.ttl_seconds,
+                "ttl": int(self.ttl_seconds),
+            }
+            claim = self.store.create_idempotency_record(record)
+            if claim is not None:
+                break
+
+            existing = self.store.get_idempotency_record(record_id)
+            if existing is None:
+                continue
+            if existing["expires_at"] <= now or (
+                existing["status"] == IN_PROGRESS and existing["locked_until"] <= now
+            ):
+                # Expired, or abandoned by a crashed request: take it over, unless
+                # a racing request took it over first
+                claim = self.store.replace_idempotency_record(
+                    {**record, "_etag": existing["_etag"]}
+                )
+                if claim is not None:
+                    break
+                continue
+            if existing["fingerprint"] != request_fingerprint:
+                raise IdempotencyKeyReused(
+                    "Idempotency-Key was already used with a different request body"
+                )
+            if existing["status"] == COMPLETED:
+                return StoredResponse(**existing["response"]), True
+            if now >= deadline:
+                raise IdempotentRequestInProgress(
+                    "A request with this Idempotency-Key is still being processed"
+                )
+            self.sleep(self.poll_interval)
+
+        try:
+            response = handler()
+        except Exception:
+            self.store.delete_idempotency_record(claim)
+            raise
+        if response.status_code >= 500:
+            self.store.delete_idempotency_record(claim)
+        elif (
+            self.store.replace_idempotency_record(
+                {**claim, "status": COMPLETED, "response": asdict(response)}
+            )
+            is None
+        ):
+            # Ran past locked_until and another request took the key over
+            logger.warning(f"Idempotency claim {record_id} was taken over; response not stored")
+        return response, False
+
+
+# Singleton instance
+_idempotency_keys: IdempotencyKeys | None = None
+
+
+def get_idempotency_keys() -> IdempotencyKeys:
+    """Get or create the idempotency key registry singleton."""
+    global _idempotency_keys
+    if _idempotency_keys is None:
+        from .store import get_onboarding_store
+
+        _idempotency_keys = IdempotencyKeys(
+            get_onboarding_store(),
+            ttl_seconds=float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400")),
+            wait_seconds=float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", "30")),
+        )
+    return _idempotency_keys
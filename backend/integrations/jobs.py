@@ -0,0 +1,234 @@
+"""Background jobs for long-running onboarding requests.
+
+In job mode the HTTP tier only records a request and returns ``202 Accepted``;
+the graph runs later on a worker. A job is a document in its own partition
+holding the request, its status (``queued``, ``running``, ``succeeded`` or
+``failed``) and, once finished, the result or error. Only the job ID travels
+through the queue, so a message stays tiny whatever the request size.
+
+Two queues are provided. ``StorageJobQueue`` sends to an Azure Storage queue
+drained by a queue-triggered function; ``InProcessJobQueue`` runs jobs on a
+local worker pool and stands in for it offline and in tests.
+"""
+
+import logging
+import os
+import queue
+import threading
+import uuid
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+JOB_DOCUMENT_TYPE = "job"
+
+# Storage queue drained by the queue-triggered worker function
+JOB_QUEUE_NAME = "onboarding-jobs"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueue(Protocol):
+    """Delivers job IDs to whatever runs the jobs."""
+
+    def send(self, job_id: str) -> None:
+        """Enqueue a job for execution."""
+        ...
+
+
+class InProcessJobQueue:
+    """Runs jobs on local worker threads; a stand-in for the Storage queue."""
+
+    def __init__(self, handler: Callable[[str], Any], workers: int = 4):
+        """
+        Initialize the queue.
+
+        Args:
+            handler: Called with each job ID on a worker thread
+            workers: Number of worker threads, started on first use
+        """
+        self.handler = handler
+        self.workers = workers
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def send(self, job_id: str) -> None:
+        """Enqueue a job for execution."""
+        with self._lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(
+                        target=self._work, name=f"job-worker-{i}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+        self._queue.put(job_id)
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            try:
+                if job_id is None:
+                    return
+                self.handler(job_id)
+            except Exception:
+                logger.exception(f"Job {job_id} crashed")
+            finally:
+                self._queue.task_done()
+
+    def join(self) -> None:
+        """Block until every enqueued job has been handled."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Stop the workers once queued jobs are done."""
+        with self._lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            self._threads.clear()
+
+
+class StorageJobQueue:
+    """Sends job IDs to an Azure Storage queue."""
+
+    def __init__(self, connection_string: str, queue_name: str = JOB_QUEUE_NAME):
+        """
+        Connect to the queue.
+
+        Messages are Base64-encoded, the format the Functions queue trigger
+        expects by default.
+
+        Raises:
+            ImportError: If the azure-storage-queue package is not installed
+        """
+        try:
+            from azure.storage.queue import QueueClient, TextBase64EncodePolicy
+        except ImportError as e:
+            raise ImportError("StorageJobQueue requires the azure-storage-queue package") from e
+        self.client = QueueClient.from_connection_string(
+            connection_string, queue_name, message_encode_policy=TextBase64EncodePolicy()
+        )
+
+    def send(self, job_id: str) -> None:
+        """Enqueue a job for execution."""
+        self.client.send_message(job_id)
+
+
+class JobService:
+    """Records jobs, queues them and runs them on a worker."""
+
+    def __init__(
+        self,
+        store: Any,
+        handlers: dict[str, Callable[[dict[str, Any]], dict[str, Any]]],
+        job_queue: JobQueue | None = None,
+    ):
+        """
+        Initialize the job service.
+
+        Args:
+            store: Onboarding store exposing ``save_job`` and ``get_job``
+            handlers: Executes a job's request by kind, returning its result
+            job_queue: Where submitted jobs go. Defaults to JOB_QUEUE:
+                "storage" sends to the ``onboarding-jobs`` Storage queue on the
+                AzureWebJobsStorage account; "memory" (the default) runs jobs
+                on JOB_WORKERS local threads.
+        """
+        self.store = store
+        self.handlers = handlers
+        if job_queue is None:
+            if os.environ.get("JOB_QUEUE", "memory") == "storage":
+                job_queue = StorageJobQueue(os.environ["AzureWebJobsStorage"])
+            else:
+                job_queue = InProcessJobQueue(self.run, int(os.environ.get("JOB_WORKERS", "4")))
+        self.job_queue = job_queue
+
+    def submit(self, kind: str, new_hire_id: str, request: Mapping[str, Any]) -> dict[str, Any]:
+        """
+        Record a job and queue it.
+
+        Args:
+            kind: Handler to run (e.g. ``create`` or ``advance``)
+            new_hire_id: Hire the job acts on
+            request: Input passed to the handler
+
+        Returns:
+            The queued job document
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = datetime.now(UTC).isoformat()
+        job = {
+            "id": job_id,
+            "partitionKey": job_id,
+            "type": JOB_DOCUMENT_TYPE,
+            "kind": kind,
+            "new_hire_id": new_hire_id,
+            "status": QUEUED,
+            "request": dict(request),
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.store.save_job(job)
+        self.job_queue.send(job_id)
+        return job
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Retrieve a job by ID."""
+        return self.store.get_job(job_id)
+
+    def run(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Execute a queued job and record its outcome.
+
+        Jobs that already finished are skipped, so a redelivered queue message
+        does not run the graph twice. A job left ``running`` by a crashed
+        worker is run again.
+
+        Returns:
+            The finished job, or None if it does not exist
+        """
+        job = self.store.get_job(job_id)
+        if job is None:
+            logger.warning(f"Job {job_id} not found")
+            return None
+        if job["status"] in (SUCCEEDED, FAILED):
+            return job
+
+        job = self._update(job, status=RUNNING)
+        try:
+            result = self.handlers[job["kind"]](job["request"])
+            return self._update(job, status=SUCCEEDED, result=result)
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            return self._update(job, status=FAILED, error=str(e))
+
+    def _update(self, job: dict[str, Any], **changes: Any) -> dict[str, Any]:
+        job = {**job, **changes, "updated_at": datetime.now(UTC).isoformat()}
+        self.store.save_job(job)
+        return job
+
+
+def job_status(job: dict[str, Any]) -> dict[str, Any]:
+    """Public view of a job, without the stored request."""
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "new_hire_id": job["new_hire_id"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
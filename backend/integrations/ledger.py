@@ -0,0 +1,295 @@
+"""Event-sourced ledger of task transitions.
+
+Agents return the full ``tasks`` list on every step, which says nothing about
+when a task changed or who changed it. The ledger records each change as a
+compact event in the hire's partition (sequence number, task ID, new status,
+actor, timestamp and only the task fields that changed) and rebuilds a hire's
+task fields by folding those events onto its latest snapshot.
+
+A snapshot of ``tasks``, ``completed_tasks`` and ``pending_tasks`` is written
+in the same batch as every ``snapshot_every``-th event, so a read replays at
+most that many events however long the history grows. Events are never
+deleted; ``history`` returns the full trail.
+
+Works against both ``OnboardingCosmosClient`` and ``InMemoryOnboardingStore``,
+which expose ``append_task_events``, ``list_task_events`` and
+``get_task_snapshot``.
+"""
+
+import os
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, cast
+
+from agents.state import OnboardingState
+
+TASK_EVENT_DOCUMENT_TYPE = "task_event"
+TASK_SNAPSHOT_DOCUMENT_TYPE = "task_snapshot"
+
+# Event keys returned by ``history``; the rest are storage bookkeeping
+EVENT_FIELDS = ("seq", "task_id", "status", "actor", "at", "fields")
+
+
+def task_snapshot_id(new_hire_id: str) -> str:
+    """Document ID of a hire's task snapshot."""
+    return f"task-snapshot-{new_hire_id}"
+
+
+def task_event_id(new_hire_id: str, seq: int) -> str:
+    """Document ID of a hire's ``seq``-th task event; zero-padded so IDs sort by sequence."""
+    return f"task-event-{new_hire_id}-{seq:010d}"
+
+
+def diff_tasks(
+    before: Iterable[Mapping[str, Any]],
+    after: Iterable[Mapping[str, Any]],
+    at: str,
+    actor: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Unsequenced events for the tasks that were added or changed.
+
+    Agents only ever add or update tasks, so tasks missing from ``after`` are
+    ignored.
+
+    Args:
+        before: Task list as last recorded
+        after: Task list to record
+        at: Transition timestamp
+        actor: Who made the change; defaults to each task's ``assigned_to``
+    """
+    previous = {task["id"]: task for task in before}
+    events: list[dict[str, Any]] = []
+    for task in after:
+        old = previous.get(task["id"], {})
+        if task == old:
+            continue
+        event: dict[str, Any] = {
+            "task_id": task["id"],
+            "status": task["status"],
+            "actor": actor or task.get("assigned_to") or "system",
+            "at": at,
+        }
+        changed = {
+            key: value
+            for key, value in task.items()
+            if key not in ("id", "status") and (key not in old or old[key] != value)
+        }
+        if changed:
+            event["fields"] = changed
+        events.append(event)
+    return events
+
+
+@dataclass
+class TaskView:
+    """A hire's task fields as of ledger sequence number ``seq``."""
+
+    seq: int = 0
+    tasks: dict[str, dict[str, Any]] = field(default_factory=dict[str, dict[str, Any]])
+    completed: dict[str, None] = field(default_factory=dict[str, None])
+    pending: dict[str, None] = field(default_factory=dict[str, None])
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any], seq: int = 0) -> "TaskView":
+        """View of the task fields of a state (or of a snapshot document)."""
+        return cls(
+            seq=seq,
+            tasks={task["id"]: dict(task) for task in state.get("tasks", [])},
+            completed=dict.fromkeys(state.get("completed_tasks", [])),
+            pending=dict.fromkeys(state.get("pending_tasks", [])),
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, Any]) -> "TaskView":
+        """View stored in a snapshot document."""
+        return cls.from_state(snapshot, seq=snapshot["seq"])
+
+    def apply(self, event: dict[str, Any]) -> None:
+        """Fold one event into the view."""
+        task_id = event["task_id"]
+        task = self.tasks.get(task_id)
+        if task is None:
+            task = self.tasks[task_id] = {"id": task_id}
+        if "fields" in event:
+            task.update(event["fields"])
+        task["status"] = event["status"]
+        if event["status"] == "completed":
+            self.pending.pop(task_id, None)
+            self.completed.setdefault(task_id, None)
+        else:
+            self.completed.pop(task_id, None)
+            self.pending.setdefault(task_id, None)
+        self.seq = event["seq"]
+
+    def state_fields(self) -> dict[str, Any]:
+        """The ``tasks``, ``completed_tasks`` and ``pending_tasks`` of the state."""
+        return {
+            "tasks": [dict(task) for task in self.tasks.values()],
+            "completed_tasks": list(self.completed),
+            "pending_tasks": list(self.pending),
+        }
+
+    def snapshot(self, new_hire_id: str, taken_at: str) -> dict[str, Any]:
+        """Snapshot document for the hire's partition."""
+        return {
+            "id": task_snapshot_id(new_hire_id),
+            "partitionKey": new_hire_id,
+            "type": TASK_SNAPSHOT_DOCUMENT_TYPE,
+            "new_hire_id": new_hire_id,
+            "seq": self.seq,
+            "taken_at": taken_at,
+            **self.state_fields(),
+        }
+
+
+class TaskLedger:
+    """Records task transitions as events and rebuilds task state from them."""
+
+    def __init__(
+        self,
+        store: Any,
+        snapshot_every: int = 50,
+        clock: Callable[[], datetime] = datetime.now,
+        max_attempts: int = 5,
+    ):
+        """
+        Initialize the ledger.
+
+        Args:
+            store: Onboarding store with the task event methods
+            snapshot_every: Events between snapshots; bounds the replay per read
+            clock: Time source for event timestamps
+            max_attempts: Appends tried per ``record`` while other writers keep winning
+        """
+        self.store = store
+        self.snapshot_every = snapshot_every
+        self.clock = clock
+        self.max_attempts = max_attempts
+
+    def view(self, new_hire_id: str) -> TaskView | None:
+        """
+        Rebuild a hire's task fields from its snapshot and the events since.
+
+        Returns:
+            The current view, or None if nothing was recorded for the hire
+        """
+        return self._replay(new_hire_id)[0]
+
+    def _replay(self, new_hire_id: str) -> tuple[TaskView | None, int]:
+        """The current view and the sequence number of the snapshot it started from."""
+        snapshot = self.store.get_task_snapshot(new_hire_id)
+        if snapshot is None:
+            return None, 0
+        view = TaskView.from_snapshot(snapshot)
+        for event in self.store.list_task_events(new_hire_id, after_seq=view.seq):
+            view.apply(event)
+        return view, snapshot["seq"]
+
+    def record(
+        self, before: OnboardingState, after: OnboardingState, actor: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Append events for the task changes between two states of a hire.
+
+        Changes are computed against the ledger's own view, so a stale
+        ``before`` cannot fork the history. ``before`` is only used as the base
+        snapshot the first time a hire is recorded (at creation, or for hires
+        that predate the ledger). If another writer appends first, the view is
+        replayed again and the changes recomputed against it.
+
+        Args:
+            before: State the graph started from
+            after: State the graph returned
+            actor: Who made the changes; defaults to each task's ``assigned_to``
+
+        Returns:
+            The appended events
+
+        Raises:
+            ValueError: If other writers won every one of ``max_attempts`` appends
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return self._record(before, after, actor)
+            except ValueError:
+                if attempt == self.max_attempts:
+                    raise
+        return []
+
+    def _record(
+        self, before: OnboardingState, after: OnboardingState, actor: str | None
+    ) -> list[dict[str, Any]]:
+        """Diff ``after`` against a fresh replay and append the events in one write."""
+        new_hire_id = after["new_hire_id"]
+        now = self.clock().isoformat()
+        view, snapshot_seq = self._replay(new_hire_id)
+        snapshot = None
+        if view is None:
+            view = TaskView.from_state(before)
+            snapshot = view.snapshot(new_hire_id, now)
+
+        events: list[dict[str, Any]] = []
+        for change in diff_tasks(view.tasks.values(), after["tasks"], now, actor):
+            event = {
+                "id": task_event_id(new_hire_id, view.seq + 1),
+                "partitionKey": new_hire_id,
+                "type": TASK_EVENT_DOCUMENT_TYPE,
+                "new_hire_id": new_hire_id,
+                "seq": view.seq + 1,
+                **change,
+            }
+            view.apply(event)
+            events.append(event)
+
+        if events and view.seq - snapshot_seq >= self.snapshot_every:
+            snapshot = view.snapshot(new_hire_id, now)
+        if events or snapshot is not None:
+            self.store.append_task_events(new_hire_id, events, snapshot)
+        return [_public(event) for event in events]
+
+    def load(self, new_hire_id: str) -> OnboardingState | None:
+        """
+        Load a hire's state with its task fields rebuilt from the ledger.
+
+        Returns:
+            The state, or None if the hire does not exist
+        """
+        state = self.store.get_state(new_hire_id)
+        if state is None:
+            return None
+        view = self.view(new_hire_id)
+        if view is None:
+            return state
+        return cast(OnboardingState, {**state, **view.state_fields()})
+
+    def history(self, new_hire_id: str, task_id: str | None = None) -> list[dict[str, Any]]:
+        """All recorded events for a hire, oldest first, optionally for one task."""
+        return [
+            _public(event)
+            for event in self.store.list_task_events(new_hire_id, after_seq=0)
+            if task_id is None or event["task_id"] == task_id
+        ]
+
+
+def _public(event: dict[str, Any]) -> dict[str, Any]:
+    """Strip storage bookkeeping from an event document."""
+    return {key: event[key] for key in EVENT_FIELDS if key in event}
+
+
+# Singleton instance
+_task_ledger: TaskLedger | None = None
+
+
+def get_task_ledger() -> TaskLedger:
+    """Get or create the task ledger singleton (TASK_SNAPSHOT_EVERY events between snapshots)."""
+    global _task_ledger
+    if _task_ledger is None:
+        from .store import get_onboarding_store
+
+        _task_ledger = TaskLedger(
+            get_onboarding_store(),
+            snapshot_every=int(os.environ.get("TASK_SNAPSHOT_EVERY", "50")),
+        )
+    return _task_ledger
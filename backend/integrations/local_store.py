@@ -0,0 +1,451 @@
+"""In-memory onboarding store used offline, in tests and in benchmarks.
+
+Mirrors the public surface of ``OnboardingCosmosClient`` so callers can swap
+backends without code changes. Every write is stamped with a monotonically
+increasing log sequence number (``_lsn``) which drives a local change feed
+with the same semantics as the Cosmos DB "latest version" feed mode: each
+changed document is delivered once, in write order, and deletes are not
+surfaced.
+
+Secondary indexes (hash indexes on manager, phase and department plus a sorted
+start-date index) play the role of the container's indexing policy so the
+typed query methods never scan every document.
+"""
+
+import base64
+import bisect
+import copy
+import heapq
+import json
+import threading
+import time
+import uuid
+from typing import Any, cast
+
+from agents.state import OnboardingState
+
+from .bulk import DEFAULT_BULK_CONCURRENCY, BulkItemResult, run_partitioned
+from .queries import MAX_PAGE_SIZE, QueryResult, StateFilters, project_summary
+
+# Document fields with an equality index
+INDEXED_FIELDS = ("manager_id", "current_phase", "department")
+
+
+class InMemoryOnboardingStore:
+    """Thread-safe in-memory stand-in for the Cosmos DB onboarding container."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._items: dict[str, dict[str, Any]] = {}
+        self._log: list[tuple[int, str]] = []
+        self._lsn = 0
+        self._lock = threading.RLock()
+        self._indexes: dict[str, dict[str, set[str]]] = {f: {} for f in INDEXED_FIELDS}
+        self._by_start_date: list[tuple[str, str]] = []
+        self._outbox: dict[str, dict[str, Any]] = {}
+        self._timers: dict[str, dict[str, Any]] = {}
+        self._timer_heap: list[tuple[str, str]] = []
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._idempotency: dict[str, dict[str, Any]] = {}
+        self._task_events: dict[str, list[dict[str, Any]]] = {}
+        self._task_snapshots: dict[str, dict[str, Any]] = {}
+
+    def _write(self, state: OnboardingState) -> dict[str, Any]:
+        """Stamp and store a document, appending it to the change log."""
+        self._lsn += 1
+        document: dict[str, Any] = {
+            "id": state["new_hire_id"],
+            "partitionKey": state["new_hire_id"],
+            **copy.deepcopy(dict(state)),
+            "_lsn": self._lsn,
+            "_ts": int(time.time()),
+            "_etag": f'"{self._lsn}"',
+        }
+        previous = self._items.get(document["id"])
+        if previous is not None:
+            self._unindex(previous)
+        self._items[document["id"]] = document
+        self._index(document)
+        self._log.append((self._lsn, document["id"]))
+        return copy.deepcopy(document)
+
+    def create_state(self, state: OnboardingState) -> dict[str, Any]:
+        """Create new onboarding state."""
+        with self._lock:
+            if state["new_hire_id"] in self._items:
+                raise ValueError(f"Onboarding state already exists: {state['new_hire_id']}")
+            return self._write(state)
+
+    def get_state(self, onboarding_id: str) -> OnboardingState | None:
+        """Retrieve onboarding state by ID."""
+        with self._lock:
+            item = self._items.get(onboarding_id)
+            return cast(OnboardingState, copy.deepcopy(item)) if item is not None else None
+
+    def update_state(self, state: OnboardingState) -> dict[str, Any]:
+        """Update existing onboarding state."""
+        with self._lock:
+            return self._write(state)
+
+    def create_states_bulk(
+        self, states: list[OnboardingState], max_concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> list[BulkItemResult]:
+        """Create many onboarding states with per-partition atomicity."""
+        return self._bulk_write("create", states, max_concurrency)
+
+    def upsert_states_bulk(
+        self, states: list[OnboardingState], max_concurrency: int = DEFAULT_BULK_CONCURRENCY
+    ) -> list[BulkItemResult]:
+        """Create or replace many onboarding states."""
+        return self._bulk_write("upsert", states, max_concurrency)
+
+    def _bulk_write(
+        self, operation: str, states: list[OnboardingState], max_concurrency: int
+    ) -> list[BulkItemResult]:
+        """Write states chunk by chunk, each chunk all-or-nothing like a batch."""
+        documents = [
+            {"id": state["new_hire_id"], "partitionKey": state["new_hire_id"], "state": state}
+            for state in states
+        ]
+        success_code = 201 if operation == "create" else 200
+
+        def write_partition(
+            _partition_key: str, chunk: list[dict[str, Any]]
+        ) -> list[BulkItemResult]:
+            with self._lock:
+                if operation == "create":
+                    ids = [d["id"] for d in chunk]
+                    if len(set(ids)) != len(ids) or any(i in self._items for i in ids):
+                        return [
+                            BulkItemResult(
+                                d["id"], 409, f"Onboarding state already exists: {d['id']}"
+                            )
+                            for d in chunk
+                        ]
+                for document in chunk:
+                    self._write(document["state"])
+            return [BulkItemResult(d["id"], success_code) for d in chunk]
+
+        return run_partitioned(documents, write_partition, max_concurrency)
+
+    def save_state_with_outbox(
+        self, state: OnboardingState, messages: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Upsert state and enqueue outbox messages atomically."""
+        with self._lock:
+            document = self._write(state)
+            for message in messages:
+                # Messages already in the outbox (same idempotency key) are kept as is
+                if message["id"] not in self._outbox:
+                    self._outbox[message["id"]] = {
+                        **copy.deepcopy(message),
+                        "_etag": uuid.uuid4().hex,
+                    }
+            return document
+
+    def list_pending_outbox(self, limit: int, now: str) -> list[dict[str, Any]]:
+        """Pending messages, plus claimed ones whose lease has expired."""
+        with self._lock:
+            pending = [
+                m
+                for m in self._outbox.values()
+                if m["status"] == "pending"
+                or (m["status"] == "sending" and (m.get("lease_until") or "") < now)
+            ]
+            pending.sort(key=lambda m: m["created_at"])
+            return [copy.deepcopy(m) for m in pending[:limit]]
+
+    def claim_outbox(self, message: dict[str, Any], lease_until: str) -> dict[str, Any] | None:
+        """Lease a message if it is unchanged since it was read."""
+        with self._lock:
+            current = self._outbox.get(message["id"])
+            if current is None or current["_etag"] != message["_etag"]:
+                return None
+            current.update(status="sending", lease_until=lease_until, _etag=uuid.uuid4().hex)
+            return copy.deepcopy(current)
+
+    def replace_outbox(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        """Persist a message's delivery status if its etag is unchanged; None otherwise."""
+        with self._lock:
+            current = self._outbox.get(message["id"])
+            if current is None or current["_etag"] != message["_etag"]:
+                return None
+            self._outbox[message["id"]] = {**copy.deepcopy(message), "_etag": uuid.uuid4().hex}
+            return copy.deepcopy(self._outbox[message["id"]])
+
+    def get_outbox(self, message_id: str) -> dict[str, Any] | None:
+        """Retrieve an outbox message by ID."""
+        with self._lock:
+            message = self._outbox.get(message_id)
+            return copy.deepcopy(message) if message is not None else None
+
+    def save_timer(self, timer: dict[str, Any]) -> None:
+        """Create or replace a phase timer."""
+        with self._lock:
+            previous = self._timers.get(timer["id"])
+            self._timers[timer["id"]] = {**copy.deepcopy(timer), "_etag": uuid.uuid4().hex}
+            if previous is None or previous["due_at"] != timer["due_at"]:
+                heapq.heappush(self._timer_heap, (timer["due_at"], timer["id"]))
+
+    def list_due_timers(self, due_by: str, now: str, limit: int) -> list[dict[str, Any]]:
+        """
+        Timers due on or before ``due_by``, earliest first.
+
+        Pending timers are returned, plus claimed ones whose lease has expired.
+        Only the due end of the heap is visited; heap entries left behind by
+        rescheduled or deleted timers are discarded on the way.
+        """
+        with self._lock:
+            visited: set[tuple[str, str]] = set()
+            due: list[dict[str, Any]] = []
+            while self._timer_heap and self._timer_heap[0][0] <= due_by and len(due) < limit:
+                entry = heapq.heappop(self._timer_heap)
+                timer = self._timers.get(entry[1])
+                if timer is None or timer["due_at"] != entry[0] or entry in visited:
+                    continue
+                visited.add(entry)
+                if timer["status"] == "pending" or (
+                    timer["status"] == "firing" and (timer.get("lease_until") or "") < now
+                ):
+                    due.append(copy.deepcopy(timer))
+            for entry in visited:
+                heapq.heappush(self._timer_heap, entry)
+            return due
+
+    def claim_timer(self, timer: dict[str, Any], lease_until: str) -> dict[str, Any] | None:
+        """Lease a timer if it is unchanged since it was read."""
+        with self._lock:
+            current = self._timers.get(timer["id"])
+            if current is None or current["_etag"] != timer["_etag"]:
+                return None
+            current.update(status="firing", lease_until=lease_until, _etag=uuid.uuid4().hex)
+            return copy.deepcopy(current)
+
+    def get_timer(self, timer_id: str) -> dict[str, Any] | None:
+        """Retrieve a phase timer by ID."""
+        with self._lock:
+            timer = self._timers.get(timer_id)
+            return copy.deepcopy(timer) if timer is not None else None
+
+    def delete_timer(self, timer: dict[str, Any]) -> None:
+        """Delete a phase timer; its heap entry is dropped lazily."""
+        with self._lock:
+            self._timers.pop(timer["id"], None)
+
+    def save_job(self, job: dict[str, Any]) -> None:
+        """Create or replace a background job."""
+        with self._lock:
+            self._jobs[job["id"]] = copy.deepcopy(job)
+
+    def get_job(self, job_id: str) -> dict[str, Any] | None:
+        """Retrieve a background job by ID."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def create_idempotency_record(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """Create an idempotency record; None if one already exists."""
+        with self._lock:
+            if record["id"] in self._idempotency:
+                return None
+            self._idempotency[record["id"]] = {**copy.deepcopy(record), "_etag": uuid.uuid4().hex}
+            return copy.deepcopy(self._idempotency[record["id"]])
+
+    def get_idempotency_record(self, record_id: str) -> dict[str, Any] | None:
+        """Retrieve an idempotency record by ID."""
+        with self._lock:
+            record = self._idempotency.get(record_id)
+            return copy.deepcopy(record) if record is not None else None
+
+    def replace_idempotency_record(self, record: dict[str, Any]) -> dict[str, Any] | None:
+        """Replace an idempotency record if its etag is unchanged; None otherwise."""
+        with self._lock:
+            current = self._idempotency.get(record["id"])
+            if current is None or current["_etag"] != record["_etag"]:
+                return None
+            self._idempotency[record["id"]] = {**copy.deepcopy(record), "_etag": uuid.uuid4().hex}
+            return copy.deepcopy(self._idempotency[record["id"]])
+
+    def delete_idempotency_record(self, record: dict[str, Any]) -> None:
+        """Delete an idempotency record if its etag is unchanged."""
+        with self._lock:
+            current = self._idempotency.get(record["id"])
+            if current is not None and current["_etag"] == record["_etag"]:
+                del self._idempotency[record["id"]]
+
+    def append_task_events(
+        self,
+        new_hire_id: str,
+        events: list[dict[str, Any]],
+        snapshot: dict[str, Any] | None = None,
+    ) -> None:
+        """Append a hire's task events and replace its snapshot atomically."""
+        with self._lock:
+            log = self._task_events.setdefault(new_hire_id, [])
+            if events and events[0]["seq"] != len(log) + 1:
+                raise ValueError(
+                    f"Task ledger conflict for {new_hire_id}: expected seq {len(log) + 1}"
+                )
+            log.extend(copy.deepcopy(events))
+            if snapshot is not None:
+                self._task_snapshots[new_hire_id] = copy.deepcopy(snapshot)
+
+    def list_task_events(self, new_hire_id: str, after_seq: int = 0) -> list[dict[str, Any]]:
+        """A hire's task events with a sequence number above ``after_seq``, in order."""
+        with self._lock:
+            # Sequence numbers start at 1 with no gaps, so they index the log
+            return copy.deepcopy(self._task_events.get(new_hire_id, [])[after_seq:])
+
+    def get_task_snapshot(self, new_hire_id: str) -> dict[str, Any] | None:
+        """Retrieve a hire's latest task snapshot."""
+        with self._lock:
+            snapshot = self._task_snapshots.get(new_hire_id)
+            return copy.deepcopy(snapshot) if snapshot is not None else None
+
+    def delete_state(self, onboarding_id: str) -> None:
+        """Delete onboarding state."""
+        with self._lock:
+            item = self._items.pop(onboarding_id, None)
+            if item is None:
+                raise KeyError(onboarding_id)
+            self._unindex(item)
+
+    def list_states(self, limit: int = 100) -> list[OnboardingState]:
+        """List all onboarding states."""
+        with self._lock:
+            items = sorted(
+                self._items.values(), key=lambda d: d.get("created_at", ""), reverse=True
+            )
+            return [cast(OnboardingState, copy.deepcopy(item)) for item in items[:limit]]
+
+    def by_manager(self, manager_id: str, limit: int = 100) -> QueryResult:
+        """List hires reporting to a manager, ordered by start date."""
+        return self._lookup("manager_id", manager_id, limit)
+
+    def by_phase(self, phase: str, limit: int = 100) -> QueryResult:
+        """List hires in an onboarding phase, ordered by start date."""
+        return self._lookup("current_phase", phase, limit)
+
+    def by_department(self, department: str, limit: int = 100) -> QueryResult:
+        """List hires in a department, ordered by start date."""
+        return self._lookup("department", department, limit)
+
+    def starting_between(self, start: str, end: str, limit: int = 100) -> QueryResult:
+        """List hires whose start date falls within [start, end] (YYYY-MM-DD)."""
+        with self._lock:
+            position = bisect.bisect_left(self._by_start_date, (start, ""))
+            items: list[dict[str, Any]] = []
+            while position < len(self._by_start_date) and len(items) < limit:
+                start_date, item_id = self._by_start_date[position]
+                if start_date > end:
+                    break
+                items.append(project_summary(self._items[item_id]))
+                position += 1
+            return QueryResult(items=items)
+
+    def list_states_page(
+        self,
+        filters: StateFilters | None = None,
+        page_size: int = 50,
+        continuation: str | None = None,
+    ) -> QueryResult:
+        """
+        Read one page of hire summaries ordered by start date.
+
+        Walks the start-date index from the position encoded in the
+        continuation token, so each page costs only the documents it visits.
+
+        Args:
+            filters: Phase, department, manager and start-date range filters
+            page_size: Maximum items returned (capped at MAX_PAGE_SIZE)
+            continuation: Opaque token from the previous page, or None
+
+        Returns:
+            QueryResult whose ``continuation`` is None on the last page
+        """
+        filters = filters or StateFilters()
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        with self._lock:
+            if continuation:
+                after = tuple(json.loads(base64.urlsafe_b64decode(continuation)))
+                position = bisect.bisect_right(self._by_start_date, after)
+            else:
+                position = bisect.bisect_left(self._by_start_date, (filters.start_from or "", ""))
+
+            items: list[dict[str, Any]] = []
+            last = None
+            while position < len(self._by_start_date) and len(items) < page_size:
+                key = self._by_start_date[position]
+                if filters.start_to is not None and key[0] > filters.start_to:
+                    position = len(self._by_start_date)
+                    break
+                document = self._items[key[1]]
+                if filters.matches(document):
+                    items.append(project_summary(document))
+                    last = key
+                position += 1
+
+            more = position < len(self._by_start_date) and last is not None
+            token = base64.urlsafe_b64encode(json.dumps(last).encode()).decode() if more else None
+            return QueryResult(items=items, continuation=token)
+
+    def _lookup(self, field: str, value: str, limit: int) -> QueryResult:
+        """Resolve an equality query through the hash index."""
+        with self._lock:
+            ids = self._indexes[field].get(value, set())
+            matches = sorted(
+                (self._items[item_id] for item_id in ids),
+                key=lambda d: (d.get("start_date", ""), d["id"]),
+            )
+            return QueryResult(items=[project_summary(d) for d in matches[:limit]])
+
+    def _index(self, document: dict[str, Any]) -> None:
+        """Add a document to the secondary indexes."""
+        for field in INDEXED_FIELDS:
+            if field in document:
+                self._indexes[field].setdefault(document[field], set()).add(document["id"])
+        bisect.insort(self._by_start_date, (document.get("start_date", ""), document["id"]))
+
+    def _unindex(self, document: dict[str, Any]) -> None:
+        """Remove a document from the secondary indexes."""
+        for field in INDEXED_FIELDS:
+            ids = self._indexes[field].get(document[field]) if field in document else None
+            if ids is not None:
+                ids.discard(document["id"])
+                if not ids:
+                    del self._indexes[field][document[field]]
+        key = (document.get("start_date", ""), document["id"])
+        position = bisect.bisect_left(self._by_start_date, key)
+        if position < len(self._by_start_date) and self._by_start_date[position] == key:
+            del self._by_start_date[position]
+
+    def read_change_feed(
+        self, continuation: str | None = None, max_item_count: int = 100
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Read the next batch of changed documents.
+
+        Args:
+            continuation: Token returned by the previous call, or None to
+                start from the beginning of the feed
+            max_item_count: Maximum number of documents to return
+
+        Returns:
+            Tuple of (documents in write order, continuation token)
+        """
+        with self._lock:
+            position = int(continuation) if continuation else 0
+            start = bisect.bisect_right(self._log, position, key=lambda entry: entry[0])
+            changes: list[dict[str, Any]] = []
+            for index in range(start, len(self._log)):
+                lsn, item_id = self._log[index]
+                if len(changes) >= max_item_count:
+                    break
+                position = lsn
+                item = self._items.get(item_id)
+                # Superseded versions and deleted items are skipped, matching
+                # the "latest version" change feed mode.
+                if item is None or item["_lsn"] != lsn:
+                    continue
+                changes.append(copy.deepcopy(item))
+            return changes, str(position)
@@ -0,0 +1,253 @@
+"""Transactional outbox for onboarding notifications.
+
+Notification emails are not sent directly after saving state. Instead they are
+written as outbox documents into the hire's partition, in the same
+transactional batch as the state itself, so either both are persisted or
+neither is. An ``OutboxRelay`` later polls pending messages in batches, claims
+each one with an optimistic-concurrency lease so concurrent relays never pick
+up the same message, and delivers it through ``EmailService``.
+
+Each message carries an idempotency key derived from the hire and the kind of
+notification. Re-running the graph produces the same key, so the message is
+not enqueued again.
+
+Delivery is at most once. Before sending, the relay marks each claimed message
+``delivering`` with a write conditional on the claim's etag, and only sends if
+that write succeeds. ``delivering`` messages are never picked up again, so a
+relay that crashes mid-send leaves the message in that state for inspection
+instead of another relay resending it. The key also travels with the email
+(as ``Message-ID`` and ``Idempotency-Key``) for providers that deduplicate.
+"""
+
+import hashlib
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from agents.state import OnboardingState
+
+from .email_digest import PendingNotification
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_DOCUMENT_TYPE = "outbox"
+
+WELCOME_EMAIL = "welcome_email"
+MANAGER_NOTIFICATION = "manager_notification"
+
+
+def make_outbox_message(
+    new_hire_id: str,
+    kind: str,
+    payload: dict[str, Any],
+    idempotency_key: str | None = None,
+) -> dict[str, Any]:
+    """
+    Build an outbox document for the hire's partition.
+
+    Args:
+        new_hire_id: Hire whose partition holds the message
+        kind: Notification type (``welcome_email`` or ``manager_notification``)
+        payload: Arguments for the matching ``EmailService`` builder
+        idempotency_key: Defaults to a hash of hire ID and kind, so each
+            notification is sent once per hire
+    """
+    key = idempotency_key or hashlib.sha256(f"{new_hire_id}:{kind}".encode()).hexdigest()[:32]
+    return {
+        "id": f"outbox-{key}",
+        "partitionKey": new_hire_id,
+        "type": OUTBOX_DOCUMENT_TYPE,
+        "kind": kind,
+        "payload": payload,
+        "idempotency_key": key,
+        "status": "pending",
+        "attempts": 0,
+        "lease_until": None,
+        "created_at": datetime.now(UTC).isoformat(),
+    }
+
+
+def onboarding_notifications(
+    state: OnboardingState, manager_email: str | None = None
+) -> list[dict[str, Any]]:
+    """Outbox messages announcing a new onboarding to the hire and their manager."""
+    manager_email = manager_email or f"{state['manager_id']}@company.com"
+    return [
+        make_outbox_message(
+            state["new_hire_id"],
+            WELCOME_EMAIL,
+            {
+                "name": state["new_hire_name"],
+                "email": state["email"],
+                "start_date": state["start_date"],
+                "department": state["department"],
+            },
+        ),
+        make_outbox_message(
+            state["new_hire_id"],
+            MANAGER_NOTIFICATION,
+            {
+                "manager_email": manager_email,
+                "new_hire_name": state["new_hire_name"],
+                "start_date": state["start_date"],
+            },
+        ),
+    ]
+
+
+class OutboxRelay:
+    """Polls pending outbox messages in batches and delivers them."""
+
+    def __init__(
+        self,
+        store: Any,
+        email_service: Any = None,
+        batch_size: int = 50,
+        lease_seconds: int = 60,
+        max_attempts: int = 5,
+    ):
+        """
+        Initialize the relay.
+
+        Args:
+            store: Onboarding store exposing the outbox methods
+            email_service: Delivery service (defaults to the singleton)
+            batch_size: Messages fetched per poll
+            lease_seconds: How long a claimed message is reserved for this relay
+            max_attempts: Deliveries tried before a message is marked failed
+        """
+        if email_service is None:
+            from .email import get_email_service
+
+            email_service = get_email_service()
+        self.store = store
+        self.email_service = email_service
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def poll_once(self) -> int:
+        """
+        Deliver one batch of pending messages. Returns messages sent.
+
+        Manager notifications in the batch that go to the same manager are
+        delivered as a single digest.
+        """
+        now = datetime.now(UTC)
+        lease_until = (now + timedelta(seconds=self.lease_seconds)).isoformat()
+        claimed: list[dict[str, Any]] = []
+        for message in self.store.list_pending_outbox(self.batch_size, now.isoformat()):
+            message = self.store.claim_outbox(message, lease_until)
+            if message is not None:  # None when another relay got there first
+                claimed.append(message)
+
+        by_manager: dict[str, list[dict[str, Any]]] = {}
+        groups: list[list[dict[str, Any]]] = []
+        for message in claimed:
+            if message["kind"] == MANAGER_NOTIFICATION:
+                manager_email = message["payload"]["manager_email"]
+                if manager_email not in by_manager:
+                    by_manager[manager_email] = []
+                    groups.append(by_manager[manager_email])
+                by_manager[manager_email].append(message)
+            else:
+                groups.append([message])
+
+        sent = 0
+        for group in groups:
+            group = [m for m in map(self._mark_delivering, group) if m is not None]
+            if not group:
+                continue
+            delivered = (
+                self._deliver(group[0])
+                if len(group) == 1
+                else self._deliver_digest(group, now.isoformat())
+            )
+            for message in group:
+                self._complete(message, delivered)
+            sent += len(group) if delivered else 0
+        return sent
+
+    def _mark_delivering(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        """Durably record that the message is about to be sent; None if the claim was lost."""
+        marked = self.store.replace_outbox(
+            {
+                **message,
+                "status": "delivering",
+                "delivering_at": datetime.now(UTC).isoformat(),
+            }
+        )
+        if marked is None:
+            logger.warning(f"Outbox message {message['id']} was reclaimed; not sending")
+        return marked
+
+    def _complete(self, message: dict[str, Any], delivered: bool) -> None:
+        """Mark a message sent, or release it for retry."""
+        if delivered:
+            self.store.replace_outbox(
+                {
+                    **message,
+                    "status": "sent",
+                    "sent_at": datetime.now(UTC).isoformat(),
+                    "lease_until": None,
+                }
+            )
+            return
+        attempts = message.get("attempts", 0) + 1
+        self.store.replace_outbox(
+            {
+                **message,
+                "status": "failed" if attempts >= self.max_attempts else "pending",
+                "attempts": attempts,
+                "lease_until": None,
+            }
+        )
+
+    def run_until_empty(self, max_batches: int = 100) -> int:
+        """Poll until no pending messages remain. Returns messages sent."""
+        total = 0
+        for _ in range(max_batches):
+            sent = self.poll_once()
+            total += sent
+            if sent == 0:
+                break
+        return total
+
+    def _deliver(self, message: dict[str, Any]) -> bool:
+        """Build the email for an outbox message and send it synchronously."""
+        payload = message["payload"]
+        key = message["idempotency_key"]
+        try:
+            if message["kind"] == WELCOME_EMAIL:
+                email = self.email_service.build_welcome_email(**payload, idempotency_key=key)
+            elif message["kind"] == MANAGER_NOTIFICATION:
+                email = self.email_service.build_manager_notification(
+                    **payload, idempotency_key=key
+                )
+            else:
+                logger.error(f"Unknown outbox message kind: {message['kind']}")
+                return False
+            return self.email_service.send_message(email)
+        except Exception:
+            logger.exception(f"Outbox delivery failed for {message['id']}")
+            return False
+
+    def _deliver_digest(self, messages: list[dict[str, Any]], window_start: str) -> bool:
+        """Send several manager notifications for one manager as a digest of this poll."""
+        notifications = [
+            PendingNotification(
+                new_hire_name=m["payload"]["new_hire_name"],
+                start_date=m["payload"]["start_date"],
+                idempotency_key=m["idempotency_key"],
+            )
+            for m in messages
+        ]
+        manager_email = messages[0]["payload"]["manager_email"]
+        try:
+            email = self.email_service.build_manager_digest(
+                manager_email, notifications, window_start=window_start
+            )
+            return self.email_service.send_message(email)
+        except Exception:
+            logger.exception(f"Outbox digest delivery to {manager_email} failed")
+            return False
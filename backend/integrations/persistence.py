@@ -0,0 +1,105 @@
+"""Saving graph results, shared by the HTTP API and the MCP server.
+
+A graph run is persisted the same way whichever entry point triggered it: the
+state is saved (a new hire together with its outbox notifications), the run's
+task transitions are appended to the task ledger, the search index is updated
+and a new hire gets its phase timer.
+
+The ledger and index are only written after the state is durable, and their
+failures are logged instead of raised: failing the request at that point
+would make a client retry create a second hire.
+"""
+
+import logging
+from typing import Any, cast
+
+from agents.graph import onboarding_graph
+from agents.state import OnboardingState
+
+from .ledger import get_task_ledger
+from .outbox import onboarding_notifications
+from .scheduler import PhaseScheduler
+from .search import get_onboarding_search
+from .store import get_onboarding_store
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_state(state: OnboardingState) -> dict[str, Any]:
+    """Convert state to JSON-serializable dict."""
+    return {
+        "new_hire_id": state["new_hire_id"],
+        "new_hire_name": state["new_hire_name"],
+        "email": state["email"],
+        "role": state["role"],
+        "department": state["department"],
+        "start_date": state["start_date"],
+        "manager_id": state["manager_id"],
+        "current_phase": state["current_phase"],
+        "tasks": state["tasks"],
+        "completed_tasks": state["completed_tasks"],
+        "pending_tasks": state["pending_tasks"],
+        "messages": [
+            m.content if hasattr(m, "content") else str(m) for m in state.get("messages", [])
+        ],
+        "created_at": state["created_at"],
+        "updated_at": state["updated_at"],
+        "errors": state["errors"],
+    }
+
+
+def record_tasks(before: OnboardingState, after: dict[str, Any]) -> None:
+    """
+    Append the task transitions of a graph run to the hire's task ledger.
+
+    The ledger retries against a fresh replay when another run of the same
+    hire appended first. Any other failure propagates to ``after_run``, which
+    logs it; the next run's diff against the ledger then records the
+    transitions this run could not.
+    """
+    get_task_ledger().record(before, cast(OnboardingState, after))
+
+
+def after_run(before: OnboardingState, after: dict[str, Any]) -> None:
+    """Record a saved graph run's task transitions and make its result searchable."""
+    try:
+        record_tasks(before, after)
+    except Exception:
+        logger.exception(f"Task ledger update failed for {after['new_hire_id']}")
+    try:
+        get_onboarding_search().index.apply(after)
+    except Exception:
+        logger.exception(f"Search index update failed for {after['new_hire_id']}")
+
+
+def advance_states(states: list[OnboardingState]) -> list[Any]:
+    """Run a batch of hires through the graph; failures are returned in place."""
+    results = onboarding_graph.batch(states, return_exceptions=True)
+    return [
+        result if isinstance(result, Exception) else serialize_state(result) for result in results
+    ]
+
+
+def phase_scheduler(store: Any) -> PhaseScheduler:
+    """Scheduler that advances hires in batches and records each run once it is saved."""
+    return PhaseScheduler(store, advance_states, after_save=after_run)
+
+
+def persist_created(state: OnboardingState, result: dict[str, Any]) -> dict[str, Any]:
+    """Persist a new hire's serialized graph result and arm its phase timer."""
+    # Persist state and queue notifications in one transaction (outbox)
+    store = get_onboarding_store()
+    hire = cast(OnboardingState, result)
+    store.save_state_with_outbox(hire, onboarding_notifications(hire))
+    after_run(state, result)
+
+    # Arm the timer that advances the hire at its next phase boundary
+    phase_scheduler(store).schedule(hire)
+    return result
+
+
+def persist_advanced(state: OnboardingState, result: dict[str, Any]) -> dict[str, Any]:
+    """Persist the serialized result of re-running a stored hire."""
+    get_onboarding_store().update_state(result)
+    after_run(state, result)
+    return result
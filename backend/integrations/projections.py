@@ -0,0 +1,247 @@
+"""Change-feed driven aggregate projections for dashboards and counts.
+
+Instead of scanning every onboarding document to answer questions such as
+"how many hires are in ``immediate_prep`` per department", a
+``ChangeFeedProcessor`` reads the store's change feed in batches and folds each
+changed document into ``OnboardingProjections``. The processor checkpoints its
+continuation token in a lease store after every batch and resumes from it on
+the next batch.
+
+Projections live in process memory, so a new processor (after a restart, or a
+second instance) starts with empty aggregates. It therefore ignores any lease
+saved by an earlier processor and replays the feed from the beginning once;
+``apply`` replaces a document's previous contribution, so replays are safe.
+
+Works against both ``OnboardingCosmosClient`` and ``InMemoryOnboardingStore``,
+which expose the same ``read_change_feed`` method.
+"""
+
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Protocol, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K")
+
+
+class ChangeFeedSource(Protocol):
+    """Anything that exposes a batched change feed."""
+
+    def read_change_feed(
+        self, continuation: str | None = None, max_item_count: int = 100
+    ) -> tuple[list[dict[str, Any]], str | None]: ...
+
+
+class LeaseStore(Protocol):
+    """Persists change feed continuation tokens per processor name."""
+
+    def load(self, name: str) -> str | None: ...
+
+    def checkpoint(self, name: str, continuation: str | None) -> None: ...
+
+
+class Projection(Protocol):
+    """Read model kept up to date from change feed documents."""
+
+    def apply(self, document: dict[str, Any]) -> None: ...
+
+
+class InMemoryLeaseStore:
+    """Lease store that keeps continuation tokens in process memory."""
+
+    def __init__(self):
+        """Initialize empty lease table."""
+        self._leases: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+
+    def load(self, name: str) -> str | None:
+        """Return the last checkpointed continuation token."""
+        with self._lock:
+            return self._leases.get(name)
+
+    def checkpoint(self, name: str, continuation: str | None) -> None:
+        """Record the continuation token for a processor."""
+        with self._lock:
+            self._leases[name] = continuation
+
+
+class CosmosLeaseStore:
+    """Lease store backed by a Cosmos DB leases container."""
+
+    def __init__(self, container: Any):
+        """Initialize with a container client (partitioned on /id)."""
+        self.container = container
+
+    def load(self, name: str) -> str | None:
+        """Return the last checkpointed continuation token."""
+        from azure.cosmos.exceptions import CosmosResourceNotFoundError
+
+        try:
+            lease = self.container.read_item(item=name, partition_key=name)
+        except CosmosResourceNotFoundError:
+            return None
+        return lease.get("continuation")
+
+    def checkpoint(self, name: str, continuation: str | None) -> None:
+        """Record the continuation token for a processor."""
+        self.container.upsert_item(body={"id": name, "continuation": continuation})
+
+
+def _decrement(counter: Counter[K], keys: list[K]) -> None:
+    """Decrement each key once, dropping keys that reach zero."""
+    for key in keys:
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+
+@dataclass
+class _Contribution:
+    """What a single document currently adds to the projections."""
+
+    phase_department: tuple[str, str]
+    manager_id: str
+    open_tasks: list[tuple[str, str]]
+
+
+@dataclass
+class OnboardingProjections:
+    """Incrementally maintained aggregates over onboarding documents."""
+
+    phase_department: Counter[tuple[str, str]] = field(default_factory=Counter[tuple[str, str]])
+    hires_per_manager: Counter[str] = field(default_factory=Counter[str])
+    open_tasks_by_due_date: Counter[tuple[str, str]] = field(
+        default_factory=Counter[tuple[str, str]]
+    )
+    _contributions: dict[str, _Contribution] = field(default_factory=dict[str, _Contribution])
+
+    def apply(self, document: dict[str, Any]) -> None:
+        """Fold one changed document into the aggregates."""
+        if "type" in document:
+            return  # Outbox and other auxiliary documents are not hires
+        doc_id: str = document.get("id") or document.get("new_hire_id", "")
+        previous = self._contributions.pop(doc_id, None)
+        if previous is not None:
+            self._subtract(previous)
+
+        contribution = _Contribution(
+            phase_department=(
+                document.get("current_phase", "unknown"),
+                document.get("department", "General"),
+            ),
+            manager_id=document.get("manager_id", "mgr-default"),
+            open_tasks=[
+                (task["category"], task["due_date"])
+                for task in document.get("tasks", [])
+                if task.get("status") != "completed" and task.get("due_date")
+            ],
+        )
+        self.phase_department[contribution.phase_department] += 1
+        self.hires_per_manager[contribution.manager_id] += 1
+        self.open_tasks_by_due_date.update(contribution.open_tasks)
+        self._contributions[doc_id] = contribution
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a deleted document from the aggregates."""
+        previous = self._contributions.pop(doc_id, None)
+        if previous is not None:
+            self._subtract(previous)
+
+    def _subtract(self, contribution: _Contribution) -> None:
+        """Remove a previous contribution, pruning zero counts."""
+        _decrement(self.phase_department, [contribution.phase_department])
+        _decrement(self.hires_per_manager, [contribution.manager_id])
+        _decrement(self.open_tasks_by_due_date, contribution.open_tasks)
+
+    def count(self, phase: str, department: str | None = None) -> int:
+        """Number of hires in a phase, optionally within one department."""
+        return sum(
+            n
+            for (p, d), n in self.phase_department.items()
+            if p == phase and (department is None or d == department)
+        )
+
+    def overdue_tasks_per_category(self, as_of: date | None = None) -> dict[str, int]:
+        """Open tasks whose due date is before ``as_of`` (default today), per category."""
+        cutoff = (as_of or date.today()).isoformat()
+        overdue: Counter[str] = Counter()
+        for (category, due_date), n in self.open_tasks_by_due_date.items():
+            # Due dates are ISO strings, so lexical order matches date order
+            if due_date[:10] < cutoff:
+                overdue[category] += n
+        return dict(overdue)
+
+    def snapshot(self, as_of: date | None = None) -> dict[str, Any]:
+        """JSON-serializable view of all projections."""
+        by_phase: dict[str, dict[str, int]] = {}
+        for (phase, department), n in self.phase_department.items():
+            by_phase.setdefault(phase, {})[department] = n
+        return {
+            "hires_by_phase_and_department": by_phase,
+            "hires_per_manager": dict(self.hires_per_manager),
+            "overdue_tasks_per_category": self.overdue_tasks_per_category(as_of),
+        }
+
+
+class ChangeFeedProcessor:
+    """Reads a change feed in batches and keeps projections up to date."""
+
+    def __init__(
+        self,
+        source: ChangeFeedSource,
+        projections: Projection | None = None,
+        lease_store: LeaseStore | None = None,
+        name: str = "onboarding-projections",
+        batch_size: int = 100,
+    ):
+        """
+        Initialize the processor.
+
+        Args:
+            source: Store exposing ``read_change_feed``
+            projections: Read model to maintain (new ``OnboardingProjections`` by default)
+            lease_store: Where continuation tokens are checkpointed
+            name: Lease name, unique per logical consumer
+            batch_size: Maximum documents read per round trip
+        """
+        self.source = source
+        self.projections: Projection = projections or OnboardingProjections()
+        self.lease_store = lease_store or InMemoryLeaseStore()
+        self.name = name
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._replaying = True
+
+    def process_batch(self) -> int:
+        """Process one batch of changes and checkpoint. Returns documents applied."""
+        with self._lock:
+            # Empty projections cannot resume from an earlier processor's lease
+            continuation = None if self._replaying else self.lease_store.load(self.name)
+            documents, next_continuation = self.source.read_change_feed(
+                continuation, max_item_count=self.batch_size
+            )
+            for document in documents:
+                self.projections.apply(document)
+            # Checkpoint only after the whole batch has been applied so a crash
+            # replays the batch rather than skipping it.
+            if self._replaying or next_continuation != continuation:
+                self.lease_store.checkpoint(self.name, next_continuation)
+            self._replaying = False
+            return len(documents)
+
+    def run_until_caught_up(self, max_batches: int | None = None) -> int:
+        """Process batches until the feed is drained. Returns documents applied."""
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            applied = self.process_batch()
+            batches += 1
+            total += applied
+            if applied < self.batch_size:
+                break
+        logger.info(f"Change feed processor {self.name} applied {total} documents")
+        return total
@@ -0,0 +1,166 @@
+"""Query definitions shared by the Cosmos DB and in-memory onboarding stores."""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+# Fields returned by the typed query methods. Listing views never need the
+# task list or agent messages, so projecting them away keeps RU and payload small.
+SUMMARY_FIELDS = [
+    "id",
+    "new_hire_id",
+    "new_hire_name",
+    "email",
+    "role",
+    "department",
+    "start_date",
+    "manager_id",
+    "current_phase",
+    "created_at",
+    "updated_at",
+]
+
+SUMMARY_PROJECTION = ", ".join(f"c.{name}" for name in SUMMARY_FIELDS)
+
+# Outbox and other auxiliary documents carry a "type"; onboarding states do not
+IS_STATE = "NOT IS_DEFINED(c.type)"
+
+LIST_STATES_QUERY = (
+    f"SELECT * FROM c WHERE {IS_STATE} ORDER BY c.created_at DESC OFFSET 0 LIMIT @limit"
+)
+
+BY_MANAGER_QUERY = (
+    f"SELECT {SUMMARY_PROJECTION} FROM c WHERE {IS_STATE} AND c.manager_id = @value "
+    "ORDER BY c.manager_id ASC, c.start_date ASC OFFSET 0 LIMIT @limit"
+)
+
+BY_PHASE_QUERY = (
+    f"SELECT {SUMMARY_PROJECTION} FROM c WHERE {IS_STATE} AND c.current_phase = @value "
+    "ORDER BY c.current_phase ASC, c.start_date ASC OFFSET 0 LIMIT @limit"
+)
+
+BY_DEPARTMENT_QUERY = (
+    f"SELECT {SUMMARY_PROJECTION} FROM c WHERE {IS_STATE} AND c.department = @value "
+    "ORDER BY c.department ASC, c.start_date ASC OFFSET 0 LIMIT @limit"
+)
+
+STARTING_BETWEEN_QUERY = (
+    f"SELECT {SUMMARY_PROJECTION} FROM c WHERE {IS_STATE} "
+    "AND c.start_date >= @start AND c.start_date <= @end "
+    "ORDER BY c.start_date ASC OFFSET 0 LIMIT @limit"
+)
+
+PENDING_OUTBOX_QUERY = (
+    "SELECT * FROM c WHERE c.type = 'outbox' AND (c.status = 'pending' "
+    "OR (c.status = 'sending' AND c.lease_until < @now)) OFFSET 0 LIMIT @limit"
+)
+
+EXISTING_OUTBOX_IDS_QUERY = (
+    "SELECT c.id FROM c WHERE c.type = 'outbox' AND ARRAY_CONTAINS(@ids, c.id)"
+)
+
+DUE_TIMERS_QUERY = (
+    "SELECT * FROM c WHERE c.type = 'timer' AND c.due_at <= @due_by AND (c.status = 'pending' "
+    "OR (c.status = 'firing' AND c.lease_until < @now)) ORDER BY c.due_at ASC OFFSET 0 LIMIT @limit"
+)
+
+TASK_EVENTS_QUERY = (
+    "SELECT * FROM c WHERE c.type = 'task_event' AND c.new_hire_id = @new_hire_id "
+    "AND c.seq > @after_seq ORDER BY c.seq ASC"
+)
+
+# Largest page returned by list_states_page
+MAX_PAGE_SIZE = 100
+
+# Tuned indexing policy for the onboarding container. Large arrays that are
+# never filtered on are excluded to cut write RU, and each equality filter
+# gets a composite index with the start_date sort used by the queries above.
+INDEXING_POLICY: dict[str, Any] = {
+    "indexingMode": "consistent",
+    "automatic": True,
+    "includedPaths": [{"path": "/*"}],
+    "excludedPaths": [
+        {"path": "/tasks/*"},
+        {"path": "/messages/*"},
+        {"path": "/completed_tasks/*"},
+        {"path": "/pending_tasks/*"},
+        {"path": "/errors/*"},
+        {"path": "/payload/*"},
+        {"path": "/fields/*"},
+        {"path": '/"_etag"/?'},
+    ],
+    "compositeIndexes": [
+        [
+            {"path": "/manager_id", "order": "ascending"},
+            {"path": "/start_date", "order": "ascending"},
+        ],
+        [
+            {"path": "/current_phase", "order": "ascending"},
+            {"path": "/start_date", "order": "ascending"},
+        ],
+        [
+            {"path": "/department", "order": "ascending"},
+            {"path": "/start_date", "order": "ascending"},
+        ],
+    ],
+}
+
+
+@dataclass
+class QueryResult:
+    """Items returned by a query plus the request units it consumed."""
+
+    items: list[dict[str, Any]] = field(default_factory=list[dict[str, Any]])
+    request_charge: float = 0.0
+    continuation: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+def project_summary(document: dict[str, Any]) -> dict[str, Any]:
+    """Apply the summary projection to a full document."""
+    return {name: document[name] for name in SUMMARY_FIELDS if name in document}
+
+
+@dataclass
+class StateFilters:
+    """Optional filters for paginated listing; unset fields match everything."""
+
+    phase: str | None = None
+    department: str | None = None
+    manager_id: str | None = None
+    start_from: str | None = None
+    start_to: str | None = None
+
+    def matches(self, document: dict[str, Any]) -> bool:
+        """Whether a document passes every set filter."""
+        start_date = document.get("start_date", "")
+        return (
+            (self.phase is None or document.get("current_phase") == self.phase)
+            and (self.department is None or document.get("department") == self.department)
+            and (self.manager_id is None or document.get("manager_id") == self.manager_id)
+            and (self.start_from is None or start_date >= self.start_from)
+            and (self.start_to is None or start_date <= self.start_to)
+        )
+
+
+def build_list_page_query(filters: StateFilters) -> tuple[str, list[dict[str, Any]]]:
+    """Build the parameterized listing query for a set of filters."""
+    conditions = [IS_STATE]
+    parameters: list[dict[str, Any]] = []
+    for name, clause in (
+        ("phase", "c.current_phase = @phase"),
+        ("department", "c.department = @department"),
+        ("manager_id", "c.manager_id = @manager_id"),
+        ("start_from", "c.start_date >= @start_from"),
+        ("start_to", "c.start_date <= @start_to"),
+    ):
+        value = getattr(filters, name)
+        if value is not None:
+            conditions.append(clause)
+            parameters.append({"name": f"@{name}", "value": value})
+    query = (
+        f"SELECT {SUMMARY_PROJECTION} FROM c WHERE {' AND '.join(conditions)} "
+        "ORDER BY c.start_date ASC"
+    )
+    return query, parameters
@@ -0,0 +1,174 @@
+"""Phase-boundary timers for onboarding workflows.
+
+A hire's phase is a pure function of the calendar: it changes 14 and 7 days
+before the start date and on the day after it. Instead of re-running every
+hire's graph to find out, each hire gets one timer document in its partition
+holding the date of its next phase boundary. The store keeps timers ordered by
+due date (a min-heap in memory, a range-indexed ``due_at`` query in Cosmos DB),
+so a tick reads only the hires whose boundary has passed.
+
+``PhaseScheduler.tick`` claims due timers with an optimistic-concurrency lease
+so overlapping ticks never advance the same hire twice, runs the claimed hires
+through the graph as one batch, saves the results and re-arms each timer for
+the following boundary, deleting it after the last one. Work that must only
+follow a durable save (task ledger, search index) goes in ``after_save``.
+"""
+
+import logging
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from agents.coordinator import next_phase_boundary
+from agents.state import OnboardingState
+
+logger = logging.getLogger(__name__)
+
+TIMER_DOCUMENT_TYPE = "timer"
+
+
+def make_phase_timer(state: OnboardingState, today: date) -> dict[str, Any] | None:
+    """
+    Build the timer document for a hire's next phase boundary.
+
+    Returns:
+        Timer document for the hire's partition, or None when the hire has
+        no phase change left
+    """
+    boundary = next_phase_boundary(state["start_date"], today)
+    if boundary is None:
+        return None
+    return {
+        "id": f"timer-{state['new_hire_id']}",
+        "partitionKey": state["new_hire_id"],
+        "type": TIMER_DOCUMENT_TYPE,
+        "new_hire_id": state["new_hire_id"],
+        "due_at": boundary.isoformat(),
+        "status": "pending",
+        "attempts": 0,
+        "lease_until": None,
+    }
+
+
+class ManualClock:
+    """Clock stand-in for tests and local runs; time moves only when advanced."""
+
+    def __init__(self, now: datetime):
+        """Start the clock at ``now``."""
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, **delta: float) -> None:
+        """Move the clock forward by a ``timedelta`` worth of keyword arguments."""
+        self.now += timedelta(**delta)
+
+
+class PhaseScheduler:
+    """Advances hires through the graph when their phase boundary passes."""
+
+    def __init__(
+        self,
+        store: Any,
+        advance: Callable[[list[OnboardingState]], list[Any]],
+        batch_size: int = 50,
+        lease_seconds: int = 300,
+        max_attempts: int = 5,
+        clock: Callable[[], datetime] = datetime.now,
+        after_save: Callable[[OnboardingState, OnboardingState], None] | None = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            store: Onboarding store exposing the timer methods
+            advance: Runs a batch of states through the graph, returning the
+                new state or the raised exception for each, in order
+            batch_size: Timers claimed per tick
+            lease_seconds: How long a claimed timer is reserved; failed hires
+                are retried once it expires
+            max_attempts: Failed runs before a timer is marked failed
+            clock: Local time source, matching the coordinator's calendar
+            after_save: Called with a hire's state before and after its run,
+                once the new state is saved
+        """
+        self.store = store
+        self.advance = advance
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.after_save = after_save
+
+    def schedule(self, state: OnboardingState) -> dict[str, Any] | None:
+        """Arm the timer for a hire's next boundary. Returns the timer, if any."""
+        timer = make_phase_timer(state, self.clock().date())
+        if timer is not None:
+            self.store.save_timer(timer)
+        return timer
+
+    def tick(self) -> int:
+        """Advance one batch of hires whose boundary has passed. Returns hires advanced."""
+        now = self.clock()
+        lease_until = (now + timedelta(seconds=self.lease_seconds)).isoformat()
+
+        timers: list[dict[str, Any]] = []
+        states: list[OnboardingState] = []
+        for timer in self.store.list_due_timers(
+            now.date().isoformat(), now.isoformat(), self.batch_size
+        ):
+            timer = self.store.claim_timer(timer, lease_until)
+            if timer is None:  # Another tick got there first
+                continue
+            state = self.store.get_state(timer["new_hire_id"])
+            if state is None:
+                self.store.delete_timer(timer)
+                continue
+            timers.append(timer)
+            states.append(state)
+
+        if not states:
+            return 0
+
+        advanced = 0
+        for timer, state, result in zip(timers, states, self.advance(states)):
+            if isinstance(result, Exception):
+                logger.error(f"Phase advance failed for {timer['new_hire_id']}: {result}")
+                self._fail(timer)
+                continue
+            self.store.update_state(result)
+            if self.after_save is not None:
+                self.after_save(state, result)
+            self._rearm(timer, result, now.date())
+            advanced += 1
+        return advanced
+
+    def run_until_idle(self, max_batches: int = 100) -> int:
+        """Tick until no due hires remain. Returns hires advanced."""
+        total = 0
+        for _ in range(max_batches):
+            advanced = self.tick()
+            total += advanced
+            if advanced == 0:
+                break
+        return total
+
+    def _rearm(self, timer: dict[str, Any], state: OnboardingState, today: date) -> None:
+        """Point the timer at the hire's following boundary, or delete it."""
+        next_timer = make_phase_timer(state, today)
+        if next_timer is None:
+            self.store.delete_timer(timer)
+        else:
+            self.store.save_timer(next_timer)
+
+    def _fail(self, timer: dict[str, Any]) -> None:
+        """Record a failed run; the lease holds the retry off until it expires."""
+        attempts = timer.get("attempts", 0) + 1
+        self.store.save_timer(
+            {
+                **timer,
+                "status": "failed" if attempts >= self.max_attempts else "firing",
+                "attempts": attempts,
+            }
+        )
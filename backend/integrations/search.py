@@ -0,0 +1,305 @@
+"""In-memory search over new hires by name, role, department and manager.
+
+Assistants know people by name ("onboarding status for Priya") while every
+tool needs a ``new_hire_id``. ``SearchIndex`` keeps an inverted index from
+lowercased words to the hires containing them, plus a prefix trie over those
+words, so partial words match as the user types. Every query word must match
+a hire (as a whole word or a prefix); exact words and name matches score
+highest, and only the hires scoring at least the ``k``-th best are sorted.
+
+The index is a projection: ``ChangeFeedProcessor`` folds every created or
+updated document into it, so hires written by any instance become searchable.
+Writers in this process also apply their results directly, so their own
+writes are visible without waiting for the feed.
+"""
+
+import heapq
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .projections import ChangeFeedProcessor, ChangeFeedSource, LeaseStore
+from .queries import project_summary
+
+# Indexed document fields and how much a match in each counts
+FIELD_WEIGHTS = {
+    "new_hire_name": 3.0,
+    "role": 2.0,
+    "department": 1.0,
+    "manager_id": 1.0,
+}
+
+# A query word that is only a prefix of an indexed word counts this much
+PREFIX_MATCH_FACTOR = 0.5
+
+_WORD = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased alphanumeric words of ``text``."""
+    return _WORD.findall(text.lower())
+
+
+class _TrieNode:
+    __slots__ = ("children", "terminal")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.terminal = False
+
+
+class PrefixTrie:
+    """Set of words supporting completion of a prefix."""
+
+    def __init__(self):
+        """Initialize an empty trie."""
+        self._root = _TrieNode()
+
+    def add(self, word: str) -> None:
+        """Insert a word."""
+        node = self._root
+        for char in word:
+            node = node.children.setdefault(char, _TrieNode())
+        node.terminal = True
+
+    def discard(self, word: str) -> None:
+        """Remove a word, pruning branches left without words."""
+        path = [self._root]
+        for char in word:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].terminal = False
+        for depth in range(len(word), 0, -1):
+            node = path[depth]
+            if node.terminal or node.children:
+                break
+            del path[depth - 1].children[word[depth - 1]]
+
+    def complete(self, prefix: str, limit: int) -> list[str]:
+        """
+        Words starting with ``prefix``, shortest first, at most ``limit``.
+
+        Shorter words are visited first so the exact word, when present,
+        is always among the results.
+        """
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        words: list[str] = []
+        level = [(prefix, node)]
+        while level and len(words) < limit:
+            next_level: list[tuple[str, _TrieNode]] = []
+            for word, current in level:
+                if current.terminal:
+                    words.append(word)
+                    if len(words) >= limit:
+                        break
+                next_level.extend((word + char, child) for char, child in current.children.items())
+            level = next_level
+        return words
+
+
+class SearchIndex:
+    """Inverted index and prefix trie over hire summaries."""
+
+    def __init__(self, max_expansions: int = 64):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_expansions: Most indexed words a query prefix expands to; keeps
+                one-letter queries from touching the whole vocabulary
+        """
+        self.max_expansions = max_expansions
+        self._postings: dict[str, dict[str, float]] = {}
+        self._terms: dict[str, dict[str, float]] = {}
+        self._summaries: dict[str, dict[str, Any]] = {}
+        self._sort_keys: dict[str, tuple[str, str]] = {}
+        self._trie = PrefixTrie()
+        self._lock = threading.RLock()
+
+    def apply(self, document: dict[str, Any]) -> None:
+        """Index a created or updated document, replacing its previous entry."""
+        if "type" in document:
+            return  # Outbox and other auxiliary documents are not hires
+        doc_id = document.get("id") or document["new_hire_id"]
+        terms: dict[str, float] = {}
+        for field_name, weight in FIELD_WEIGHTS.items():
+            for word in tokenize(document.get(field_name) or ""):
+                terms[word] = max(terms.get(word, 0.0), weight)
+
+        with self._lock:
+            previous = self._summaries.get(doc_id)
+            if previous is not None and (previous.get("updated_at") or "") > (
+                document.get("updated_at") or ""
+            ):
+                return  # A newer version was already applied directly
+            self._unindex(doc_id)
+            for word, weight in terms.items():
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = {}
+                    self._trie.add(word)
+                postings[doc_id] = weight
+            self._terms[doc_id] = terms
+            self._summaries[doc_id] = {
+                **project_summary(document),
+                "current_phase": document.get("current_phase"),
+                "updated_at": document.get("updated_at"),
+            }
+            self._sort_keys[doc_id] = ((document.get("new_hire_name") or "").lower(), doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a deleted document."""
+        with self._lock:
+            self._unindex(doc_id)
+            self._summaries.pop(doc_id, None)
+            self._sort_keys.pop(doc_id, None)
+
+    def _unindex(self, doc_id: str) -> None:
+        for word in self._terms.pop(doc_id, {}):
+            postings = self._postings[word]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[word]
+                self._trie.discard(word)
+
+    def search(self, query: str, k: int = 10) -> list[dict[str, Any]]:
+        """
+        Best matches for a free-text query.
+
+        Returns:
+            Up to ``k`` hire summaries with a ``score``, best first; ties are
+            broken by name
+        """
+        words = tokenize(query)
+        if not words or k <= 0:
+            return []
+        with self._lock:
+            expansions: list[tuple[int, list[tuple[dict[str, float], float]]]] = []
+            for word in words:
+                terms = self._trie.complete(word, self.max_expansions)
+                if not terms:
+                    return []
+                postings = [
+                    (self._postings[term], 1.0 if term == word else PREFIX_MATCH_FACTOR)
+                    for term in terms
+                ]
+                expansions.append((sum(len(p) for p, _ in postings), postings))
+            # Most selective word first; later words only check the survivors
+            expansions.sort(key=lambda expansion: expansion[0])
+
+            scores = _best_matches(expansions[0][1])
+            for matched, postings in expansions[1:]:
+                if len(scores) < matched:
+                    narrowed: dict[str, float] = {}
+                    for doc_id, score in scores.items():
+                        best = max(
+                            weights.get(doc_id, 0.0) * factor for weights, factor in postings
+                        )
+                        if best > 0.0:
+                            narrowed[doc_id] = score + best
+                    scores = narrowed
+                else:
+                    scores = {
+                        doc_id: scores[doc_id] + weight
+                        for doc_id, weight in _best_matches(postings).items()
+                        if doc_id in scores
+                    }
+                if not scores:
+                    return []
+
+            # Find the k-th best score on bare floats; hires above it are few,
+            # ties at it may be many and are cut down by name without sorting
+            cutoff = heapq.nlargest(k, scores.values())[-1]
+            above = sorted(
+                (doc_id for doc_id, score in scores.items() if score > cutoff),
+                key=lambda doc_id: (-scores[doc_id], self._sort_keys[doc_id]),
+            )
+            tied = heapq.nsmallest(
+                k - len(above),
+                (doc_id for doc_id, score in scores.items() if score == cutoff),
+                key=self._sort_keys.__getitem__,
+            )
+            return [{**self._summaries[doc_id], "score": scores[doc_id]} for doc_id in above + tied]
+
+
+def _best_matches(postings: list[tuple[dict[str, float], float]]) -> dict[str, float]:
+    """Best weighted score per hire across one query word's expanded terms."""
+    if len(postings) == 1:
+        weights, factor = postings[0]
+        return {doc_id: weight * factor for doc_id, weight in weights.items()}
+    best: dict[str, float] = {}
+    for weights, factor in postings:
+        for doc_id, weight in weights.items():
+            score = weight * factor
+            if score > best.get(doc_id, 0.0):
+                best[doc_id] = score
+    return best
+
+
+class OnboardingSearch:
+    """Search index kept current from the store's change feed."""
+
+    def __init__(
+        self,
+        source: ChangeFeedSource,
+        index: SearchIndex | None = None,
+        lease_store: LeaseStore | None = None,
+        max_staleness: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the search service.
+
+        Args:
+            source: Store exposing ``read_change_feed``
+            index: Index to maintain (a new, empty one by default)
+            lease_store: Where the change feed position is checkpointed
+            max_staleness: Seconds a query may trail the change feed before it
+                catches up first; 0 catches up on every query
+            clock: Monotonic time source
+        """
+        self.index = index or SearchIndex()
+        self.processor = ChangeFeedProcessor(
+            source, projections=self.index, lease_store=lease_store, name="onboarding-search"
+        )
+        self.max_staleness = max_staleness
+        self.clock = clock
+        self._refreshed_at: float | None = None
+
+    def refresh(self) -> int:
+        """Fold the change feed into the index. Returns documents applied."""
+        applied = self.processor.run_until_caught_up()
+        self._refreshed_at = self.clock()
+        return applied
+
+    def search(self, query: str, k: int = 10) -> list[dict[str, Any]]:
+        """Top ``k`` hires matching ``query``, catching up first if the index is stale."""
+        if self._refreshed_at is None or self.clock() - self._refreshed_at >= self.max_staleness:
+            self.refresh()
+        return self.index.search(query, k)
+
+
+# Singleton instance
+_onboarding_search: OnboardingSearch | None = None
+
+
+def get_onboarding_search() -> OnboardingSearch:
+    """Get or create the search singleton over the onboarding store (SEARCH_MAX_STALENESS_SECONDS)."""
+    global _onboarding_search
+    if _onboarding_search is None:
+        from .store import get_onboarding_store
+
+        _onboarding_search = OnboardingSearch(
+            get_onboarding_store(),
+            max_staleness=float(os.environ.get("SEARCH_MAX_STALENESS_SECONDS", "1")),
+        )
+    return _onboarding_search
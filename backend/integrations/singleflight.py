@@ -0,0 +1,110 @@
+"""Single-flight coalescing of concurrent identical reads.
+
+When several requests ask for the same key at the same moment, only the
+first (the leader) performs the fetch; the rest wait for and share its result,
+or its exception. Nothing is cached: once the fetch finishes the key is
+released, so the next request reads fresh data.
+
+``do`` coalesces across threads and ``do_async`` across tasks of one event
+loop. Shared results are the same object for every caller and must be treated
+as read-only. ``snapshot()`` reports how many requests were served by another
+request's fetch (the coalescing ratio).
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Call:
+    """An in-flight synchronous fetch."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight:
+    """Shares one in-flight fetch among concurrent callers with the same key."""
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self.requests = 0
+        self.executions = 0
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task[Any]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fetch: Callable[[], T]) -> T:
+        """Run ``fetch`` unless a call for ``key`` is in flight; then wait for it."""
+        with self._lock:
+            self.requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fetch: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fetch`` unless a call for ``key`` is in flight; then await it.
+
+        The shared fetch runs as its own task, so a cancelled caller does not
+        cancel it for the others.
+        """
+        task_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            self.requests += 1
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = asyncio.ensure_future(fetch())
+                self.executions += 1
+                task.add_done_callback(lambda done: self._release(task_key, done))
+        return await asyncio.shield(task)
+
+    def _release(
+        self, task_key: tuple[asyncio.AbstractEventLoop, Hashable], task: asyncio.Task[Any]
+    ) -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved here in case every caller was cancelled
+
+    def snapshot(self) -> dict[str, Any]:
+        """Request, fetch and coalescing counters."""
+        with self._lock:
+            coalesced = self.requests - self.executions
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": coalesced,
+                "coalescing_ratio": coalesced / self.requests if self.requests else 0.0,
+            }
+
+    def reset(self) -> None:
+        """Zero the counters."""
+        with self._lock:
+            self.requests = 0
+            self.executions = 0
@@ -0,0 +1,31 @@
+"""Selection of the onboarding persistence backend."""
+
+import os
+from typing import Any
+
+# Singleton instance
+_store: Any | None = None
+
+
+def get_onboarding_store() -> Any:
+    """
+    Get or create the configured onboarding store singleton.
+
+    ONBOARDING_STORE selects the backend ("cosmos" or "memory"). When unset,
+    Cosmos DB is used if COSMOS_ENDPOINT is configured and the in-memory
+    store otherwise, so local runs and tests work without Azure.
+    """
+    global _store
+    if _store is None:
+        backend = os.environ.get("ONBOARDING_STORE") or (
+            "cosmos" if os.environ.get("COSMOS_ENDPOINT") else "memory"
+        )
+        if backend == "cosmos":
+            from .cosmos import get_cosmos_client
+
+            _store = get_cosmos_client()
+        else:
+            from .local_store import InMemoryOnboardingStore
+
+            _store = InMemoryOnboardingStore()
+    return _store
@@ -0,0 +1,227 @@
+"""Client-side rate limiting and 429 retry handling.
+
+Cosmos DB answers with HTTP 429 and an ``x-ms-retry-after-ms`` hint once the
+provisioned throughput is exhausted. ``AdaptiveRateLimiter`` is a token bucket
+shared across the process whose refill rate adapts to those signals: it backs
+off multiplicatively on every 429 and recovers additively on success (AIMD).
+
+Callers declare a priority. Bulk work (cohort imports) may only spend tokens
+above a reserve kept for interactive calls and is paused for longer after a
+429, so single creates and reads keep their latency during a large import.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Callable, Mapping
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Thread-safe token bucket with a mutable refill rate."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second of tokens)
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0, reserve: float = 0.0) -> float:
+        """
+        Take tokens if available without dipping below ``reserve``.
+
+        Returns:
+            0.0 when the tokens were taken, otherwise seconds until they should be
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens - tokens >= reserve:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens + reserve - self.tokens) / self.rate
+
+    def acquire(
+        self, tokens: float = 1.0, timeout: float | None = None, reserve: float = 0.0
+    ) -> bool:
+        """Block until tokens are available. Returns False on timeout."""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self.try_acquire(tokens, reserve)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            self._sleep(wait)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call is still throttled after every retry."""
+
+    status_code = 429
+
+
+class AdaptiveRateLimiter:
+    """Process-wide AIMD token bucket with interactive and bulk priorities."""
+
+    def __init__(
+        self,
+        rate: float = 200.0,
+        min_rate: float = 5.0,
+        max_rate: float | None = None,
+        bulk_reserve: float = 0.25,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Initial requests per second
+            min_rate: Floor for multiplicative decrease
+            max_rate: Ceiling for additive increase (defaults to ``rate``)
+            bulk_reserve: Fraction of bucket capacity bulk callers may not use
+            increase: Requests per second added after each success
+            decrease: Factor applied to the rate after each 429
+        """
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.bulk_reserve = bulk_reserve
+        self.increase = increase
+        self.decrease = decrease
+        self.bucket = TokenBucket(rate, clock=clock, sleep=sleep)
+        self._clock = clock
+        self.sleep = sleep
+        self._paused_until = {INTERACTIVE: 0.0, BULK: 0.0}
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in requests per second."""
+        return self.bucket.rate
+
+    def acquire(self, priority: str = INTERACTIVE, timeout: float | None = None) -> bool:
+        """Wait for permission to send one request."""
+        pause = self._paused_until[priority] - self._clock()
+        if pause > 0:
+            if timeout is not None and pause > timeout:
+                return False
+            self.sleep(pause)
+            timeout = None if timeout is None else timeout - pause
+        reserve = self.bucket.capacity * self.bulk_reserve if priority == BULK else 0.0
+        return self.bucket.acquire(timeout=timeout, reserve=reserve)
+
+    def on_success(self) -> None:
+        """Additively recover the rate after a successful call."""
+        with self._lock:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.increase)
+
+    def on_throttle(self, retry_after: float) -> None:
+        """Multiplicatively back off and pause callers after a 429."""
+        with self._lock:
+            self.bucket.rate = max(self.min_rate, self.bucket.rate * self.decrease)
+            now = self._clock()
+            # Bulk callers sit out twice as long so interactive calls drain first
+            self._paused_until[INTERACTIVE] = max(
+                self._paused_until[INTERACTIVE], now + retry_after
+            )
+            self._paused_until[BULK] = max(self._paused_until[BULK], now + 2 * retry_after)
+        logger.warning(
+            f"Cosmos DB throttled (retry after {retry_after:.3f}s), "
+            f"rate lowered to {self.bucket.rate:.1f} req/s"
+        )
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Return the retry-after hint of a 429 error, or None if it is not a 429."""
+    if getattr(error, "status_code", None) != 429:
+        return None
+    headers: Mapping[str, str] = getattr(error, "headers", None) or {}
+    retry_after_ms = headers.get("x-ms-retry-after-ms")
+    return float(retry_after_ms) / 1000 if retry_after_ms else 0.0
+
+
+def call_with_retry(
+    call: Callable[[], T],
+    limiter: AdaptiveRateLimiter,
+    priority: str = INTERACTIVE,
+    max_attempts: int = 6,
+    base_delay: float = 0.05,
+    max_delay: float = 5.0,
+) -> T:
+    """
+    Run ``call`` under the limiter, retrying 429s with backoff and jitter.
+
+    The wait before each retry is the larger of the server's retry-after hint
+    and an exponentially growing, fully jittered delay.
+
+    Raises:
+        RateLimitExceeded: If the call is still throttled after ``max_attempts``
+    """
+    attempt = 0
+    while True:
+        limiter.acquire(priority)
+        try:
+            result = call()
+        except Exception as e:
+            retry_after = retry_after_seconds(e)
+            if retry_after is None:
+                raise
+            limiter.on_throttle(retry_after)
+            attempt += 1
+            if attempt >= max_attempts:
+                raise RateLimitExceeded(f"Still throttled after {max_attempts} attempts") from e
+            backoff = random.uniform(0, min(max_delay, base_delay * 2**attempt))
+            limiter.sleep(max(retry_after, backoff))
+            continue
+        limiter.on_success()
+        return result
+
+
+# Singleton instance
+_rate_limiter: AdaptiveRateLimiter | None = None
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Get or create the process-wide Cosmos DB rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        rate = float(os.environ.get("COSMOS_MAX_REQUESTS_PER_SECOND", "200"))
+        _rate_limiter = AdaptiveRateLimiter(rate=rate)
+    return _rate_limiter
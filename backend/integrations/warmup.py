@@ -0,0 +1,99 @@
+"""Warm-up of per-instance resources before an instance takes traffic.
+
+A new Functions instance otherwise pays on its first requests for the Cosmos
+handshake and partition-map lookup, template compilation, transport setup
+and building the search index from the change feed. ``Warmup`` runs a list
+of named steps once, records how long each took, and reports the instance as
+ready only when every step has succeeded.
+
+Steps that fail are retried by the next ``run``; steps that succeeded are not
+repeated. Concurrent callers (the host's warmup trigger, the warmup route and
+readiness probes) share one run. ``start`` runs it on a background thread so a
+readiness probe can kick off warm-up without waiting for it.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class _StepResult:
+    """Outcome of the latest attempt at one step."""
+
+    status: str = PENDING
+    seconds: float | None = None
+    error: str | None = None
+
+
+class Warmup:
+    """Runs named warm-up steps once and tracks readiness."""
+
+    def __init__(
+        self,
+        steps: list[tuple[str, Callable[[], Any]]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize with every step pending.
+
+        Args:
+            steps: ``(name, callable)`` pairs, run in order
+            clock: Monotonic time source for step durations
+        """
+        self.steps = steps
+        self.clock = clock
+        self._results = {name: _StepResult() for name, _ in steps}
+        self._run_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether every step has succeeded."""
+        return all(result.status == DONE for result in self._results.values())
+
+    def run(self) -> bool:
+        """Run the steps that have not succeeded yet. Returns readiness."""
+        with self._run_lock:
+            for name, step in self.steps:
+                result = self._results[name]
+                if result.status == DONE:
+                    continue
+                start = self.clock()
+                try:
+                    step()
+                except Exception as e:
+                    logger.exception(f"Warm-up step {name} failed")
+                    result.status, result.error = FAILED, str(e)
+                else:
+                    result.status, result.error = DONE, None
+                result.seconds = self.clock() - start
+            return self.ready
+
+    def start(self) -> None:
+        """Run the pending steps on a background thread unless ready or already running."""
+        with self._thread_lock:
+            if self.ready or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+            self._thread.start()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Readiness and the status, duration and error of every step."""
+        return {
+            "ready": self.ready,
+            "steps": {
+                name: {"status": r.status, "seconds": r.seconds, "error": r.error}
+                for name, r in self._results.items()
+            },
+        }
@@ -2,16 +2,34 @@
 
 This MCP server exposes the LangGraph onboarding workflow as tools that can be
 invoked by GitHub Copilot or other MCP clients.
+
+Runs over stdio by default. Set MCP_TRANSPORT=streamable-http (or pass
+``--transport streamable-http``) to serve many clients over HTTP. Tools are
+async: blocking graph and storage work runs on a bounded thread pool, and each
+client is limited to a fixed number of in-flight requests so one busy client
+cannot starve the others.
 """
 
+import argparse
+import asyncio
+import contextvars
 import json
 import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, TypeVar, cast
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 from pydantic import BaseModel, Field
 
+from integrations.singleflight import SingleFlight
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -68,80 +86,465 @@ class PhaseInfo(BaseModel):
     phase_description: str = Field(description="Description of current phase")
 
 
+class BatchItemResult(BaseModel):
+    """Outcome of one item in a batch tool call."""
+
+    index: int = Field(description="Position of the item in the request")
+    new_hire_id: str | None = Field(default=None, description="New hire ID, when known")
+    status: OnboardingStatus | None = Field(default=None, description="Status on success")
+    error: str | None = Field(default=None, description="Error message on failure")
+
+
+class BatchResult(BaseModel):
+    """Per-item results of a batch tool call."""
+
+    results: list[BatchItemResult] = Field(description="One result per requested item, in order")
+    succeeded: int = Field(description="Number of items that succeeded")
+    failed: int = Field(description="Number of items that failed")
+
+
+class OnboardingSummary(BaseModel):
+    """Summary of one onboarding, as returned by listings."""
+
+    new_hire_id: str = Field(description="Unique identifier for the new hire")
+    new_hire_name: str = Field(description="New hire name")
+    role: str = Field(default="", description="Job role")
+    department: str = Field(default="", description="Department")
+    manager_id: str = Field(default="", description="Manager ID")
+    start_date: str = Field(description="Start date")
+    current_phase: str = Field(description="Current onboarding phase")
+
+
+class OnboardingPage(BaseModel):
+    """One page of onboarding summaries."""
+
+    items: list[OnboardingSummary] = Field(description="Hires on this page, by start date")
+    next_cursor: str | None = Field(
+        default=None, description="Pass to the next call to continue; null on the last page"
+    )
+
+
+class SearchHit(OnboardingSummary):
+    """One search match."""
+
+    score: float = Field(description="Relevance; whole-word and name matches score highest")
+
+
+class SearchResults(BaseModel):
+    """Hires matching a search, best first."""
+
+    query: str = Field(description="The query as given")
+    items: list[SearchHit] = Field(description="Best matches first")
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+# Largest list accepted by the batch tools
+MAX_BATCH_SIZE = 100
+
+# Graph runs executed in parallel within one batch call
+BATCH_CONCURRENCY = int(os.environ.get("MCP_BATCH_CONCURRENCY", "8"))
+
+# Shared pool for blocking graph and storage work, across all clients
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("MCP_MAX_WORKERS", "8")), thread_name_prefix="mcp-worker"
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def _offload(function: Callable[..., R], *args: Any) -> R:
+    """Run blocking work on the shared executor, keeping the request context."""
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_executor, lambda: context.run(function, *args))
+
+
+class RenderedResourceCache:
+    """
+    Bounded LRU cache of rendered onboarding resource documents.
+
+    Entries are keyed by hire ID and hold the store version they were rendered
+    from (the document's ``_etag``, else its ``_lsn``); a read with a different
+    version re-renders and replaces the entry. States without either are
+    rendered on every read. Only the days-until-start line depends
+    on the current date, so it is filled in on every read.
+    """
+
+    def __init__(self, max_entries: int):
+        """Keep at most ``max_entries`` rendered documents."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, str, datetime, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def version(state: dict[str, Any]) -> str | None:
+        """Store version of a state, or None if it carries none."""
+        if state.get("_etag"):
+            return state["_etag"]
+        return str(state["_lsn"]) if state.get("_lsn") is not None else None
+
+    def render(self, state: dict[str, Any]) -> str:
+        """Return the resource document for ``state``, rendering it on a miss."""
+        new_hire_id = state["new_hire_id"]
+        version = self.version(state)
+
+        with self._lock:
+            entry = self._entries.get(new_hire_id)
+            if entry is not None and version is not None and entry[0] == version:
+                self._entries.move_to_end(new_hire_id)
+                self.hits += 1
+            else:
+                self.misses += 1
+                parts = self._render_parts(state)
+                entry = (version, *parts)
+                if version is not None and self.max_entries > 0:
+                    self._entries[new_hire_id] = (version, *parts)
+                    self._entries.move_to_end(new_hire_id)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+        _, head, start, tail = entry
+        return f"{head}{(start - datetime.now()).days}{tail}"
+
+    @staticmethod
+    def _render_parts(state: dict[str, Any]) -> tuple[str, datetime, str]:
+        """Render the document around the days-until-start value."""
+        start = datetime.strptime(state['start_date'], "%Y-%m-%d")
+        head = f"""
+# Onboarding Status for {state['new_hire_name']}
+
+**ID**: {state['new_hire_id']}
+**Email**: {state['email']}
+**Role**: {state['role']}
+**Department**: {state['department']}
+**Start Date**: {state['start_date']}
+**Days Until Start**: """
+        tail = f"""
+**Current Phase**: {state['current_phase']}
+
+## Completed Tasks ({len(state['completed_tasks'])})
+{chr(10).join(f'✓ {task}' for task in state['completed_tasks'])}
+
+## Pending Tasks ({len(state['pending_tasks'])})
+{chr(10).join(f'⏳ {task}' for task in state['pending_tasks'])}
+
+## Manager ID
+{state.get('manager_id', 'Not assigned')}
+
+## Total Tasks
+{len(state.get('tasks', []))} tasks defined
+"""
+        return head, start, tail
+
+
+_resource_cache = RenderedResourceCache(int(os.environ.get("MCP_RESOURCE_CACHE_SIZE", "1024")))
+
+
+
+def _to_status(state: dict[str, Any]) -> OnboardingStatus:
+    """Build the OnboardingStatus returned by every status-producing tool."""
+    days_until_start = (datetime.strptime(state["start_date"], "%Y-%m-%d") - datetime.now()).days
+
+    return OnboardingStatus(
+        new_hire_id=state["new_hire_id"],
+        new_hire_name=state["new_hire_name"],
+        email=state["email"],
+        role=state["role"],
+        department=state["department"],
+        start_date=state["start_date"],
+        current_phase=state["current_phase"],
+        completed_tasks=state["completed_tasks"],
+        pending_tasks=state["pending_tasks"],
+        task_count=len(state.get("tasks", [])),
+        days_until_start=days_until_start,
+    )
+
+
+def _initial_state(input_data: NewHireInput, new_hire_id: str) -> dict[str, Any]:
+    """Create the initial OnboardingState for a new hire."""
+    # Validate the start date up front rather than inside the graph
+    datetime.strptime(input_data.start_date, "%Y-%m-%d")
+    now = datetime.now().isoformat()
+
+    return {
+        "new_hire_id": new_hire_id,
+        "new_hire_name": input_data.name,
+        "email": input_data.email or f"{input_data.name.lower().replace(' ', '.')}@company.com",
+        "role": input_data.role,
+        "department": "Engineering",  # Default, can be made configurable
+        "start_date": input_data.start_date,
+        "manager_id": input_data.manager,
+        "current_phase": "pre_onboarding",
+        "tasks": [],
+        "completed_tasks": [],
+        "pending_tasks": [],
+        "messages": [],
+        "created_at": now,
+        "updated_at": now,
+        "errors": [],
+    }
+
+
+def _new_hire_id() -> str:
+    """New hire ID from the creation time plus a random suffix, unique within a second."""
+    return f"NH-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def _run_graph(state: dict[str, Any]) -> dict[str, Any]:
+    """Run the module-level compiled onboarding graph."""
+    # Import here to avoid circular dependencies
+    from agents.graph import onboarding_graph
+
+    return onboarding_graph.invoke(state)
+
+
+def _save_created(state: dict[str, Any], result: dict[str, Any]) -> OnboardingStatus:
+    """
+    Persist a new hire the way the HTTP API does and build the status.
+
+    Goes through ``integrations.persistence.persist_created``, so the hire gets its outbox
+    notifications, phase timer, task ledger entries and search entry.
+    """
+    from agents.state import OnboardingState
+    from integrations.persistence import persist_created, serialize_state
+
+    serialized = serialize_state(cast(OnboardingState, result))
+    return _to_status(persist_created(cast(OnboardingState, state), serialized))
+
+
+def _save_advanced(state: dict[str, Any], result: dict[str, Any]) -> OnboardingStatus:
+    """Persist a re-run hire the way the HTTP API does and build the status."""
+    from agents.state import OnboardingState
+    from integrations.persistence import persist_advanced, serialize_state
+
+    serialized = serialize_state(cast(OnboardingState, result))
+    return _to_status(persist_advanced(cast(OnboardingState, state), serialized))
+
+
+def _create(item: tuple[NewHireInput, str]) -> OnboardingStatus:
+    """Run and persist one new hire of a batch."""
+    state = _initial_state(*item)
+    return _save_created(state, _run_graph(state))
+
+
+def _advance(new_hire_id: str) -> OnboardingStatus:
+    """Re-run and persist one stored hire of a batch."""
+    state = _load_state(new_hire_id)
+    return _save_advanced(state, _run_graph(state))
+
+
+async def _stream_graph(state: dict[str, Any], ctx: Context | None) -> dict[str, Any]:
+    """
+    Run the onboarding graph, reporting each superstep as MCP progress.
+
+    The graph is streamed on a worker thread. If the tool call is cancelled,
+    the stream is closed before the next superstep starts, so no further agent
+    work is done for an abandoned request.
+    """
+    from agents.graph import onboarding_graph
+
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+
+    def report(step: int, message: str) -> None:
+        if ctx is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(
+                ctx.report_progress(step, None, message), loop
+            ).result(timeout=5)
+        except Exception:
+            logger.warning("Could not report progress", exc_info=True)
+
+    def run() -> dict[str, Any]:
+        final = state
+        step = 0
+        # stream() is a generator; closing it stops the run between supersteps
+        steps = cast(
+            Generator[tuple[str, Any], None, None],
+            onboarding_graph.stream(state, stream_mode=["updates", "values"]),
+        )
+        try:
+            for mode, chunk in steps:
+                if cancelled.is_set():
+                    logger.info(f"Graph run for {state['new_hire_id']} cancelled after {step} steps")
+                    break
+                if mode == "values":
+                    final = chunk
+                else:
+                    step += 1
+                    report(step, f"Step {step}: {', '.join(chunk)} finished")
+        finally:
+            steps.close()
+        return final
+
+    # Run in a copy of the request context so progress reports find their request
+    future = loop.run_in_executor(_executor, contextvars.copy_context().run, run)
+    try:
+        return await future
+    except asyncio.CancelledError:
+        cancelled.set()
+        raise
+
+
+def _load_state(new_hire_id: str) -> dict[str, Any]:
+    """Load an onboarding state from the store, raising ValueError when it does not exist."""
+    from integrations.store import get_onboarding_store
+
+    state = get_onboarding_store().get_state(new_hire_id)
+
+    if state is None:
+        raise ValueError(f"Onboarding not found for ID: {new_hire_id}")
+    return state
+
+
+# Concurrent reads of the same hire share one storage fetch
+_state_reads = SingleFlight()
+
+
+async def _read_state(new_hire_id: str) -> dict[str, Any]:
+    """Load a state for read-only use, coalescing concurrent reads of one hire."""
+    return await _state_reads.do_async(new_hire_id, lambda: _offload(_load_state, new_hire_id))
+
+
+async def _run_batch(
+    items: list[T], operation: Callable[[T], OnboardingStatus], ids: Sequence[str | None]
+) -> BatchResult:
+    """
+    Apply ``operation`` to every item with bounded concurrency.
+
+    Failures are captured per item so one bad hire does not fail the batch.
+
+    Args:
+        items: Batch inputs
+        operation: Produces the status for one item (blocking; run on the executor)
+        ids: New hire ID for each item, if known before running
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch of {len(items)} exceeds the limit of {MAX_BATCH_SIZE}")
+
+    slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_one(index: int) -> BatchItemResult:
+        async with slots:
+            try:
+                status = await _offload(operation, items[index])
+                return BatchItemResult(index=index, new_hire_id=status.new_hire_id, status=status)
+            except Exception as e:
+                logger.exception(f"Batch item {index} failed")
+                return BatchItemResult(index=index, new_hire_id=ids[index], error=str(e))
+
+    results = list(await asyncio.gather(*(run_one(i) for i in range(len(items)))))
+
+    failed = sum(1 for result in results if result.error is not None)
+    return BatchResult(results=results, succeeded=len(results) - failed, failed=failed)
+
+
+class ClientConcurrencyMiddleware(Middleware):
+    """Limits in-flight tool calls and resource reads per MCP client."""
+
+    def __init__(self, limit: int):
+        """Allow at most ``limit`` concurrent requests per client; extra requests wait."""
+        self.limit = limit
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self._users: dict[str, int] = {}
+
+    @staticmethod
+    def client_key(context: MiddlewareContext[Any]) -> str:
+        """Identify the client by its client ID, falling back to the session."""
+        ctx = context.fastmcp_context
+        if ctx is None:
+            return "anonymous"
+        try:
+            return ctx.client_id or ctx.session_id
+        except RuntimeError:
+            return "anonymous"
+
+    async def _limited(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        key = self.client_key(context)
+        slots = self._slots.setdefault(key, asyncio.Semaphore(self.limit))
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            async with slots:
+                return await call_next(context)
+        finally:
+            self._users[key] -= 1
+            if self._users[key] == 0:
+                # Forget idle clients so long-running servers do not accumulate them
+                del self._users[key]
+                del self._slots[key]
+
+    async def on_call_tool(self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]) -> Any:
+        return await self._limited(context, call_next)
+
+    async def on_read_resource(
+        self, context: MiddlewareContext[Any], call_next: CallNext[Any, Any]
+    ) -> Any:
+        return await self._limited(context, call_next)
+
+
+mcp.add_middleware(
+    ClientConcurrencyMiddleware(int(os.environ.get("MCP_CLIENT_CONCURRENCY", "4")))
+)
+
+
+def _list_page(
+    phase: str | None = None,
+    department: str | None = None,
+    manager_id: str | None = None,
+    start_from: str | None = None,
+    start_to: str | None = None,
+    page_size: int = 50,
+    cursor: str | None = None,
+) -> OnboardingPage:
+    """Read one page of hires from the onboarding store."""
+    from integrations.queries import StateFilters
+    from integrations.store import get_onboarding_store
+
+    filters = StateFilters(phase, department, manager_id, start_from, start_to)
+    result = get_onboarding_store().list_states_page(filters, page_size, cursor)
+
+    return OnboardingPage(
+        items=[OnboardingSummary(**item) for item in result.items],
+        next_cursor=result.continuation,
+    )
+
+
 # ============================================================================
 # MCP TOOLS
 # ============================================================================
 
 
 @mcp.tool()
-def create_onboarding(input_data: NewHireInput) -> OnboardingStatus:
+async def create_onboarding(
+    input_data: NewHireInput, ctx: Context | None = None
+) -> OnboardingStatus:
     """
     Create a new employee onboarding workflow.
 
     This tool initiates the multi-agent onboarding process for a new hire.
     The coordinator agent determines the appropriate phase, and specialist
-    agents (IT, HR, Manager, Training) execute tasks autonomously.
+    agents (IT, HR, Manager, Training) execute tasks autonomously. Each
+    completed graph step is reported as a progress notification, and the
+    result is saved like a hire created through the HTTP API.
 
     Args:
         input_data: New hire information including name, role, start date, etc.
+        ctx: MCP request context, injected by FastMCP
 
     Returns:
         OnboardingStatus with phase, completed tasks, and pending tasks
     """
     try:
-        # Import here to avoid circular dependencies
-        from agents.state import OnboardingState
-        from agents.graph import build_onboarding_graph
-
-        # Calculate days until start
-        start_date_obj = datetime.strptime(input_data.start_date, "%Y-%m-%d")
-        today = datetime.now()
-        days_until_start = (start_date_obj - today).days
-
-        # Generate unique ID
-        new_hire_id = f"NH-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-
-        # Create initial state matching the OnboardingState TypedDict
-        from datetime import datetime as dt
-        
-        initial_state: OnboardingState = {
-            "new_hire_id": new_hire_id,
-            "new_hire_name": input_data.name,
-            "email": input_data.email or f"{input_data.name.lower().replace(' ', '.')}@company.com",
-            "role": input_data.role,
-            "department": "Engineering",  # Default, can be made configurable
-            "start_date": input_data.start_date,
-            "manager_id": input_data.manager,
-            "current_phase": "pre_onboarding",
-            "tasks": [],
-            "completed_tasks": [],
-            "pending_tasks": [],
-            "messages": [],
-            "created_at": dt.now().isoformat(),
-            "updated_at": dt.now().isoformat(),
-            "errors": [],
-        }
-
-        # Build and invoke the graph (already compiled)
-        graph = build_onboarding_graph()
-        result = graph.invoke(initial_state)
-
-        # Return structured output
-        days_until_start = (datetime.strptime(result["start_date"], "%Y-%m-%d") - datetime.now()).days
-        
-        return OnboardingStatus(
-            new_hire_id=result["new_hire_id"],
-            new_hire_name=result["new_hire_name"],
-            email=result["email"],
-            role=result["role"],
-            department=result["department"],
-            start_date=result["start_date"],
-            current_phase=result["current_phase"],
-            completed_tasks=result["completed_tasks"],
-            pending_tasks=result["pending_tasks"],
-            task_count=len(result.get("tasks", [])),
-            days_until_start=days_until_start,
-        )
+        state = _initial_state(input_data, _new_hire_id())
+        result = await _stream_graph(state, ctx)
+        return await _offload(_save_created, state, result)
 
     except Exception as e:
         logger.error(f"Error creating onboarding: {e}")
@@ -149,41 +552,18 @@ def create_onboarding(input_data: NewHireInput) -> OnboardingStatus:
 
 
 @mcp.tool()
-def get_onboarding_status(new_hire_id: str) -> OnboardingStatus:
+async def get_onboarding_status(new_hire_id: str) -> OnboardingStatus:
     """
     Get the current status of an onboarding workflow.
 
     Args:
-        new_hire_id: Unique identifier for the new hire (e.g., NH-20260122093000)
+        new_hire_id: Unique identifier for the new hire (e.g., NH-20260122093000-1a2b3c4d)
 
     Returns:
         OnboardingStatus with current phase and task status
     """
     try:
-        # Import database integration
-        from integrations.cosmos_db import get_onboarding_state
-
-        # Retrieve state from database
-        state = get_onboarding_state(new_hire_id)
-
-        if not state:
-            raise ValueError(f"Onboarding not found for ID: {new_hire_id}")
-
-        days_until_start = (datetime.strptime(state["start_date"], "%Y-%m-%d") - datetime.now()).days
-        
-        return OnboardingStatus(
-            new_hire_id=state["new_hire_id"],
-            new_hire_name=state["new_hire_name"],
-            email=state["email"],
-            role=state["role"],
-            department=state["department"],
-            start_date=state["start_date"],
-            current_phase=state["current_phase"],
-            completed_tasks=state["completed_tasks"],
-            pending_tasks=state["pending_tasks"],
-            task_count=len(state.get("tasks", [])),
-            days_until_start=days_until_start,
-        )
+        return _to_status(await _read_state(new_hire_id))
 
     except Exception as e:
         logger.error(f"Error getting status: {e}")
@@ -191,7 +571,7 @@ def get_onboarding_status(new_hire_id: str) -> OnboardingStatus:
 
 
 @mcp.tool()
-def list_tasks(new_hire_id: str) -> TaskList:
+async def list_tasks(new_hire_id: str) -> TaskList:
     """
     List all tasks for a specific onboarding workflow.
 
@@ -202,12 +582,7 @@ def list_tasks(new_hire_id: str) -> TaskList:
         TaskList with completed and pending tasks
     """
     try:
-        from integrations.cosmos_db import get_onboarding_state
-
-        state = get_onboarding_state(new_hire_id)
-
-        if not state:
-            raise ValueError(f"Onboarding not found for ID: {new_hire_id}")
+        state = await _read_state(new_hire_id)
 
         completed = state.get("tasks_completed", [])
         pending = state.get("tasks_pending", [])
@@ -224,7 +599,7 @@ def list_tasks(new_hire_id: str) -> TaskList:
 
 
 @mcp.tool()
-def get_phase_info(new_hire_id: str) -> PhaseInfo:
+async def get_phase_info(new_hire_id: str) -> PhaseInfo:
     """
     Get detailed information about the current onboarding phase.
 
@@ -235,12 +610,7 @@ def get_phase_info(new_hire_id: str) -> PhaseInfo:
         PhaseInfo with current phase and description
     """
     try:
-        from integrations.cosmos_db import get_onboarding_state
-
-        state = get_onboarding_state(new_hire_id)
-
-        if not state:
-            raise ValueError(f"Onboarding not found for ID: {new_hire_id}")
+        state = await _read_state(new_hire_id)
 
         phase = state.get("current_phase", "unknown")
         
@@ -266,51 +636,146 @@ def get_phase_info(new_hire_id: str) -> PhaseInfo:
 
 
 @mcp.tool()
-def advance_phase(new_hire_id: str) -> OnboardingStatus:
+async def advance_phase(new_hire_id: str, ctx: Context | None = None) -> OnboardingStatus:
     """
     Manually advance the onboarding to the next phase.
 
     This tool triggers the coordinator agent to re-evaluate the phase
-    and execute the next set of tasks.
+    and execute the next set of tasks, reporting each completed graph step
+    as a progress notification, then saves the updated state.
 
     Args:
         new_hire_id: Unique identifier for the new hire
+        ctx: MCP request context, injected by FastMCP
 
     Returns:
         Updated OnboardingStatus
     """
     try:
-        from integrations.cosmos_db import get_onboarding_state
-        from agents.graph import build_onboarding_graph
+        # Re-run the graph with current state
+        state = await _offload(_load_state, new_hire_id)
+        result = await _stream_graph(state, ctx)
+        return await _offload(_save_advanced, state, result)
+
+    except Exception as e:
+        logger.error(f"Error advancing phase: {e}")
+        raise
 
-        # Get current state
-        state = get_onboarding_state(new_hire_id)
 
-        if not state:
-            raise ValueError(f"Onboarding not found for ID: {new_hire_id}")
+@mcp.tool()
+async def create_onboardings(hires: list[NewHireInput]) -> BatchResult:
+    """
+    Create onboarding workflows for many new hires in one call.
 
-        # Re-run the graph with current state (already compiled)
-        graph = build_onboarding_graph()
-        result = graph.invoke(state)
+    Graph runs execute concurrently and each hire is saved as it finishes.
+    Each hire gets its own result, so a failure for one hire does not
+    prevent the others from being created.
 
-        days_until_start = (datetime.strptime(result["start_date"], "%Y-%m-%d") - datetime.now()).days
-        
-        return OnboardingStatus(
-            new_hire_id=result["new_hire_id"],
-            new_hire_name=result["new_hire_name"],
-            email=result["email"],
-            role=result["role"],
-            department=result["department"],
-            start_date=result["start_date"],
-            current_phase=result["current_phase"],
-            completed_tasks=result["completed_tasks"],
-            pending_tasks=result["pending_tasks"],
-            task_count=len(result.get("tasks", [])),
-            days_until_start=days_until_start,
+    Args:
+        hires: New hire information, at most 100 entries
+
+    Returns:
+        BatchResult with one status or error per hire, in request order
+    """
+    ids = [_new_hire_id() for _ in hires]
+    return await _run_batch(list(zip(hires, ids)), _create, ids)
+
+
+@mcp.tool()
+async def get_onboarding_statuses(new_hire_ids: list[str]) -> BatchResult:
+    """
+    Get the status of many onboarding workflows in one call.
+
+    Args:
+        new_hire_ids: New hire IDs, at most 100 entries
+
+    Returns:
+        BatchResult with one status or error per ID, in request order
+    """
+    return await _run_batch(
+        new_hire_ids,
+        lambda i: _to_status(_state_reads.do(i, lambda: _load_state(i))),
+        new_hire_ids,
+    )
+
+
+@mcp.tool()
+async def advance_phases(new_hire_ids: list[str]) -> BatchResult:
+    """
+    Advance many onboarding workflows in one call.
+
+    Each workflow is re-evaluated by the coordinator agent, with graph runs
+    executing concurrently, and saved as it finishes.
+
+    Args:
+        new_hire_ids: New hire IDs, at most 100 entries
+
+    Returns:
+        BatchResult with one updated status or error per ID, in request order
+    """
+    return await _run_batch(new_hire_ids, _advance, new_hire_ids)
+
+
+@mcp.tool()
+async def list_onboardings(
+    phase: str | None = None,
+    department: str | None = None,
+    manager_id: str | None = None,
+    start_from: str | None = None,
+    start_to: str | None = None,
+    page_size: int = 50,
+    cursor: str | None = None,
+) -> OnboardingPage:
+    """
+    List onboardings page by page, ordered by start date.
+
+    Call again with ``next_cursor`` until it is null to walk every match.
+
+    Args:
+        phase: Only hires in this phase
+        department: Only hires in this department
+        manager_id: Only hires reporting to this manager
+        start_from: Earliest start date (YYYY-MM-DD), inclusive
+        start_to: Latest start date (YYYY-MM-DD), inclusive
+        page_size: Hires per page, at most 100
+        cursor: next_cursor from the previous page
+
+    Returns:
+        OnboardingPage with summaries and the cursor for the next page
+    """
+    try:
+        return await _offload(
+            _list_page, phase, department, manager_id, start_from, start_to, page_size, cursor
         )
 
     except Exception as e:
-        logger.error(f"Error advancing phase: {e}")
+        logger.error(f"Error listing onboardings: {e}")
+        raise
+
+
+@mcp.tool()
+async def search_onboardings(query: str, limit: int = 10) -> SearchResults:
+    """
+    Find hires by name, role, department or manager ID.
+
+    Use this to get the ``new_hire_id`` other tools need when only a name is
+    known. Every word must match; partial words match as prefixes.
+
+    Args:
+        query: Free text, e.g. "Priya" or "priya eng"
+        limit: Most results to return, at most 100
+
+    Returns:
+        SearchResults with the best matches first
+    """
+    from integrations.search import get_onboarding_search
+
+    try:
+        hits = await _offload(get_onboarding_search().search, query, max(1, min(limit, 100)))
+        return SearchResults(query=query, items=[SearchHit(**hit) for hit in hits])
+
+    except Exception as e:
+        logger.error(f"Error searching onboardings: {e}")
         raise
 
 
@@ -320,7 +785,7 @@ def advance_phase(new_hire_id: str) -> OnboardingStatus:
 
 
 @mcp.resource("onboarding://{new_hire_id}")
-def get_onboarding_resource(new_hire_id: str) -> str:
+async def get_onboarding_resource(new_hire_id: str) -> str:
     """
     Get complete onboarding information as a resource.
 
@@ -328,43 +793,30 @@ def get_onboarding_resource(new_hire_id: str) -> str:
     workflow in a human-readable format.
     """
     try:
-        from integrations.cosmos_db import get_onboarding_state
-
-        state = get_onboarding_state(new_hire_id)
-
-        if not state:
-            return f"Onboarding not found for ID: {new_hire_id}"
-
-        # Format as readable text
-        days_until = (datetime.strptime(state['start_date'], "%Y-%m-%d") - datetime.now()).days
-        
-        return f"""
-# Onboarding Status for {state['new_hire_name']}
+        return _resource_cache.render(await _read_state(new_hire_id))
 
-**ID**: {state['new_hire_id']}
-**Email**: {state['email']}
-**Role**: {state['role']}
-**Department**: {state['department']}
-**Start Date**: {state['start_date']}
-**Days Until Start**: {days_until}
-**Current Phase**: {state['current_phase']}
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        logger.error(f"Error getting resource: {e}")
+        return f"Error: {str(e)}"
 
-## Completed Tasks ({len(state['completed_tasks'])})
-{chr(10).join(f'✓ {task}' for task in state['completed_tasks'])}
 
-## Pending Tasks ({len(state['pending_tasks'])})
-{chr(10).join(f'⏳ {task}' for task in state['pending_tasks'])}
+@mcp.resource("onboarding://list")
+async def list_onboardings_resource() -> str:
+    """
+    First page of all onboardings as JSON.
 
-## Manager ID
-{state.get('manager_id', 'Not assigned')}
+    Continue with ``onboarding://list/{cursor}`` using ``next_cursor``.
+    """
+    return (await _offload(_list_page)).model_dump_json(indent=2)
 
-## Total Tasks
-{len(state.get('tasks', []))} tasks defined
-"""
 
-    except Exception as e:
-        logger.error(f"Error getting resource: {e}")
-        return f"Error: {str(e)}"
+@mcp.resource("onboarding://list/{cursor}")
+async def list_onboardings_page_resource(cursor: str) -> str:
+    """Next page of all onboardings as JSON, continuing from ``cursor``."""
+    page = await _offload(lambda: _list_page(cursor=cursor))
+    return page.model_dump_json(indent=2)
 
 
 # ============================================================================
@@ -439,10 +891,23 @@ Provide a summary of the onboarding progress.
 # ============================================================================
 
 
+def main(argv: list[str] | None = None) -> None:
+    """Run the MCP server over stdio or streamable HTTP."""
+    parser = argparse.ArgumentParser(description="HR Onboarding MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "streamable-http"],
+        default=os.environ.get("MCP_TRANSPORT", "stdio"),
+    )
+    parser.add_argument("--host", default=os.environ.get("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("MCP_PORT", "8000")))
+    args = parser.parse_args(argv)
+
+    if args.transport == "stdio":
+        mcp.run()
+    else:
+        mcp.run(transport="streamable-http", host=args.host, port=args.port)
+
+
 if __name__ == "__main__":
-    # Run the MCP server
-    # For stdio transport (default):
-    mcp.run()
-    
-    # For HTTP transport (uncomment to use):
-    # mcp.run(transport="streamable-http")
+    main()
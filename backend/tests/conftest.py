@@ -12,3 +12,33 @@ def sample_state():
         "role": "Engineer",
         "start_date": "2026-02-01",
     }
+
+
+@pytest.fixture
+def make_state():
+    """Factory for complete onboarding states."""
+    from datetime import datetime
+
+    def _make_state(new_hire_id: str = "nh-001", **overrides):
+        now = datetime.now().isoformat()
+        state = {
+            "new_hire_id": new_hire_id,
+            "new_hire_name": "Test User",
+            "email": "test@example.com",
+            "role": "Engineer",
+            "department": "Engineering",
+            "start_date": "2026-02-01",
+            "manager_id": "mgr-001",
+            "current_phase": "pre_onboarding",
+            "tasks": [],
+            "completed_tasks": [],
+            "pending_tasks": [],
+            "messages": [],
+            "created_at": now,
+            "updated_at": now,
+            "errors": [],
+        }
+        state.update(overrides)
+        return state
+
+    return _make_state
@@ -0,0 +1,122 @@
+"""Tests for per-client admission control."""
+
+import pytest
+from backend.integrations.admission import (
+    READ,
+    WRITE,
+    AdmissionController,
+    Budget,
+    LocalBuckets,
+    client_identity,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+BUDGETS = {READ: Budget(rate=10, burst=3), WRITE: Budget(rate=0.5, burst=1)}
+
+
+def _controller(shared=None):
+    clock = FakeClock()
+    return AdmissionController(BUDGETS, shared, LocalBuckets(clock=clock), clock=clock), clock
+
+
+class TestAdmissionController:
+    """Tests for per-client, per-class budgets."""
+
+    def test_sheds_after_burst_with_retry_hint(self):
+        """Test a client is admitted up to its burst, then told when to retry."""
+        controller, clock = _controller()
+
+        assert [controller.check("ip:1", READ) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert controller.check("ip:1", READ) == pytest.approx(0.1)
+
+        clock.now += 0.1
+        assert controller.check("ip:1", READ) == 0.0
+
+    def test_clients_and_classes_are_independent(self):
+        """Test one client's writes do not spend its reads or another client's writes."""
+        controller, _ = _controller()
+
+        assert controller.check("ip:1", WRITE) == 0.0
+        assert controller.check("ip:1", WRITE) == pytest.approx(2.0)
+        assert controller.check("ip:1", READ) == 0.0
+        assert controller.check("ip:2", WRITE) == 0.0
+
+    def test_falls_back_to_local_buckets(self):
+        """Test a failing shared store is bypassed, then retried after the pause."""
+
+        class BrokenStore:
+            calls = 0
+
+            def try_acquire(self, key, budget):
+                self.calls += 1
+                raise ConnectionError("redis down")
+
+        shared = BrokenStore()
+        controller, clock = _controller(shared)
+
+        assert controller.check("ip:1", READ) == 0.0
+        assert controller.check("ip:1", READ) == 0.0
+        assert shared.calls == 1
+
+        clock.now += controller.retry_shared_after
+        controller.check("ip:1", READ)
+        assert shared.calls == 2
+
+    def test_local_buckets_are_bounded(self):
+        """Test the least recently seen clients are forgotten."""
+        buckets = LocalBuckets(max_clients=2, clock=FakeClock())
+        for key in ("a", "b", "a", "c"):
+            buckets.try_acquire(key, BUDGETS[READ])
+
+        assert list(buckets._buckets) == ["a", "c"]
+
+
+class TestClientIdentity:
+    """Tests for identifying callers."""
+
+    def test_function_key_is_hashed(self):
+        """Test function keys identify the client without being stored."""
+        identity = client_identity({"x-functions-key": "secret"})
+
+        assert identity.startswith("key:")
+        assert "secret" not in identity
+
+    def test_unvalidated_api_key_is_ignored(self):
+        """Test a caller-chosen x-api-key does not pick the bucket."""
+        identities = {
+            client_identity({"x-api-key": f"key-{i}", "x-forwarded-for": "203.0.113.7"})
+            for i in range(3)
+        }
+
+        assert identities == {"ip:203.0.113.7"}
+
+    def test_forwarded_ip(self):
+        """Test the address appended by the trusted proxy is used, without its port."""
+        assert client_identity({"x-forwarded-for": "10.0.0.1, 172.16.0.1:50312"}) == "ip:172.16.0.1"
+        assert client_identity({"x-forwarded-for": "10.0.0.1, 172.16.0.1, 10.9.9.9"}, 2) == (
+            "ip:172.16.0.1"
+        )
+        assert client_identity({"x-forwarded-for": "[2001:db8::1]:443"}) == "ip:2001:db8::1"
+        assert client_identity({"x-forwarded-for": "2001:db8::1"}) == "ip:2001:db8::1"
+        assert client_identity({"x-client-ip": "10.0.0.1:80"}) == "ip:10.0.0.1"
+
+    def test_spoofed_hops_do_not_change_identity(self):
+        """Test a client cannot pick its own bucket by sending X-Forwarded-For."""
+        honest = client_identity({"x-forwarded-for": "203.0.113.7:1111"})
+        spoofed = client_identity({"x-forwarded-for": "1.2.3.4, 203.0.113.7:2222"})
+
+        assert honest == spoofed == "ip:203.0.113.7"
+
+    def test_unidentified_callers_are_not_pooled(self):
+        """Test callers with no key or address get no shared bucket."""
+        assert client_identity({}) is None
@@ -6,6 +6,7 @@ from backend.agents.coordinator import (
     coordinator_agent,
     calculate_days_until_start,
     determine_phase,
+    next_phase_boundary,
     should_continue,
 )
 from backend.agents.state import OnboardingState
@@ -57,6 +58,28 @@ class TestDeterminePhase:
         assert determine_phase(-10) == "post_start"
 
 
+class TestNextPhaseBoundary:
+    """Tests for next_phase_boundary function."""
+
+    def test_boundaries_match_determine_phase(self):
+        """Test that the phase changes exactly on each boundary date."""
+        start = datetime(2026, 3, 1).date()
+        today = start - timedelta(days=30)
+        phases = []
+        while (boundary := next_phase_boundary("2026-03-01", today)) is not None:
+            assert determine_phase((start - boundary).days) != determine_phase(
+                (start - boundary).days + 1
+            )
+            phases.append(determine_phase((start - boundary).days))
+            today = boundary
+
+        assert phases == ["active_preparation", "immediate_prep", "post_start"]
+
+    def test_none_after_start(self):
+        """Test that post-start hires have no further boundary."""
+        assert next_phase_boundary("2026-03-01", datetime(2026, 3, 2).date()) is None
+
+
 class TestCoordinatorAgent:
     """Tests for coordinator_agent function."""
     
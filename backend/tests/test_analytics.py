@@ -0,0 +1,137 @@
+"""Tests for the columnar analytics export."""
+
+import csv
+
+import pytest
+from backend.integrations.analytics import (
+    CSV,
+    TASK_COLUMNS,
+    CompletionReport,
+    export_tasks,
+    task_rows,
+)
+from backend.integrations.local_store import InMemoryOnboardingStore
+
+
+def _task(task_id, category, status="completed", completed_at="2026-01-01T12:00:00"):
+    return {
+        "id": task_id,
+        "name": task_id,
+        "category": category,
+        "status": status,
+        "assigned_to": None,
+        "due_date": "2026-02-01",
+        "completed_at": completed_at if status == "completed" else None,
+        "notes": "",
+    }
+
+
+@pytest.fixture
+def store(make_state):
+    """Three hires with IT and HR tasks completed at different times."""
+    store = InMemoryOnboardingStore()
+    for i, hours in enumerate((6, 12, 24)):
+        store.create_state(
+            make_state(
+                f"nh-{i}",
+                department="Engineering" if i < 2 else "Sales",
+                created_at="2026-01-01T00:00:00",
+                tasks=[
+                    _task(
+                        "it-001",
+                        "it",
+                        completed_at=f"2026-01-0{1 + hours // 24}T{hours % 24:02d}:00:00",
+                    ),
+                    _task("hr-001", "hr", status="pending"),
+                ],
+            )
+        )
+    store.save_timer(
+        {
+            "id": "timer-nh-0",
+            "partitionKey": "nh-0",
+            "type": "timer",
+            "due_at": "2026-02-01",
+            "status": "pending",
+        }
+    )
+    return store
+
+
+class TestTaskRows:
+    """Tests for flattening documents."""
+
+    def test_one_row_per_task(self, make_state):
+        """Test each task becomes a row carrying hire columns and completion time."""
+        state = make_state(
+            "nh-1",
+            created_at="2026-01-01T00:00:00",
+            tasks=[_task("it-001", "it"), _task("hr-001", "hr", status="pending")],
+        )
+
+        rows = list(task_rows(state))
+
+        assert [r["task_id"] for r in rows] == ["it-001", "hr-001"]
+        assert set(rows[0]) == set(TASK_COLUMNS)
+        assert rows[0]["completion_hours"] == 12.0
+        assert rows[1]["completion_hours"] is None
+
+
+class TestExport:
+    """Tests for streaming the store to files."""
+
+    def test_csv_export_is_chunked(self, store, tmp_path):
+        """Test rows stream into bounded CSV files, skipping auxiliary documents."""
+        result = export_tasks(store, str(tmp_path), file_format=CSV, page_size=2, rows_per_file=4)
+
+        assert (result.hires, result.rows) == (3, 6)
+        assert [p.rsplit("/", 1)[1] for p in result.files] == ["tasks-00000.csv", "tasks-00001.csv"]
+        rows = []
+        for path in result.files:
+            with open(path, newline="") as handle:
+                rows.extend(csv.DictReader(handle))
+        assert len(rows) == 6
+        assert {r["new_hire_id"] for r in rows} == {"nh-0", "nh-1", "nh-2"}
+
+    def test_parquet_export(self, store, tmp_path):
+        """Test the Parquet writer produces one typed table."""
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        result = export_tasks(store, str(tmp_path), file_format="parquet", rows_per_file=4)
+
+        table = pq.read_table(result.files[0])
+        assert table.num_rows == 6
+        assert table.column_names == list(TASK_COLUMNS)
+
+    def test_unknown_format(self, store, tmp_path):
+        """Test an unsupported format is rejected."""
+        with pytest.raises(ValueError):
+            export_tasks(store, str(tmp_path), file_format="xlsx")
+
+
+class TestCompletionReport:
+    """Tests for completion-time percentiles."""
+
+    def test_collects_completed_tasks_only(self, store, tmp_path):
+        """Test only completed tasks with a known completion time are counted."""
+        report = CompletionReport(by=("department", "category"))
+        export_tasks(store, str(tmp_path), file_format=CSV, reports=[report])
+
+        assert {key: len(values) for key, values in report._hours.items()} == {
+            ("Engineering", "it"): 2,
+            ("Sales", "it"): 1,
+        }
+
+    def test_percentiles(self, store, tmp_path):
+        """Test percentiles per category are computed with numpy."""
+        pytest.importorskip("numpy")
+        report = CompletionReport()
+        export_tasks(store, str(tmp_path), file_format=CSV, reports=[report])
+
+        (it,) = report.percentiles(q=(50, 100))
+
+        assert it["category"] == "it"
+        assert it["count"] == 3
+        assert it["p50_hours"] == 12.0
+        assert it["p100_hours"] == 24.0
+        assert it["mean_hours"] == 14.0
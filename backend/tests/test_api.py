@@ -179,17 +179,19 @@ class TestCreateOnboardingEndpoint:
 class TestGetOnboardingEndpoint:
     """Tests for get onboarding endpoint."""
     
-    def test_returns_not_implemented(self):
-        """Test that GET endpoint returns 501 (not implemented yet)."""
+    @patch('backend.function_app.get_onboarding_store')
+    def test_returns_404_for_unknown_hire(self, mock_get_store):
+        """Test that GET endpoint returns 404 when the hire is not stored."""
+        mock_get_store.return_value.get_state.return_value = None
         mock_req = Mock(spec=func.HttpRequest)
         mock_req.method = "GET"
         mock_req.route_params = {"id": "nh-001"}
         
         response = get_onboarding(mock_req)
         
-        assert response.status_code == 501
+        assert response.status_code == 404
         body = json.loads(response.get_body())
-        assert "Not implemented" in body["error"]
+        assert "not found" in body["error"]
 
 
 class TestAPIIntegration:
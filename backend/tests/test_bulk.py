@@ -0,0 +1,39 @@
+"""Tests for partitioned bulk execution."""
+
+from backend.integrations.bulk import MAX_BATCH_OPERATIONS, BulkItemResult, run_partitioned
+
+
+class TestRunPartitioned:
+    """Tests for grouping, chunking and failure isolation."""
+
+    def test_groups_by_partition_and_chunks(self):
+        """Test documents are grouped per partition and chunked to the batch limit."""
+        documents = [{"id": f"d{i}", "partitionKey": "p1" if i < 150 else "p2"} for i in range(160)]
+        calls = []
+
+        def write_partition(partition_key, chunk):
+            calls.append((partition_key, len(chunk)))
+            return [BulkItemResult(d["id"], 201) for d in chunk]
+
+        results = run_partitioned(documents, write_partition, max_concurrency=2)
+
+        assert sorted(calls) == [("p1", 50), ("p1", MAX_BATCH_OPERATIONS), ("p2", 10)]
+        assert [r.id for r in results] == [d["id"] for d in documents]
+
+    def test_exception_fails_only_its_chunk(self):
+        """Test that a raising writer marks only its own items as failed."""
+        documents = [{"id": "a", "partitionKey": "a"}, {"id": "b", "partitionKey": "b"}]
+
+        class Conflict(Exception):
+            status_code = 409
+
+        def write_partition(partition_key, chunk):
+            if partition_key == "b":
+                raise Conflict("exists")
+            return [BulkItemResult(d["id"], 201) for d in chunk]
+
+        results = run_partitioned(documents, write_partition)
+
+        assert results[0].ok
+        assert results[1].status_code == 409
+        assert results[1].error == "exists"
@@ -0,0 +1,73 @@
+"""Tests for Accept-Encoding negotiation and response compression."""
+
+import gzip
+import json
+
+import pytest
+from backend.integrations import compression
+from backend.integrations.compression import GZIP, ResponseCompressor, negotiate
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    """Behave as if the optional brotli package were not installed."""
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+class TestNegotiate:
+    """Tests for choosing an encoding."""
+
+    def test_gzip_accepted(self, gzip_only):
+        """Test gzip is chosen when listed, ignoring case and whitespace."""
+        assert negotiate("deflate, GZIP") == GZIP
+        assert negotiate("gzip;q=0.5") == GZIP
+
+    def test_refused_or_absent(self, gzip_only):
+        """Test q=0, identity-only and missing headers leave the body uncompressed."""
+        assert negotiate(None) is None
+        assert negotiate("") is None
+        assert negotiate("identity") is None
+        assert negotiate("gzip;q=0") is None
+        assert negotiate("*, gzip;q=0") is None
+
+    def test_wildcard(self, gzip_only):
+        """Test ``*`` covers encodings the client did not name."""
+        assert negotiate("*") == GZIP
+        assert negotiate("deflate, *;q=0.1") == GZIP
+
+    def test_brotli_preferred_when_available(self, monkeypatch):
+        """Test brotli wins ties, but a higher q for gzip is respected."""
+        monkeypatch.setattr(compression, "brotli", object())
+
+        assert negotiate("gzip, br") == "br"
+        assert negotiate("gzip, br;q=0.5") == GZIP
+
+
+class TestResponseCompressor:
+    """Tests for compressing response bodies."""
+
+    def test_small_bodies_sent_as_is(self, gzip_only):
+        """Test bodies under the threshold are not compressed."""
+        body = b'{"error": "Onboarding not found"}'
+
+        assert ResponseCompressor(min_bytes=1024).compress(body, "gzip") == (body, None)
+
+    def test_large_bodies_round_trip(self, gzip_only):
+        """Test large bodies are gzipped deterministically and decompress intact."""
+        body = json.dumps(
+            {"messages": [f"[IT Agent] Completed task {i}" for i in range(200)]}, indent=2
+        ).encode()
+        compressor = ResponseCompressor(min_bytes=1024)
+
+        compressed, encoding = compressor.compress(body, "gzip, deflate")
+
+        assert encoding == GZIP
+        assert len(compressed) < len(body) / 4
+        assert gzip.decompress(compressed) == body
+        assert compressor.compress(body, "gzip")[0] == compressed
+
+    def test_client_without_gzip(self, gzip_only):
+        """Test large bodies pass through when the client accepts no supported encoding."""
+        body = b"x" * 4096
+
+        assert ResponseCompressor().compress(body, "deflate") == (body, None)
@@ -1,7 +1,9 @@
 """Tests for Cosmos DB integration."""
 
+import base64
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from backend.integrations.cosmos import OnboardingCosmosClient, get_cosmos_client
 from backend.agents.state import OnboardingState
 from datetime import datetime
@@ -23,8 +25,22 @@ class TestOnboardingCosmosClient:
         
         mock_cosmos_client.assert_called_once_with(
             'https://test.documents.azure.com:443/',
-            'test-key'
+            'test-key',
+            connection_policy=ANY
         )
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_sdk_throttle_retries_disabled(self, mock_cosmos_client):
+        """Test that 429s are left to the adaptive rate limiter instead of the SDK."""
+        OnboardingCosmosClient()
+
+        retry_options = mock_cosmos_client.call_args.kwargs["connection_policy"].RetryOptions
+        assert retry_options.MaxRetryAttemptCount == 0
+        assert retry_options.MaxWaitTimeInSeconds == 0
     
     @patch.dict('os.environ', {}, clear=True)
     @patch('backend.integrations.cosmos.CosmosClient')
@@ -127,3 +143,400 @@ class TestGetCosmosClient:
         client2 = get_cosmos_client()
         
         assert client1 is client2
+
+
+class TestChangeFeed:
+    """Tests for change feed reads."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_read_change_feed_returns_continuation(self, mock_cosmos_client):
+        """Test reading one page of the change feed."""
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        mock_container.query_items_change_feed.return_value.by_page.return_value = iter(
+            [iter([{"id": "nh-001"}])]
+        )
+        mock_container.client_connection.last_response_headers = {"etag": '"42"'}
+
+        client = OnboardingCosmosClient()
+        items, continuation = client.read_change_feed(max_item_count=10)
+
+        assert items == [{"id": "nh-001"}]
+        assert continuation == '"42"'
+        mock_container.query_items_change_feed.assert_called_once_with(
+            start_time="Beginning",
+            max_item_count=10
+        )
+
+
+class TestTypedQueries:
+    """Tests for the secondary-index query methods."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_by_manager_reports_request_charge(self, mock_cosmos_client):
+        """Test parameterized query and summed request charge."""
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+
+        def query_items(**kwargs):
+            kwargs["response_hook"]({"x-ms-request-charge": "2.5"}, {})
+            kwargs["response_hook"]({"x-ms-request-charge": "1.5"}, {})
+            return iter([{"id": "nh-001"}])
+
+        mock_container.query_items.side_effect = query_items
+
+        client = OnboardingCosmosClient()
+        result = client.by_manager("mgr-001", limit=10)
+
+        assert result.items == [{"id": "nh-001"}]
+        assert result.request_charge == 4.0
+        kwargs = mock_container.query_items.call_args.kwargs
+        assert "c.manager_id = @value" in kwargs["query"]
+        assert {"name": "@value", "value": "mgr-001"} in kwargs["parameters"]
+
+
+class TestPagination:
+    """Tests for cursor-based listing."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_fetches_one_page_and_returns_continuation(self, mock_cosmos_client):
+        """Test that filters become parameters and only one page is read."""
+        from backend.integrations.queries import StateFilters
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        pager = MagicMock()
+        pager.__next__.return_value = iter([{"id": "nh-001"}])
+        pager.continuation_token = "token-2"
+        mock_container.query_items.return_value.by_page.return_value = pager
+
+        client = OnboardingCosmosClient()
+        result = client.list_states_page(
+            StateFilters(phase="pre_onboarding", start_from="2026-03-01"),
+            page_size=500,
+            continuation=base64.urlsafe_b64encode(b"token-1").decode(),
+        )
+
+        assert result.items == [{"id": "nh-001"}]
+        assert base64.urlsafe_b64decode(result.continuation) == b"token-2"
+        mock_container.query_items.return_value.by_page.assert_called_once_with("token-1")
+        kwargs = mock_container.query_items.call_args.kwargs
+        assert kwargs["max_item_count"] == 100
+        assert "c.current_phase = @phase" in kwargs["query"]
+        assert "c.start_date >= @start_from" in kwargs["query"]
+        assert "@department" not in kwargs["query"]
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_continuation_is_a_uri_path_segment(self, mock_cosmos_client):
+        """Test a JSON SDK token round-trips through a cursor without URI-reserved characters."""
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        sdk_token = '[{"token":"+RID:~a/b==#RT:1","range":{"min":"","max":"FF"}}]'
+        pager = MagicMock()
+        pager.__next__.return_value = iter([])
+        pager.continuation_token = sdk_token
+        mock_container.query_items.return_value.by_page.return_value = pager
+
+        client = OnboardingCosmosClient()
+        cursor = client.list_states_page().continuation
+        client.list_states_page(continuation=cursor)
+
+        assert not set(cursor) & set('/"{}?#')
+        mock_container.query_items.return_value.by_page.assert_called_with(sdk_token)
+
+
+class TestInstrumentation:
+    """Tests for per-operation metrics capture."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_records_latency_and_request_charge(self, mock_cosmos_client):
+        """Test that calls are timed and RU is read from response headers."""
+        from backend.integrations.cosmos_metrics import CosmosMetrics
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+
+        def read_item(**kwargs):
+            kwargs["response_hook"]({"x-ms-request-charge": "1.0"}, {})
+            return {"id": "nh-001"}
+
+        mock_container.read_item.side_effect = read_item
+
+        metrics = CosmosMetrics()
+        client = OnboardingCosmosClient(metrics=metrics)
+        client.get_state("nh-001")
+
+        series = metrics.snapshot()["series"]
+        assert series[0]["operation"] == "get_state"
+        assert series[0]["status"] == "ok"
+        assert series[0]["request_charge"] == 1.0
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_disabled_by_default(self, mock_cosmos_client):
+        """Test that instrumentation is off unless COSMOS_METRICS_ENABLED is set."""
+        client = OnboardingCosmosClient()
+
+        assert client.metrics is None
+
+
+class TestThrottling:
+    """Tests for 429 handling in the client."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_create_state_retries_on_429(self, mock_cosmos_client, make_state):
+        """Test that a throttled create is retried instead of failing."""
+        from azure.cosmos.exceptions import CosmosHttpResponseError
+        from backend.integrations.throttling import AdaptiveRateLimiter
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        throttled = CosmosHttpResponseError(status_code=429, message="Too many requests")
+        throttled.headers = {"x-ms-retry-after-ms": "1"}
+        mock_container.create_item.side_effect = [throttled, {"id": "nh-001"}]
+
+        limiter = AdaptiveRateLimiter(rate=100, sleep=lambda _seconds: None)
+        client = OnboardingCosmosClient(rate_limiter=limiter)
+        result = client.create_state(make_state("nh-001"))
+
+        assert result == {"id": "nh-001"}
+        assert mock_container.create_item.call_count == 2
+        assert limiter.rate < 100
+
+
+class TestBulkWrites:
+    """Tests for bulk create/upsert."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_create_states_bulk_isolates_failures(self, mock_cosmos_client, make_state):
+        """Test per-item results with one failed create."""
+        from azure.cosmos.exceptions import CosmosResourceExistsError
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+
+        def create_item(body, **kwargs):
+            if body["id"] == "nh-1":
+                raise CosmosResourceExistsError(status_code=409, message="Conflict")
+            return body
+
+        mock_container.create_item.side_effect = create_item
+
+        client = OnboardingCosmosClient()
+        results = client.create_states_bulk([make_state(f"nh-{i}") for i in range(3)])
+
+        assert [r.status_code for r in results] == [201, 409, 201]
+        assert mock_container.create_item.call_count == 3
+        mock_container.execute_item_batch.assert_not_called()
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_repeated_id_only_fails_the_repeat(self, mock_cosmos_client, make_state):
+        """Test a state repeated in the input does not fail the first copy."""
+        from azure.cosmos.exceptions import CosmosResourceExistsError
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        created = set()
+
+        def create_item(body, **kwargs):
+            if body["id"] in created:
+                raise CosmosResourceExistsError(status_code=409, message="Conflict")
+            created.add(body["id"])
+            return body
+
+        mock_container.create_item.side_effect = create_item
+
+        client = OnboardingCosmosClient()
+        results = client.create_states_bulk([make_state("nh-1"), make_state("nh-1")])
+
+        assert [r.status_code for r in results] == [201, 409]
+
+
+class TestOutbox:
+    """Tests for transactional outbox writes."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_state_and_outbox_share_one_batch(self, mock_cosmos_client, make_state):
+        """Test state upsert and new outbox messages go into one partition batch."""
+        from backend.integrations.outbox import onboarding_notifications
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        state = make_state("nh-001")
+        messages = onboarding_notifications(state)
+        mock_container.query_items.return_value = iter([{"id": messages[0]["id"]}])
+
+        client = OnboardingCosmosClient()
+        client.save_state_with_outbox(state, messages)
+
+        kwargs = mock_container.execute_item_batch.call_args.kwargs
+        assert kwargs["partition_key"] == "nh-001"
+        assert [op[0] for op in kwargs["batch_operations"]] == ["upsert", "create"]
+        assert kwargs["batch_operations"][1][1][0]["id"] == messages[1]["id"]
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_concurrently_enqueued_message_does_not_lose_state(
+        self, mock_cosmos_client, make_state
+    ):
+        """Test a message created by a racing save is dropped and the state still committed."""
+        from azure.cosmos.exceptions import CosmosBatchOperationError
+        from backend.integrations.outbox import onboarding_notifications
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        state = make_state("nh-001")
+        messages = onboarding_notifications(state)
+        mock_container.query_items.return_value = iter([])
+        mock_container.execute_item_batch.side_effect = [
+            CosmosBatchOperationError(
+                error_index=1, headers={}, status_code=409, message="Conflict",
+                operation_responses=[]
+            ),
+            [],
+        ]
+
+        client = OnboardingCosmosClient()
+        client.save_state_with_outbox(state, messages)
+
+        operations = mock_container.execute_item_batch.call_args.kwargs["batch_operations"]
+        assert [op[0] for op in operations] == ["upsert", "create"]
+        assert operations[0][1][0]["id"] == "nh-001"
+        assert operations[1][1][0]["id"] == messages[1]["id"]
+
+
+class TestPhaseTimers:
+    """Tests for phase timer persistence."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_due_timers_query_and_claim(self, mock_cosmos_client):
+        """Test due timers are read by due date and claimed with the etag."""
+        from azure.cosmos.exceptions import CosmosAccessConditionFailedError
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        timer = {"id": "timer-nh-001", "partitionKey": "nh-001", "_etag": "e1"}
+        mock_container.query_items.return_value = iter([timer])
+        mock_container.replace_item.side_effect = [
+            {**timer, "status": "firing"},
+            CosmosAccessConditionFailedError(),
+        ]
+
+        client = OnboardingCosmosClient()
+        due = client.list_due_timers("2026-02-15", "2026-02-15T09:00:00", 10)
+
+        kwargs = mock_container.query_items.call_args.kwargs
+        assert "ORDER BY c.due_at" in kwargs["query"]
+        assert {"name": "@due_by", "value": "2026-02-15"} in kwargs["parameters"]
+        assert client.claim_timer(due[0], "2026-02-15T09:05:00")["status"] == "firing"
+        assert client.claim_timer(due[0], "2026-02-15T09:05:00") is None
+        assert mock_container.replace_item.call_args.kwargs["etag"] == "e1"
+
+
+class TestTaskLedger:
+    """Tests for task event persistence."""
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_events_and_snapshot_share_one_batch(self, mock_cosmos_client):
+        """Test events are created with the snapshot upsert in the hire's partition."""
+        from azure.cosmos.exceptions import CosmosBatchOperationError
+
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        events = [{"id": f"task-event-nh-001-{i:010d}", "seq": i} for i in (1, 2)]
+        snapshot = {"id": "task-snapshot-nh-001", "seq": 2}
+
+        client = OnboardingCosmosClient()
+        client.append_task_events("nh-001", events, snapshot)
+
+        kwargs = mock_container.execute_item_batch.call_args.kwargs
+        assert kwargs["partition_key"] == "nh-001"
+        assert [op[0] for op in kwargs["batch_operations"]] == ["create", "create", "upsert"]
+
+        mock_container.execute_item_batch.side_effect = CosmosBatchOperationError(
+            error_index=0, headers={}, status_code=409, message="Conflict", operation_responses=[]
+        )
+        with pytest.raises(ValueError):
+            client.append_task_events("nh-001", events)
+
+    @patch.dict('os.environ', {
+        'COSMOS_ENDPOINT': 'https://test.documents.azure.com:443/',
+        'COSMOS_KEY': 'test-key'
+    })
+    @patch('backend.integrations.cosmos.CosmosClient')
+    def test_events_since_snapshot_query(self, mock_cosmos_client):
+        """Test replay reads only the events after the snapshot, in order."""
+        mock_container = MagicMock()
+        mock_cosmos_client.return_value.get_database_client.return_value \
+            .get_container_client.return_value = mock_container
+        mock_container.query_items.return_value = iter([{"seq": 51}])
+
+        client = OnboardingCosmosClient()
+        assert client.list_task_events("nh-001", after_seq=50) == [{"seq": 51}]
+
+        kwargs = mock_container.query_items.call_args.kwargs
+        assert "ORDER BY c.seq" in kwargs["query"]
+        assert kwargs["partition_key"] == "nh-001"
+        assert {"name": "@after_seq", "value": 50} in kwargs["parameters"]
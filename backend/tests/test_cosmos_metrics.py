@@ -0,0 +1,91 @@
+"""Tests for Cosmos DB operation metrics."""
+
+import logging
+from typing import ClassVar
+
+import pytest
+from backend.integrations import cosmos_metrics
+from backend.integrations.cosmos_metrics import CosmosMetrics, get_cosmos_metrics
+
+
+class _Throttled(Exception):
+    status_code = 429
+    headers: ClassVar[dict[str, str]] = {"x-ms-request-charge": "0.5"}
+
+
+class TestCosmosMetrics:
+    """Tests for histogram and RU recording."""
+
+    def test_record_buckets_latency(self):
+        """Test samples land in the right histogram bucket."""
+        metrics = CosmosMetrics(buckets_ms=(10, 100))
+        metrics.record("get_state", "ok", 5, 1.0)
+        metrics.record("get_state", "ok", 50, 1.0)
+        metrics.record("get_state", "ok", 500, 1.0)
+
+        series = metrics.snapshot()["series"][0]
+
+        assert series["buckets"] == [1, 1, 1]
+        assert series["count"] == 3
+        assert series["request_charge"] == 3.0
+
+    def test_measure_captures_request_charge(self):
+        """Test the response hook sums RU across pages."""
+        metrics = CosmosMetrics()
+
+        with metrics.measure("list_states") as measurement:
+            measurement.capture({"x-ms-request-charge": "2.5"})
+            measurement.capture({"x-ms-request-charge": "1.5"})
+
+        series = metrics.snapshot()["series"][0]
+        assert series["operation"] == "list_states"
+        assert series["status"] == "ok"
+        assert series["request_charge"] == 4.0
+
+    def test_measure_labels_failures_with_status_code(self):
+        """Test failed calls are recorded under their HTTP status."""
+        metrics = CosmosMetrics()
+
+        with pytest.raises(_Throttled), metrics.measure("create_state"):
+            raise _Throttled()
+
+        series = metrics.snapshot()["series"][0]
+        assert series["status"] == "429"
+        assert series["request_charge"] == 0.5
+
+    def test_quantile(self):
+        """Test bucket-based quantile estimate."""
+        metrics = CosmosMetrics(buckets_ms=(10, 100, 1000))
+        for latency in [1, 2, 3, 50, 500]:
+            metrics.record("get_state", "ok", latency)
+
+        assert metrics.quantile("get_state", 0.5) == 10.0
+        assert metrics.quantile("get_state", 0.99) == 1000.0
+        assert metrics.quantile("missing", 0.5) is None
+
+    def test_export_calls_exporters(self):
+        """Test exporters receive snapshots and failures are isolated."""
+        metrics = CosmosMetrics()
+        metrics.record("get_state", "ok", 1)
+        received = []
+
+        def broken(_snapshot):
+            raise RuntimeError("boom")
+
+        metrics.add_exporter(broken)
+        metrics.add_exporter(received.append)
+        metrics.export()
+
+        assert received[0]["series"][0]["operation"] == "get_state"
+
+    def test_singleton_exports_to_log(self, monkeypatch, caplog):
+        """Test the process-wide metrics are exported through the logging exporter."""
+        monkeypatch.setattr(cosmos_metrics, "_cosmos_metrics", None)
+        metrics = get_cosmos_metrics()
+        metrics.record("get_state", "ok", 1, 2.5)
+
+        with caplog.at_level(logging.INFO, logger=cosmos_metrics.__name__):
+            metrics.export()
+
+        assert "operation=get_state status=ok count=1" in caplog.text
+        assert "request_charge=2.5" in caplog.text
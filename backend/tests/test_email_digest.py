@@ -0,0 +1,156 @@
+"""Tests for manager digest coalescing."""
+
+import threading
+from unittest.mock import patch
+
+from backend.integrations.email import EmailService
+from backend.integrations.email_digest import (
+    ManagerDigestCoalescer,
+    PendingNotification,
+    digest_key,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestManagerDigestCoalescer:
+    """Tests for windowed, size-capped flushing."""
+
+    def test_flushes_one_digest_per_manager_after_window(self):
+        """Test that notifications are grouped by recipient."""
+        sent = []
+        clock = FakeClock()
+        coalescer = ManagerDigestCoalescer(
+            lambda manager, batch, window: sent.append((manager, batch)) or True,
+            window_seconds=10,
+            clock=clock,
+        )
+        for i in range(5):
+            coalescer.add("mgr-a@company.com", f"Hire {i}", "2026-03-01")
+        coalescer.add("mgr-b@company.com", "Hire 5", "2026-03-01")
+
+        assert coalescer.flush_due() == 0
+        clock.now = 10
+        assert coalescer.flush_due() == 2
+        coalescer.close()
+
+        assert sorted((m, len(b)) for m, b in sent) == [
+            ("mgr-a@company.com", 5),
+            ("mgr-b@company.com", 1),
+        ]
+
+    def test_size_cap_flushes_immediately(self):
+        """Test that reaching max_batch sends without waiting for the window."""
+        sent = []
+        coalescer = ManagerDigestCoalescer(
+            lambda manager, batch, window: sent.append(len(batch)) or True,
+            window_seconds=3600,
+            max_batch=3,
+        )
+        for i in range(7):
+            coalescer.add("mgr@company.com", f"Hire {i}", "2026-03-01")
+
+        assert sent == [3, 3]
+        assert coalescer.pending == 1
+        coalescer.close()
+        assert sent == [3, 3, 1]
+
+    def test_background_flusher_sends_after_window(self):
+        """Test that the flusher thread delivers without explicit flushing."""
+        delivered = threading.Event()
+        coalescer = ManagerDigestCoalescer(
+            lambda manager, batch, window: delivered.set() or True, window_seconds=0.05
+        )
+        coalescer.add("mgr@company.com", "Jane", "2026-03-01")
+
+        assert delivered.wait(2)
+        coalescer.close()
+
+    def test_closed_coalescer_rejects(self):
+        """Test that add returns False after close."""
+        coalescer = ManagerDigestCoalescer(lambda manager, batch, window: True)
+        coalescer.close()
+
+        assert coalescer.add("mgr@company.com", "Jane", "2026-03-01") is False
+
+    def test_digest_key_is_manager_and_window(self):
+        """Test that the digest key ignores membership."""
+        key = digest_key("mgr@company.com", "2026-03-01T09:00:00+00:00")
+
+        assert key == digest_key("mgr@company.com", "2026-03-01T09:00:00+00:00")
+        assert key != digest_key("mgr@company.com", "2026-03-01T09:05:00+00:00")
+        assert key != digest_key("other@company.com", "2026-03-01T09:00:00+00:00")
+
+    def test_each_flush_gets_its_own_window(self):
+        """Test that successive digests to one manager are keyed apart."""
+        windows = []
+        coalescer = ManagerDigestCoalescer(
+            lambda manager, batch, window: windows.append(window) or True,
+            window_seconds=3600,
+            max_batch=1,
+        )
+        coalescer.add("mgr@company.com", "Jane", "2026-03-01")
+        coalescer.add("mgr@company.com", "John", "2026-03-01")
+        coalescer.close()
+
+        assert len(windows) == 2 and all(windows)
+
+
+class TestEmailServiceDigest:
+    """Tests for digest delivery through EmailService."""
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false", "EMAIL_DIGEST_WINDOW_SECONDS": "3600"})
+    def test_manager_notifications_are_coalesced(self):
+        """Test that a cohort yields one email per manager."""
+        service = EmailService()
+
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            for i in range(5):
+                assert service.send_manager_notification(
+                    "mgr@company.com", f"Hire {i}", "2026-03-01"
+                )
+            assert mock_send.call_count == 0
+            service.shutdown()
+
+        assert mock_send.call_count == 1
+        message = mock_send.call_args[0][0]
+        assert message.subject == "New Team Members: 5 people joining your team"
+        assert "- Hire 4 (starting 2026-03-01)" in message.body
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_single_notification_digest_uses_regular_email(self):
+        """Test that a one-hire digest keeps the original notification."""
+        service = EmailService()
+
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            service.send_manager_digest(
+                "mgr@company.com", [PendingNotification("Jane", "2026-03-01")]
+            )
+
+        assert mock_send.call_args[0][0].subject == "New Team Member: Jane"
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_members_are_not_resent_when_membership_changes(self):
+        """Test that a retried digest with a new member only announces the new hire."""
+        service = EmailService()
+        jane = PendingNotification("Jane", "2026-03-01", "k-jane")
+        john = PendingNotification("John", "2026-03-01", "k-john")
+        ana = PendingNotification("Ana", "2026-03-01", "k-ana")
+
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            service.send_manager_digest("mgr@company.com", [jane, john], "2026-03-01T09:00:00")
+            service.send_manager_digest("mgr@company.com", [jane, john, ana], "2026-03-01T09:00:00")
+            service.send_manager_notification("mgr@company.com", "Jane", "2026-03-01", "k-jane")
+
+        assert [call[0][0].subject for call in mock_send.call_args_list] == [
+            "New Team Members: 2 people joining your team",
+            "New Team Member: Ana",
+        ]
@@ -0,0 +1,106 @@
+"""Tests for the asynchronous email dispatcher."""
+
+import threading
+import time
+from unittest.mock import patch
+
+from backend.integrations.email import EmailMessage, EmailService
+from backend.integrations.email_queue import EmailDispatcher
+
+
+def _message(i=0):
+    return EmailMessage(to=f"user{i}@example.com", subject="Hi", body="Hello")
+
+
+class TestEmailDispatcher:
+    """Tests for queueing, back-pressure and draining."""
+
+    def test_delivers_enqueued_messages(self):
+        """Test that workers deliver every accepted message."""
+        delivered = []
+        dispatcher = EmailDispatcher(send=lambda m: delivered.append(m) or True, workers=3)
+
+        for i in range(20):
+            assert dispatcher.submit(_message(i))
+
+        assert dispatcher.drain(timeout=5)
+        assert len(delivered) == 20
+        assert dispatcher.stats.sent == 20
+        dispatcher.shutdown()
+
+    def test_full_queue_pushes_back(self):
+        """Test that submit is rejected when the queue stays full."""
+        release = threading.Event()
+        dispatcher = EmailDispatcher(send=lambda m: release.wait(5), workers=1, max_queue_size=1)
+
+        assert dispatcher.submit(_message(0))
+        time.sleep(0.05)  # let the worker pick up the first message
+        assert dispatcher.submit(_message(1))
+        assert dispatcher.submit(_message(2), timeout=0.05) is False
+        assert dispatcher.stats.rejected == 1
+
+        release.set()
+        assert dispatcher.shutdown(timeout=5)
+
+    def test_failures_are_counted_not_raised(self):
+        """Test that a raising sender does not kill the worker."""
+
+        def send(message):
+            if message.to == "user0@example.com":
+                raise ConnectionError("smtp down")
+            return True
+
+        dispatcher = EmailDispatcher(send=send, workers=1)
+        dispatcher.submit(_message(0))
+        dispatcher.submit(_message(1))
+
+        assert dispatcher.drain(timeout=5)
+        assert dispatcher.stats.failed == 1
+        assert dispatcher.stats.sent == 1
+        dispatcher.shutdown()
+
+    def test_shutdown_drains_and_rejects_new_messages(self):
+        """Test graceful drain on shutdown."""
+        delivered = []
+
+        def slow_send(message):
+            time.sleep(0.01)
+            delivered.append(message)
+            return True
+
+        dispatcher = EmailDispatcher(send=slow_send, workers=2)
+        for i in range(10):
+            dispatcher.submit(_message(i))
+
+        assert dispatcher.shutdown(timeout=5)
+        assert len(delivered) == 10
+        assert dispatcher.submit(_message(99)) is False
+
+    def test_per_provider_rate_limit(self):
+        """Test that a provider's token bucket paces deliveries."""
+        dispatcher = EmailDispatcher(send=lambda m: True, workers=4, rate_limits={"smtp": 20})
+        dispatcher._buckets["smtp"].tokens = 0
+
+        start = time.monotonic()
+        for i in range(4):
+            dispatcher.submit(_message(i), provider="smtp")
+        dispatcher.drain(timeout=5)
+
+        assert time.monotonic() - start >= 0.15
+        dispatcher.shutdown()
+
+
+class TestEmailServiceQueueing:
+    """Tests for EmailService integration."""
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false", "EMAIL_ASYNC": "true"})
+    def test_send_methods_enqueue(self):
+        """Test that send_* returns once the message is queued."""
+        service = EmailService()
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            service.dispatcher.send = mock_send
+
+            assert service.send_welcome_email("Jane", "jane@example.com", "2026-03-01")
+            assert service.shutdown(timeout=5)
+
+        mock_send.assert_called_once()
@@ -0,0 +1,155 @@
+"""Tests for the cached email template subsystem."""
+
+import os
+
+from backend.integrations.email import EmailService
+from backend.integrations.email_templates import CompiledTemplate, EmailTemplates
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write(root, relative, content):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _template_dir(tmp_path):
+    _write(tmp_path, "default/greeting.subject", "Hello {name}\n")
+    _write(tmp_path, "default/greeting.txt", "Hi {name}\n")
+    _write(tmp_path, "default/greeting.html", "<p>Hi {name}</p>\n")
+    return tmp_path
+
+
+class TestCompiledTemplate:
+    """Tests for template compilation and rendering."""
+
+    def test_renders_fields(self):
+        """Test placeholder substitution."""
+        assert (
+            CompiledTemplate("Hi {name}, {n:03d}").render({"name": "Jane", "n": 7})
+            == "Hi Jane, 007"
+        )
+
+    def test_escapes_html_values(self):
+        """Test that HTML templates escape substituted values."""
+        template = CompiledTemplate("<h1>{name}</h1>", escape=True)
+
+        assert template.render({"name": "<b>Tom & Jerry</b>"}) == (
+            "<h1>&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;</h1>"
+        )
+
+
+class TestEmailTemplates:
+    """Tests for loading, variants and invalidation."""
+
+    def test_renders_all_parts(self, tmp_path):
+        """Test that subject, text and HTML are rendered from disk."""
+        rendered = EmailTemplates(_template_dir(tmp_path)).render("greeting", {"name": "Jane"})
+
+        assert rendered.subject == "Hello Jane"
+        assert rendered.body == "Hi Jane"
+        assert rendered.html_body == "<p>Hi Jane</p>"
+
+    def test_locale_and_department_variants(self, tmp_path):
+        """Test that the most specific variant wins and regions fall back."""
+        root = _template_dir(tmp_path)
+        _write(root, "es/greeting.txt", "Hola {name}")
+        _write(root, "es/engineering/greeting.txt", "Hola ingeniera {name}")
+        _write(root, "default/sales/greeting.txt", "Hi seller {name}")
+        templates = EmailTemplates(root)
+
+        assert templates.render("greeting", {"name": "Ana"}, "es-MX").body == "Hola Ana"
+        assert templates.render("greeting", {"name": "Ana"}, "es", "Engineering").body == (
+            "Hola ingeniera Ana"
+        )
+        assert templates.render("greeting", {"name": "Ana"}, "fr", "Sales").body == "Hi seller Ana"
+        assert templates.render("greeting", {"name": "Ana"}, "es").subject == "Hello Ana"
+
+    def test_recompiles_when_file_changes(self, tmp_path):
+        """Test mtime-based invalidation after the check interval."""
+        root = _template_dir(tmp_path)
+        clock = FakeClock()
+        templates = EmailTemplates(root, check_interval=5, clock=clock)
+        assert templates.render("greeting", {"name": "Jane"}).body == "Hi Jane"
+
+        path = _write(root, "default/greeting.txt", "Hey {name}")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert templates.render("greeting", {"name": "Jane"}).body == "Hi Jane"
+
+        clock.now = 5
+        assert templates.render("greeting", {"name": "Jane"}).body == "Hey Jane"
+
+    def test_preload_compiles_default_variant(self, tmp_path):
+        """Test preloading fills the cache so later lookups skip the disk."""
+        templates = EmailTemplates(_template_dir(tmp_path))
+        _write(tmp_path, "default/README", "not a template")
+
+        assert templates.preload() == 3
+        assert {key[:2] for key in templates._cache} == {
+            ("greeting", "subject"),
+            ("greeting", "txt"),
+            ("greeting", "html"),
+        }
+
+    def test_missing_template_raises(self, tmp_path):
+        """Test that an unknown template name is reported."""
+        try:
+            EmailTemplates(tmp_path).render("missing", {})
+        except LookupError:
+            return
+        raise AssertionError("LookupError not raised")
+
+    def test_render_bulk_honours_per_hire_variants(self, tmp_path):
+        """Test cohort rendering with a mix of locales."""
+        root = _template_dir(tmp_path)
+        _write(root, "es/greeting.txt", "Hola {name}")
+
+        rendered = EmailTemplates(root).render_bulk(
+            "greeting", [{"name": "Jane"}, {"name": "Ana", "locale": "es"}]
+        )
+
+        assert [r.body for r in rendered] == ["Hi Jane", "Hola Ana"]
+
+
+class TestShippedTemplates:
+    """Tests that the packaged templates keep the original email content."""
+
+    def test_welcome_email_content(self):
+        """Test the welcome email renders as before."""
+        message = EmailService().build_welcome_email("Jane", "jane@example.com", "2026-03-01")
+
+        assert message.subject == "Welcome to the team, Jane!"
+        assert message.body.startswith("Hi Jane,\n\nWelcome to the company!")
+        assert message.body.endswith("Best regards,\nHR Team\n")
+        assert message.html_body.endswith("</body>\n</html>")
+        assert "<strong>2026-03-01</strong>" in message.html_body
+
+    def test_manager_notification_content(self):
+        """Test the manager notification renders as before."""
+        message = EmailService().build_manager_notification("mgr@example.com", "Jane", "2026-03-01")
+
+        assert message.subject == "New Team Member: Jane"
+        assert "Jane will be joining your team on 2026-03-01." in message.body
+        assert message.html_body is None
+
+    def test_build_welcome_emails_matches_single_build(self):
+        """Test that cohort rendering matches per-hire rendering."""
+        service = EmailService()
+        hires = [
+            {"name": f"Hire {i}", "email": f"h{i}@example.com", "start_date": "2026-03-01"}
+            for i in range(3)
+        ]
+
+        assert service.build_welcome_emails(hires) == [
+            service.build_welcome_email(h["name"], h["email"], h["start_date"]) for h in hires
+        ]
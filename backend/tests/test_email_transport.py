@@ -0,0 +1,110 @@
+"""Tests for the pooled email transports."""
+
+import smtplib
+from unittest.mock import MagicMock, patch
+
+from backend.benchmarks.smtp_stub import LocalSMTPServer
+from backend.integrations.email import EmailMessage, EmailService
+from backend.integrations.email_transport import SMTPTransport, to_mime
+
+
+def _message(i=0, key=None):
+    return EmailMessage(
+        to=f"user{i}@example.com",
+        subject="Hi",
+        body="Hello",
+        html_body="<p>Hello</p>",
+        idempotency_key=key,
+    )
+
+
+class TestSMTPTransport:
+    """Tests for session reuse and reconnects against a local SMTP server."""
+
+    def test_reuses_sessions_when_pooled(self):
+        """Test that consecutive messages share one SMTP session."""
+        with LocalSMTPServer() as server:
+            transport = SMTPTransport("127.0.0.1", server.port, starttls=False)
+            for i in range(5):
+                assert transport.send(_message(i), "noreply@company.com")
+            transport.close()
+
+        assert server.connections == 1
+        assert len(server.messages) == 5
+
+    def test_opens_session_per_message_when_unpooled(self):
+        """Test that pooling can be turned off."""
+        with LocalSMTPServer() as server:
+            transport = SMTPTransport("127.0.0.1", server.port, starttls=False, pooled=False)
+            for i in range(3):
+                assert transport.send(_message(i), "noreply@company.com")
+
+        assert server.connections == 3
+        assert transport.connections_opened == 3
+
+    def test_reconnects_when_server_dropped_session(self):
+        """Test that a dead pooled session is replaced transparently."""
+        with LocalSMTPServer() as server:
+            transport = SMTPTransport("127.0.0.1", server.port, starttls=False)
+            assert transport.send(_message(0), "noreply@company.com")
+            transport._idle.queue[0].smtp.close()
+
+            assert transport.send(_message(1), "noreply@company.com")
+            transport.close()
+
+        assert transport.connections_opened == 2
+        assert len(server.messages) == 2
+
+    def test_health_checks_idle_sessions(self):
+        """Test that a stale session failing NOOP is discarded before use."""
+        transport = SMTPTransport("relay", idle_check_seconds=0)
+        stale = MagicMock()
+        stale.noop.side_effect = smtplib.SMTPServerDisconnected()
+        fresh = MagicMock()
+        transport._idle.put(MagicMock(smtp=stale, last_used=0))
+
+        with patch("backend.integrations.email_transport.smtplib.SMTP", return_value=fresh):
+            assert transport.send(_message(), "noreply@company.com")
+
+        fresh.send_message.assert_called_once()
+        stale.send_message.assert_not_called()
+
+    def test_idempotency_key_becomes_message_id(self):
+        """Test that the idempotency key is carried as the Message-ID."""
+        mime = to_mime(_message(key="abc123"), "noreply@company.com")
+
+        assert mime["Message-ID"] == "<abc123@company.com>"
+        assert mime.is_multipart()
+
+
+class TestEmailServiceTransport:
+    """Tests for EmailService delivery through a transport."""
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "true"})
+    def test_sends_through_transport(self):
+        """Test that enabled services deliver via the transport."""
+        transport = MagicMock()
+        transport.send.return_value = True
+        service = EmailService(transport=transport)
+
+        assert service.send_welcome_email("Jane", "jane@example.com", "2026-03-01")
+        transport.send.assert_called_once()
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "true", "EMAIL_SMTP_HOST": ""})
+    def test_fails_without_transport(self):
+        """Test that enabled services without configuration report failure."""
+        assert EmailService().send_welcome_email("Jane", "jane@example.com", "2026-03-01") is False
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "true", "EMAIL_SMTP_HOST": "127.0.0.1"})
+    def test_builds_smtp_transport_from_env(self):
+        """Test that the SMTP transport is built from the environment."""
+        with (
+            LocalSMTPServer() as server,
+            patch.dict("os.environ", {"EMAIL_SMTP_PORT": str(server.port)}),
+        ):
+            service = EmailService()
+            assert service.send_welcome_email("Jane", "jane@example.com", "2026-03-01")
+            service.shutdown()
+
+        assert isinstance(service.transport, SMTPTransport)
+        assert len(server.messages) == 1
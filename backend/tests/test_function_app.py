@@ -0,0 +1,159 @@
+"""Tests for the Azure Functions wiring in function_app."""
+
+import importlib
+import json
+import logging
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def function_app(monkeypatch):
+    """
+    function_app imported against the real azure.functions with an in-memory store.
+
+    test_api replaces azure.functions with a mock for the rest of the session,
+    so the app is imported afresh here and the mocks are put back afterwards.
+    """
+    for name in list(sys.modules):
+        if name in ("azure", "backend.function_app") or name.startswith("azure.functions"):
+            monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setenv("ONBOARDING_STORE", "memory")
+    monkeypatch.setattr(importlib.import_module("integrations.store"), "_store", None)
+    return importlib.import_module("backend.function_app")
+
+
+class TestCosmosMetricsExport:
+    """Tests for pushing Cosmos metrics out of the instance."""
+
+    def test_timer_exports_to_log(self, function_app, monkeypatch, caplog):
+        """Test the export timer logs each recorded series when metrics are enabled."""
+        monkeypatch.setenv("COSMOS_METRICS_ENABLED", "true")
+        monkeypatch.setattr(
+            importlib.import_module("integrations.cosmos_metrics"), "_cosmos_metrics", None
+        )
+        function_app.get_cosmos_metrics().record("get_state", "ok", 1, 2.5)
+
+        with caplog.at_level(logging.INFO):
+            function_app.export_cosmos_metrics(None)
+
+        assert "[COSMOS METRICS] operation=get_state status=ok count=1" in caplog.text
+
+
+class TestAdmission:
+    """Tests for per-client admission on the HTTP routes."""
+
+    def test_rotating_api_key_does_not_reset_bucket(self, function_app, monkeypatch):
+        """Test a client varying x-api-key is still shed after its write burst."""
+        monkeypatch.setenv("ADMISSION_ENABLED", "true")
+        monkeypatch.setenv("ADMISSION_WRITE_BURST", "5")
+        monkeypatch.setattr(
+            importlib.import_module("integrations.admission"), "_admission_controller", None
+        )
+
+        statuses = [
+            function_app.advance_onboarding(
+                function_app.func.HttpRequest(
+                    "PUT",
+                    "/api/onboarding/nh-404/advance",
+                    headers={"x-api-key": f"key-{i}", "x-forwarded-for": "203.0.113.7"},
+                    route_params={"id": "nh-404"},
+                    body=b"",
+                )
+            ).status_code
+            for i in range(8)
+        ]
+
+        assert statuses.count(429) == 3
+
+
+class TestCompression:
+    """Tests for response compression on the HTTP routes."""
+
+    @pytest.mark.parametrize("accept_encoding", [None, "identity", "gzip"])
+    def test_vary_set_on_uncompressed_responses(self, function_app, accept_encoding):
+        """Test responses that are not compressed still vary on Accept-Encoding."""
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+        response = function_app.get_onboarding(
+            function_app.func.HttpRequest(
+                "GET",
+                "/api/onboarding/nh-404",
+                headers=headers,
+                route_params={"id": "nh-404"},
+                body=b"",
+            )
+        )
+
+        assert response.status_code == 404
+        assert "Content-Encoding" not in response.headers
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+    def test_vary_set_on_compressed_responses(self, function_app, make_state):
+        """Test a compressed response carries its encoding and varies on Accept-Encoding."""
+        state = make_state("nh-001", pending_tasks=[f"task-{i:03d}" for i in range(200)])
+        function_app.get_onboarding_store().create_state(state)
+
+        response = function_app.get_onboarding(
+            function_app.func.HttpRequest(
+                "GET",
+                "/api/onboarding/nh-001",
+                headers={"Accept-Encoding": "gzip"},
+                route_params={"id": "nh-001"},
+                body=b"",
+            )
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+
+class TestCreate:
+    """Tests for creating onboardings over HTTP."""
+
+    @pytest.fixture
+    def failing_ledger(self, function_app, monkeypatch):
+        """Graph stand-in, fresh ledger and search singletons; every task ledger write fails."""
+        monkeypatch.setattr(function_app, "onboarding_graph", SimpleNamespace(invoke=dict))
+        ledger = importlib.import_module("integrations.ledger")
+        monkeypatch.setattr(ledger, "_task_ledger", None)
+        monkeypatch.setattr(
+            importlib.import_module("integrations.search"), "_onboarding_search", None
+        )
+        monkeypatch.setattr(
+            importlib.import_module("integrations.idempotency"), "_idempotency_keys", None
+        )
+
+        def record(self, before, after, actor=None):
+            raise RuntimeError("ledger unavailable")
+
+        monkeypatch.setattr(ledger.TaskLedger, "record", record)
+
+    def _create(self, function_app, headers=None):
+        body = {"name": "Ada Lovelace", "role": "Engineer", "start_date": "2099-03-01"}
+        return function_app.create_onboarding(
+            function_app.func.HttpRequest(
+                "POST",
+                "/api/onboarding/create",
+                headers=headers or {},
+                body=json.dumps(body).encode(),
+            )
+        )
+
+    def test_created_when_ledger_fails(self, function_app, failing_ledger):
+        """Test a ledger failure after the save still returns the saved hire."""
+        response = self._create(function_app)
+
+        assert response.status_code == 201
+        new_hire_id = json.loads(response.get_body())["new_hire_id"]
+        assert function_app.get_onboarding_store().get_state(new_hire_id) is not None
+
+    def test_keyed_retry_replays_when_ledger_fails(self, function_app, failing_ledger):
+        """Test a keyed retry gets the first hire back instead of creating another."""
+        first = self._create(function_app, {"Idempotency-Key": "key-1"})
+        retry = self._create(function_app, {"Idempotency-Key": "key-1"})
+
+        assert (first.status_code, retry.status_code) == (201, 201)
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert json.loads(retry.get_body()) == json.loads(first.get_body())
@@ -0,0 +1,184 @@
+"""Tests for idempotency keys."""
+
+import threading
+import time
+
+import pytest
+from backend.integrations.idempotency import (
+    IdempotencyKeyReused,
+    IdempotencyKeys,
+    IdempotentRequestInProgress,
+    StoredResponse,
+    fingerprint,
+)
+from backend.integrations.local_store import InMemoryOnboardingStore
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _created(body="{}"):
+    return StoredResponse(status_code=201, body=body)
+
+
+class TestIdempotencyKeys:
+    """Tests for replaying keyed requests."""
+
+    def test_fingerprint_ignores_key_order(self):
+        """Test that equal bodies hash equally."""
+        assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+        assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+    def test_retry_replays_stored_response(self):
+        """Test the handler runs once and retries get its response."""
+        keys = IdempotencyKeys(InMemoryOnboardingStore())
+        calls = []
+
+        def handler():
+            calls.append(1)
+            return _created('{"new_hire_id": "nh-1"}')
+
+        first, first_replayed = keys.execute("create", "key-1", {"name": "Jane"}, handler)
+        second, second_replayed = keys.execute("create", "key-1", {"name": "Jane"}, handler)
+
+        assert len(calls) == 1
+        assert (first_replayed, second_replayed) == (False, True)
+        assert second == first
+
+    def test_key_reuse_with_different_body_rejected(self):
+        """Test a key cannot be replayed for another request."""
+        keys = IdempotencyKeys(InMemoryOnboardingStore())
+        keys.execute("create", "key-1", {"name": "Jane"}, _created)
+
+        with pytest.raises(IdempotencyKeyReused):
+            keys.execute("create", "key-1", {"name": "John"}, _created)
+
+    def test_failures_are_not_remembered(self):
+        """Test exceptions and server errors leave the key free for a retry."""
+        keys = IdempotencyKeys(InMemoryOnboardingStore())
+
+        def crash():
+            raise RuntimeError("graph failed")
+
+        with pytest.raises(RuntimeError):
+            keys.execute("create", "key-1", {}, crash)
+        keys.execute("create", "key-1", {}, lambda: StoredResponse(500, "{}"))
+
+        response, replayed = keys.execute("create", "key-1", {}, _created)
+        assert (response.status_code, replayed) == (201, False)
+
+    def test_expired_key_runs_again(self):
+        """Test keys are forgotten after their TTL."""
+        clock = FakeClock()
+        keys = IdempotencyKeys(InMemoryOnboardingStore(), ttl_seconds=60, clock=clock)
+        keys.execute("create", "key-1", {}, _created)
+
+        clock.now += 61
+
+        assert keys.execute("create", "key-1", {}, _created)[1] is False
+
+    def test_concurrent_duplicates_wait_for_first(self):
+        """Test duplicates arriving mid-flight wait instead of executing."""
+        keys = IdempotencyKeys(InMemoryOnboardingStore(), poll_interval=0.01)
+        calls = []
+
+        def slow_handler():
+            calls.append(1)
+            time.sleep(0.1)
+            return _created()
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(keys.execute("create", "key-1", {}, slow_handler))
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(replayed for _, replayed in results) == [False, True, True, True]
+
+    def test_gives_up_waiting(self):
+        """Test a duplicate reports the request in progress after the wait."""
+        store = InMemoryOnboardingStore()
+        clock = FakeClock()
+
+        def sleep(seconds):
+            clock.now += seconds
+
+        keys = IdempotencyKeys(store, wait_seconds=1, clock=clock, sleep=sleep)
+        store.create_idempotency_record(
+            {
+                "id": keys.record_id("create", "key-1"),
+                "fingerprint": fingerprint({}),
+                "status": "in_progress",
+                "locked_until": clock.now + 300,
+                "expires_at": clock.now + 3600,
+            }
+        )
+
+        with pytest.raises(IdempotentRequestInProgress):
+            keys.execute("create", "key-1", {}, _created)
+
+    def test_racing_takeovers_run_once(self):
+        """Test only one of two requests taking over an abandoned claim wins it."""
+        store = InMemoryOnboardingStore()
+        clock = FakeClock()
+        keys = IdempotencyKeys(store, lock_seconds=10, clock=clock, sleep=lambda s: None)
+        record_id = keys.record_id("create", "key-1")
+        store.create_idempotency_record(
+            {
+                "id": record_id,
+                "fingerprint": fingerprint({}),
+                "status": "in_progress",
+                "locked_until": clock.now - 1,
+                "expires_at": clock.now + 3600,
+            }
+        )
+        abandoned = store.get_idempotency_record(record_id)
+
+        # A racing request takes the key over between our read and our write
+        get_record = store.get_idempotency_record
+
+        def read_then_lose_race(rid):
+            store.replace_idempotency_record({**abandoned, "locked_until": clock.now + 10})
+            store.get_idempotency_record = get_record
+            return abandoned
+
+        store.get_idempotency_record = read_then_lose_race
+
+        calls = []
+        with pytest.raises(IdempotentRequestInProgress):
+            keys.wait_seconds = 0
+            keys.execute("create", "key-1", {}, lambda: calls.append(1) or _created())
+
+        assert calls == []
+
+    def test_taken_over_claim_is_not_overwritten(self):
+        """Test a request that lost its claim neither stores its response nor deletes the new claim."""
+        store = InMemoryOnboardingStore()
+        keys = IdempotencyKeys(store)
+        record_id = keys.record_id("create", "key-1")
+
+        def slow_handler():
+            # Our lock expired; another request took the key over meanwhile
+            current = store.get_idempotency_record(record_id)
+            store.replace_idempotency_record({**current, "locked_until": 0, "owner": "other"})
+            return _created()
+
+        response, replayed = keys.execute("create", "key-1", {}, slow_handler)
+
+        assert (response.status_code, replayed) == (201, False)
+        record = store.get_idempotency_record(record_id)
+        assert (record["owner"], record["status"]) == ("other", "in_progress")
@@ -0,0 +1,89 @@
+"""Tests for background onboarding jobs."""
+
+import threading
+from unittest.mock import MagicMock
+
+from backend.integrations.jobs import (
+    FAILED,
+    QUEUED,
+    SUCCEEDED,
+    InProcessJobQueue,
+    JobService,
+    job_status,
+)
+from backend.integrations.local_store import InMemoryOnboardingStore
+
+
+class TestJobService:
+    """Tests for recording and running jobs."""
+
+    def test_submit_records_and_queues(self):
+        """Test a submitted job is stored as queued and its ID is sent."""
+        store = InMemoryOnboardingStore()
+        job_queue = MagicMock()
+        service = JobService(store, {"create": lambda request: request}, job_queue)
+
+        job = service.submit("create", "nh-001", {"name": "Jane"})
+
+        job_queue.send.assert_called_once_with(job["id"])
+        assert store.get_job(job["id"])["status"] == QUEUED
+        assert job_status(job)["new_hire_id"] == "nh-001"
+        assert "request" not in job_status(job)
+
+    def test_run_records_result_once(self):
+        """Test a job runs once even if its message is redelivered."""
+        handler = MagicMock(return_value={"current_phase": "pre_onboarding"})
+        service = JobService(InMemoryOnboardingStore(), {"create": handler}, MagicMock())
+        job = service.submit("create", "nh-001", {"name": "Jane"})
+
+        service.run(job["id"])
+        finished = service.run(job["id"])
+
+        handler.assert_called_once_with({"name": "Jane"})
+        assert finished["status"] == SUCCEEDED
+        assert finished["result"] == {"current_phase": "pre_onboarding"}
+
+    def test_run_records_failure(self):
+        """Test handler errors are captured on the job."""
+
+        def fail(request):
+            raise RuntimeError("graph failed")
+
+        service = JobService(InMemoryOnboardingStore(), {"advance": fail}, MagicMock())
+        job = service.submit("advance", "nh-001", {"new_hire_id": "nh-001"})
+
+        assert service.run(job["id"])["status"] == FAILED
+        assert service.get(job["id"])["error"] == "graph failed"
+
+    def test_unknown_kind_rejected(self):
+        """Test jobs without a handler are not accepted."""
+        service = JobService(InMemoryOnboardingStore(), {}, MagicMock())
+
+        try:
+            service.submit("delete", "nh-001", {})
+        except ValueError:
+            return
+        raise AssertionError("ValueError not raised")
+
+
+class TestInProcessJobQueue:
+    """Tests for the local worker pool."""
+
+    def test_submit_returns_before_job_runs(self):
+        """Test submission does not wait for the handler."""
+        release = threading.Event()
+
+        def handler(request):
+            release.wait(timeout=5)
+            return {"done": True}
+
+        service = JobService(InMemoryOnboardingStore(), {"create": handler})
+        assert isinstance(service.job_queue, InProcessJobQueue)
+
+        jobs = [service.submit("create", f"nh-{i}", {}) for i in range(3)]
+        assert all(service.get(job["id"])["status"] != SUCCEEDED for job in jobs)
+
+        release.set()
+        service.job_queue.join()
+        service.job_queue.close()
+        assert all(service.get(job["id"])["status"] == SUCCEEDED for job in jobs)
@@ -0,0 +1,166 @@
+"""Tests for the event-sourced task ledger."""
+
+from datetime import datetime
+
+import pytest
+from backend.agents.hr_agent import hr_agent
+from backend.agents.it_agent import IT_TASKS, it_agent
+from backend.integrations.ledger import TaskLedger, TaskView, diff_tasks
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.scheduler import ManualClock
+
+
+def _created(make_state):
+    """A new hire with every IT task pending."""
+    return make_state("nh-001", pending_tasks=[t["id"] for t in IT_TASKS] + ["hr-001"])
+
+
+def _ledger(store, snapshot_every=50):
+    return TaskLedger(store, snapshot_every, clock=ManualClock(datetime(2026, 2, 1, 9)))
+
+
+def _task_fields(state):
+    return {key: state[key] for key in ("tasks", "completed_tasks", "pending_tasks")}
+
+
+class TestDiffTasks:
+    """Tests for turning task lists into events."""
+
+    def test_new_and_changed_tasks_only(self):
+        """Test unchanged tasks are skipped and changes carry only changed fields."""
+        before = [
+            {"id": "it-001", "status": "completed", "notes": "done"},
+            {"id": "it-002", "status": "pending", "notes": "", "assigned_to": "IT Department"},
+        ]
+        after = [
+            before[0],
+            {**before[1], "status": "blocked", "notes": "Awaiting stock"},
+            {"id": "hr-001", "status": "pending", "notes": ""},
+        ]
+
+        events = diff_tasks(before, after, at="2026-02-01T09:00:00")
+
+        assert [(e["task_id"], e["status"]) for e in events] == [
+            ("it-002", "blocked"),
+            ("hr-001", "pending"),
+        ]
+        assert events[0]["fields"] == {"notes": "Awaiting stock"}
+        assert events[0]["actor"] == "IT Department"
+        assert events[1]["actor"] == "system"
+
+
+class TestTaskLedger:
+    """Tests for recording and replaying task transitions."""
+
+    def test_replay_matches_agent_output(self, make_state):
+        """Test folding the events reproduces the task fields the agents returned."""
+        store = InMemoryOnboardingStore()
+        ledger = _ledger(store)
+        created = _created(make_state)
+        after_it = it_agent(created)
+        after_hr = hr_agent(after_it)
+        store.create_state(after_hr)
+
+        ledger.record(created, after_it)
+        ledger.record(after_it, after_hr)
+
+        assert _task_fields(ledger.load("nh-001")) == _task_fields(after_hr)
+        assert [e["seq"] for e in ledger.history("nh-001")] == list(
+            range(1, len(after_hr["tasks"]) + 1)
+        )
+
+    def test_unchanged_states_append_nothing(self, make_state):
+        """Test re-recording the same tasks adds no events."""
+        store = InMemoryOnboardingStore()
+        ledger = _ledger(store)
+        created = _created(make_state)
+        after = it_agent(created)
+
+        ledger.record(created, after)
+
+        assert ledger.record(after, after) == []
+        assert len(ledger.history("nh-001")) == len(IT_TASKS)
+
+    def test_snapshots_bound_replay(self, make_state):
+        """Test a snapshot is taken every N events and reads replay only the rest."""
+        store = InMemoryOnboardingStore()
+        ledger = _ledger(store, snapshot_every=3)
+        state = _created(make_state)
+        statuses = ["in_progress", "blocked", "in_progress", "completed"]
+        for status in statuses:
+            task = {
+                "id": "it-001",
+                "name": "Create email account",
+                "category": "it",
+                "status": status,
+                "notes": "",
+            }
+            after = {**state, "tasks": [task]}
+            ledger.record(state, after)
+            state = after
+
+        assert store.get_task_snapshot("nh-001")["seq"] == 3
+        assert len(store.list_task_events("nh-001", after_seq=3)) == 1
+        view = ledger.view("nh-001")
+        assert view.seq == 4
+        assert view.tasks["it-001"]["status"] == "completed"
+        assert "it-001" in view.completed and "it-001" not in view.pending
+
+    def test_history_for_one_task(self, make_state):
+        """Test a task's trail lists each transition with its actor."""
+        store = InMemoryOnboardingStore()
+        ledger = _ledger(store)
+        created = _created(make_state)
+        ledger.record(created, it_agent(created))
+
+        history = ledger.history("nh-001", task_id="it-002")
+
+        assert len(history) == 1
+        assert history[0]["status"] == "completed"
+        assert history[0]["actor"] == "IT Department"
+        assert history[0]["at"] == "2026-02-01T09:00:00"
+        assert "partitionKey" not in history[0]
+
+    def test_concurrent_append_conflicts(self, make_state):
+        """Test a writer with a stale sequence number is rejected."""
+        store = InMemoryOnboardingStore()
+        created = _created(make_state)
+        _ledger(store).record(created, it_agent(created))
+        event = {"seq": 1, "task_id": "it-001", "status": "blocked", "actor": "x", "at": ""}
+
+        with pytest.raises(ValueError):
+            store.append_task_events("nh-001", [event])
+
+    def test_record_retries_after_losing_the_append(self, make_state):
+        """Test a writer that loses the race re-replays and appends after the winner."""
+        store = InMemoryOnboardingStore()
+        ledger = _ledger(store)
+        created = _created(make_state)
+        ledger.record(created, created)
+        winner = hr_agent(created)
+        append = store.append_task_events
+
+        def lose_once(new_hire_id, events, snapshot=None):
+            store.append_task_events = append
+            ledger.record(created, winner)  # lands between our replay and our append
+            append(new_hire_id, events, snapshot)
+
+        store.append_task_events = lose_once
+        ledger.record(created, it_agent(created))
+
+        history = ledger.history("nh-001")
+        assert [e["seq"] for e in history] == list(range(1, len(history) + 1))
+        assert {e["task_id"][:2] for e in history} == {"hr", "it"}
+
+
+class TestTaskView:
+    """Tests for folding events."""
+
+    def test_reopened_task_returns_to_pending(self):
+        """Test a completed task moved back to pending leaves the completed list."""
+        view = TaskView(pending=dict.fromkeys(["it-001"]))
+        view.apply({"seq": 1, "task_id": "it-001", "status": "completed"})
+        view.apply({"seq": 2, "task_id": "it-001", "status": "pending"})
+
+        assert view.state_fields()["completed_tasks"] == []
+        assert view.state_fields()["pending_tasks"] == ["it-001"]
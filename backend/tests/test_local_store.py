@@ -0,0 +1,213 @@
+"""Tests for the in-memory onboarding store."""
+
+import pytest
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.queries import MAX_PAGE_SIZE, StateFilters
+
+
+class TestInMemoryOnboardingStore:
+    """Tests for CRUD operations."""
+
+    def test_create_and_get_state(self, make_state):
+        """Test creating and reading back a state."""
+        store = InMemoryOnboardingStore()
+
+        created = store.create_state(make_state("nh-001"))
+
+        assert created["id"] == "nh-001"
+        assert created["partitionKey"] == "nh-001"
+        assert store.get_state("nh-001")["new_hire_name"] == "Test User"
+
+    def test_create_duplicate_raises(self, make_state):
+        """Test that creating an existing ID raises ValueError."""
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("nh-001"))
+
+        with pytest.raises(ValueError, match="already exists"):
+            store.create_state(make_state("nh-001"))
+
+    def test_get_missing_returns_none(self):
+        """Test reading an unknown ID."""
+        assert InMemoryOnboardingStore().get_state("missing") is None
+
+    def test_returned_documents_are_copies(self, make_state):
+        """Test that callers cannot mutate stored documents."""
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("nh-001"))
+
+        store.get_state("nh-001")["tasks"].append({"id": "x"})
+
+        assert store.get_state("nh-001")["tasks"] == []
+
+
+class TestChangeFeed:
+    """Tests for the local change feed."""
+
+    def test_reads_changes_in_batches(self, make_state):
+        """Test batching and continuation tokens."""
+        store = InMemoryOnboardingStore()
+        for i in range(5):
+            store.create_state(make_state(f"nh-{i}"))
+
+        first, token = store.read_change_feed(max_item_count=3)
+        second, token = store.read_change_feed(token, max_item_count=3)
+        third, _ = store.read_change_feed(token, max_item_count=3)
+
+        assert [d["id"] for d in first] == ["nh-0", "nh-1", "nh-2"]
+        assert [d["id"] for d in second] == ["nh-3", "nh-4"]
+        assert third == []
+
+    def test_only_latest_version_is_delivered(self, make_state):
+        """Test that superseded versions are skipped."""
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("nh-001"))
+        store.update_state(make_state("nh-001", current_phase="immediate_prep"))
+
+        changes, _ = store.read_change_feed()
+
+        assert len(changes) == 1
+        assert changes[0]["current_phase"] == "immediate_prep"
+
+
+class TestSecondaryIndexes:
+    """Tests for the typed query methods."""
+
+    @pytest.fixture
+    def store(self, make_state):
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("a", manager_id="mgr-1", start_date="2026-03-10"))
+        store.create_state(
+            make_state("b", manager_id="mgr-1", start_date="2026-03-01", department="Sales")
+        )
+        store.create_state(
+            make_state(
+                "c", manager_id="mgr-2", start_date="2026-03-05", current_phase="immediate_prep"
+            )
+        )
+        return store
+
+    def test_by_manager_orders_by_start_date(self, store):
+        """Test manager lookup uses start date order and summary projection."""
+        result = store.by_manager("mgr-1")
+
+        assert [item["id"] for item in result.items] == ["b", "a"]
+        assert "tasks" not in result.items[0]
+        assert result.request_charge == 0.0
+
+    def test_by_phase_and_department(self, store):
+        """Test phase and department lookups."""
+        assert [i["id"] for i in store.by_phase("immediate_prep").items] == ["c"]
+        assert [i["id"] for i in store.by_department("Sales").items] == ["b"]
+
+    def test_starting_between(self, store):
+        """Test inclusive start-date range queries."""
+        result = store.starting_between("2026-03-01", "2026-03-05")
+
+        assert [item["id"] for item in result.items] == ["b", "c"]
+
+    def test_indexes_follow_updates_and_deletes(self, store, make_state):
+        """Test that updates move and deletes drop index entries."""
+        store.update_state(make_state("a", manager_id="mgr-2", start_date="2026-03-10"))
+        store.delete_state("c")
+
+        assert [i["id"] for i in store.by_manager("mgr-1").items] == ["b"]
+        assert [i["id"] for i in store.by_manager("mgr-2").items] == ["a"]
+        assert [i["id"] for i in store.starting_between("2026-01-01", "2026-12-31").items] == [
+            "b",
+            "a",
+        ]
+
+
+class TestPagination:
+    """Tests for cursor-based listing."""
+
+    @pytest.fixture
+    def store(self, make_state):
+        store = InMemoryOnboardingStore()
+        for i in range(25):
+            store.create_state(
+                make_state(
+                    f"nh-{i:02d}",
+                    start_date=f"2026-03-{i + 1:02d}",
+                    department="Sales" if i % 5 == 0 else "Engineering",
+                )
+            )
+        return store
+
+    def _walk(self, store, filters=None, page_size=10):
+        ids, cursor, pages = [], None, 0
+        while True:
+            page = store.list_states_page(filters, page_size, cursor)
+            ids.extend(item["id"] for item in page.items)
+            pages += 1
+            cursor = page.continuation
+            if cursor is None:
+                return ids, pages
+
+    def test_walks_every_hire_once_in_start_date_order(self, store):
+        """Test that pages cover the store without gaps or repeats."""
+        ids, pages = self._walk(store)
+
+        assert ids == [f"nh-{i:02d}" for i in range(25)]
+        assert pages == 3
+
+    def test_filters_apply_across_pages(self, store):
+        """Test equality and start-date range filters."""
+        ids, _ = self._walk(store, StateFilters(department="Sales"), page_size=2)
+        assert ids == ["nh-00", "nh-05", "nh-10", "nh-15", "nh-20"]
+
+        ids, _ = self._walk(store, StateFilters(start_from="2026-03-04", start_to="2026-03-08"))
+        assert ids == ["nh-03", "nh-04", "nh-05", "nh-06", "nh-07"]
+
+    def test_cursor_survives_concurrent_inserts(self, store, make_state):
+        """Test that inserting earlier hires does not shift the next page."""
+        first = store.list_states_page(page_size=5)
+        store.create_state(make_state("early", start_date="2026-01-01"))
+
+        second = store.list_states_page(page_size=5, continuation=first.continuation)
+
+        assert [item["id"] for item in second.items] == [f"nh-{i:02d}" for i in range(5, 10)]
+
+    def test_page_size_is_capped(self, make_state):
+        """Test that oversized pages are clamped."""
+        store = InMemoryOnboardingStore()
+        for i in range(MAX_PAGE_SIZE + 5):
+            store.create_state(make_state(f"nh-{i:03d}"))
+
+        assert len(store.list_states_page(page_size=10_000).items) == MAX_PAGE_SIZE
+
+
+class TestBulkWrites:
+    """Tests for bulk create and upsert."""
+
+    def test_create_states_bulk(self, make_state):
+        """Test bulk create returns per-item results in input order."""
+        store = InMemoryOnboardingStore()
+        states = [make_state(f"nh-{i}") for i in range(250)]
+
+        results = store.create_states_bulk(states, max_concurrency=4)
+
+        assert [r.id for r in results] == [s["new_hire_id"] for s in states]
+        assert all(r.ok and r.status_code == 201 for r in results)
+        assert store.get_state("nh-249") is not None
+
+    def test_failures_are_isolated(self, make_state):
+        """Test that a conflict only fails its own partition."""
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("nh-1"))
+
+        results = store.create_states_bulk([make_state("nh-0"), make_state("nh-1")])
+
+        assert results[0].ok
+        assert results[1].status_code == 409
+        assert not results[1].ok
+
+    def test_upsert_states_bulk_overwrites(self, make_state):
+        """Test bulk upsert replaces existing documents."""
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("nh-1"))
+
+        results = store.upsert_states_bulk([make_state("nh-1", current_phase="post_start")])
+
+        assert results[0].status_code == 200
+        assert store.get_state("nh-1")["current_phase"] == "post_start"
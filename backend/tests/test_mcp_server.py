@@ -1,15 +1,33 @@
 """Tests for LangGraph MCP Server."""
 
+import asyncio
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
 import pytest
+
 from mcp_server import (
     NewHireInput,
     OnboardingStatus,
-    TaskList,
     PhaseInfo,
+    TaskList,
     mcp,
 )
 
 
+@pytest.fixture
+def store():
+    """Fresh in-memory onboarding store behind the MCP tools."""
+    from integrations.local_store import InMemoryOnboardingStore
+
+    store = InMemoryOnboardingStore()
+    with patch("integrations.store._store", store), \
+         patch("integrations.ledger._task_ledger", None), \
+         patch("integrations.search._onboarding_search", None):
+        yield store
+
+
 class TestMCPServerModels:
     """Test Pydantic models."""
 
@@ -90,6 +108,82 @@ class TestMCPServerTools:
         # This test requires Cosmos DB implementation
         pass
 
+    async def test_status_reads_the_store(self, store, make_state):
+        """Test that listed IDs resolve to stored hires and unknown IDs are not found."""
+        from mcp_server import get_onboarding_resource, get_onboarding_status, list_onboardings
+
+        store.create_state(make_state("nh-1", new_hire_name="Priya Sharma", current_phase="day_one"))
+
+        (listed,) = (await list_onboardings()).items
+        status = await get_onboarding_status(listed.new_hire_id)
+
+        assert (status.new_hire_name, status.current_phase) == ("Priya Sharma", "day_one")
+        with pytest.raises(ValueError, match="not found"):
+            await get_onboarding_status("nh-unknown")
+        assert await get_onboarding_resource("nh-unknown") == "Onboarding not found for ID: nh-unknown"
+
+    async def test_resource_rendered_once_per_version(self, store, make_state):
+        """Test that unchanged states are served from the rendered cache."""
+        from mcp_server import RenderedResourceCache, get_onboarding_resource
+
+        state = make_state("nh-cache", completed_tasks=["hr-001"])
+        store.create_state(state)
+        cache = RenderedResourceCache(max_entries=8)
+
+        with patch("mcp_server._resource_cache", cache):
+            first = await get_onboarding_resource("nh-cache")
+            second = await get_onboarding_resource("nh-cache")
+            store.update_state({**state, "current_phase": "day_one"})
+            third = await get_onboarding_resource("nh-cache")
+
+        assert first == second
+        assert "✓ hr-001" in first
+        assert "**Current Phase**: day_one" in third
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    async def test_resource_cache_keyed_on_store_version(self, store, make_state):
+        """Test that repeated reads through the store hit, and updated_at is not a version."""
+        from mcp_server import RenderedResourceCache, get_onboarding_resource
+
+        store.create_state(make_state("nh-1"))
+        cache = RenderedResourceCache(max_entries=8)
+
+        with patch("mcp_server._resource_cache", cache):
+            for _ in range(3):
+                await get_onboarding_resource("nh-1")
+
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert cache.version({"_lsn": 7, "updated_at": "2026-01-01"}) == "7"
+        assert cache.version(make_state("nh-2")) is None
+
+    def test_days_until_start_recomputed_on_hit(self, make_state):
+        """Test that the date-dependent line is filled in on every read."""
+        from mcp_server import RenderedResourceCache
+
+        cache = RenderedResourceCache(max_entries=8)
+        state = make_state("nh-days", _etag='"1"', start_date="2030-01-01")
+        days = (datetime(2030, 1, 1) - datetime.now()).days
+
+        cache.render(state)
+        assert f"**Days Until Start**: {days}\n" in cache.render(state)
+        assert cache.hits == 1
+
+    def test_least_recently_used_entry_evicted(self, make_state):
+        """Test bounded LRU eviction."""
+        from mcp_server import RenderedResourceCache
+
+        cache = RenderedResourceCache(max_entries=2)
+        states = [make_state(f"nh-{i}", _etag='"1"') for i in range(3)]
+
+        cache.render(states[0])
+        cache.render(states[1])
+        cache.render(states[0])
+        cache.render(states[2])
+        cache.render(states[0])
+        cache.render(states[1])
+
+        assert (cache.hits, cache.misses) == (2, 4)
+
     @pytest.mark.skip(reason="Requires database implementation")
     def test_list_tasks_tool(self):
         """Test list_tasks tool."""
@@ -109,6 +203,284 @@ class TestMCPServerTools:
         pass
 
 
+def _graph_echo():
+    """Graph stand-in that returns the state it was given."""
+    graph = MagicMock()
+    graph.invoke.side_effect = lambda state: state
+    return graph
+
+
+def _hire(name="Jane Doe", start_date="2026-02-01"):
+    return NewHireInput(
+        name=name, role="Engineer", start_date=start_date, manager="mgr-001", location="Remote"
+    )
+
+
+class TestMCPBatchTools:
+    """Test batch tools."""
+
+    async def test_create_onboardings_returns_results_in_order(self, store):
+        """Test that every hire gets a unique ID and a status, and is saved."""
+        from mcp_server import create_onboardings, get_onboarding_status, search_onboardings
+
+        with patch("agents.graph.onboarding_graph", _graph_echo()) as graph:
+            result = await create_onboardings([_hire(f"Hire {i}", "2030-03-01") for i in range(5)])
+            again = await create_onboardings([_hire(f"Hire {i}", "2030-03-01") for i in range(5)])
+
+        assert result.succeeded == 5 and result.failed == 0
+        assert [r.index for r in result.results] == list(range(5))
+        ids = {r.new_hire_id for r in result.results + again.results}
+        assert len(ids) == 10
+        assert result.results[3].status.new_hire_name == "Hire 3"
+        assert graph.invoke.call_count == 10
+
+        saved = await get_onboarding_status(result.results[3].new_hire_id)
+        assert saved.new_hire_name == "Hire 3"
+        assert len((await search_onboardings("hire", limit=100)).items) == 10
+        assert len(store._timers) == 10
+
+    async def test_create_onboarding_saves_streamed_result(self, store):
+        """Test that a single create is saved with its notifications queued."""
+        from mcp_server import create_onboarding
+
+        with patch("agents.graph.onboarding_graph", _graph_streaming(2)):
+            status = await create_onboarding(_hire("Priya Sharma"))
+
+        assert store.get_state(status.new_hire_id)["new_hire_name"] == "Priya Sharma"
+        assert store.list_pending_outbox(10, "9999-12-31")
+
+    async def test_create_onboardings_reports_partial_failures(self, store):
+        """Test that one invalid hire does not fail the batch."""
+        from mcp_server import create_onboardings
+
+        with patch("agents.graph.onboarding_graph", _graph_echo()):
+            result = await create_onboardings([_hire(), _hire(start_date="not-a-date"), _hire()])
+
+        assert result.succeeded == 2 and result.failed == 1
+        assert result.results[1].status is None
+        assert "not-a-date" in result.results[1].error
+
+    async def test_get_onboarding_statuses(self, store, make_state):
+        """Test batch status lookup with a missing hire."""
+        from mcp_server import get_onboarding_statuses
+
+        store.create_state(make_state("NH-1"))
+        store.create_state(make_state("NH-3"))
+
+        result = await get_onboarding_statuses(["NH-1", "missing", "NH-3"])
+
+        assert [r.new_hire_id for r in result.results] == ["NH-1", "missing", "NH-3"]
+        assert result.results[1].error == "Onboarding not found for ID: missing"
+        assert result.results[2].status.new_hire_id == "NH-3"
+
+    async def test_advance_phases_runs_graph_per_hire(self, store, make_state):
+        """Test that each hire is re-run through the graph."""
+        from mcp_server import advance_phases
+
+        store.create_state(make_state("NH-1"))
+        store.create_state(make_state("NH-2"))
+
+        with patch("agents.graph.onboarding_graph", _graph_echo()) as graph:
+            result = await advance_phases(["NH-1", "NH-2"])
+
+        assert result.succeeded == 2
+        assert graph.invoke.call_count == 2
+        assert min(store.get_state(i)["_lsn"] for i in ("NH-1", "NH-2")) > 2
+
+    async def test_batch_size_is_bounded(self):
+        """Test that oversized batches are rejected."""
+        from mcp_server import MAX_BATCH_SIZE, get_onboarding_statuses
+
+        with pytest.raises(ValueError):
+            await get_onboarding_statuses([f"NH-{i}" for i in range(MAX_BATCH_SIZE + 1)])
+
+
+def _graph_streaming(steps, step_delay=0.0, ran=None):
+    """Graph stand-in whose stream yields one coordinator update per step."""
+
+    def stream(state, stream_mode):
+        for i in range(steps):
+            if step_delay:
+                threading.Event().wait(step_delay)
+            if ran is not None:
+                ran.append(i)
+            yield ("updates", {"coordinator": {}})
+            yield ("values", state)
+
+    graph = MagicMock()
+    graph.stream.side_effect = stream
+    return graph
+
+
+class TestMCPProgress:
+    """Test progress notifications and cancellation."""
+
+    async def test_advance_phase_reports_each_step(self, store, make_state):
+        """Test that every superstep is sent as a progress notification."""
+        from fastmcp import Client
+
+        store.create_state(make_state("NH-1"))
+        events = []
+
+        async def on_progress(progress, total, message):
+            events.append((progress, message))
+
+        with patch("agents.graph.onboarding_graph", _graph_streaming(3)):
+            async with Client(mcp) as client:
+                result = await client.call_tool(
+                    "advance_phase", {"new_hire_id": "NH-1"}, progress_handler=on_progress
+                )
+
+        assert result.structured_content["new_hire_id"] == "NH-1"
+        assert events == [
+            (1.0, "Step 1: coordinator finished"),
+            (2.0, "Step 2: coordinator finished"),
+            (3.0, "Step 3: coordinator finished"),
+        ]
+
+    async def test_cancellation_stops_between_supersteps(self, store, make_state):
+        """Test that no further supersteps run once the call is cancelled."""
+        from mcp_server import advance_phase
+
+        store.create_state(make_state("NH-1"))
+        ran = []
+        with patch("agents.graph.onboarding_graph", _graph_streaming(10, 0.05, ran)):
+            task = asyncio.create_task(advance_phase("NH-1"))
+            await asyncio.sleep(0.08)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.sleep(0.2)
+
+        assert len(ran) < 4
+
+
+class TestMCPConcurrency:
+    """Test per-client limits and transport selection."""
+
+    def _context(self, client_id):
+        context = MagicMock()
+        context.fastmcp_context.client_id = client_id
+        return context
+
+    async def test_requests_are_limited_per_client(self):
+        """Test that one client waits for its own slots but not for others."""
+        from mcp_server import ClientConcurrencyMiddleware
+
+        middleware = ClientConcurrencyMiddleware(limit=2)
+        running = {"a": 0, "b": 0}
+        peak = {"a": 0, "b": 0}
+
+        async def call_next(context):
+            key = context.fastmcp_context.client_id
+            running[key] += 1
+            peak[key] = max(peak[key], running[key])
+            await asyncio.sleep(0.02)
+            running[key] -= 1
+            return key
+
+        calls = [self._context("a") for _ in range(6)] + [self._context("b") for _ in range(2)]
+        results = await asyncio.gather(*(middleware.on_call_tool(c, call_next) for c in calls))
+
+        assert results.count("a") == 6
+        assert peak == {"a": 2, "b": 2}
+        assert middleware._slots == {}
+
+    async def test_concurrent_status_reads_share_one_fetch(self, store, make_state):
+        """Test that simultaneous reads of one hire issue a single storage read."""
+        import time
+
+        from mcp_server import get_onboarding_status, get_phase_info
+
+        store.create_state(make_state("nh-001"))
+        get_state = store.get_state
+
+        def slow_read(new_hire_id):
+            time.sleep(0.05)
+            return get_state(new_hire_id)
+
+        with patch.object(store, "get_state", side_effect=slow_read) as read:
+            results = await asyncio.gather(
+                *(get_onboarding_status("nh-001") for _ in range(4)),
+                get_phase_info("nh-001"),
+            )
+
+        assert read.call_count == 1
+        assert {r.current_phase for r in results} == {"pre_onboarding"}
+
+    def test_main_selects_http_transport(self):
+        """Test that --transport streamable-http serves over HTTP."""
+        from mcp_server import main
+
+        with patch.object(mcp, "run") as run:
+            main(["--transport", "streamable-http", "--port", "9000"])
+
+        run.assert_called_once_with(transport="streamable-http", host="127.0.0.1", port=9000)
+
+    @patch.dict('os.environ', {'MCP_TRANSPORT': 'stdio'})
+    def test_main_defaults_to_stdio(self):
+        """Test that stdio remains the default transport."""
+        from mcp_server import main
+
+        with patch.object(mcp, "run") as run:
+            main([])
+
+        run.assert_called_once_with()
+
+
+class TestMCPListing:
+    """Test paginated listing."""
+
+    async def test_list_onboardings_pages_through_store(self, make_state):
+        """Test that the tool walks the store with cursors and filters."""
+        from integrations.local_store import InMemoryOnboardingStore
+        from mcp_server import list_onboardings, list_onboardings_resource
+
+        store = InMemoryOnboardingStore()
+        for i in range(5):
+            store.create_state(make_state(f"nh-{i}", start_date=f"2026-03-0{i + 1}"))
+
+        with patch("integrations.store.get_onboarding_store", return_value=store):
+            first = await list_onboardings(page_size=3)
+            second = await list_onboardings(page_size=3, cursor=first.next_cursor)
+            filtered = await list_onboardings(start_from="2026-03-04")
+            resource = await list_onboardings_resource()
+
+        assert [h.new_hire_id for h in first.items] == ["nh-0", "nh-1", "nh-2"]
+        assert [h.new_hire_id for h in second.items] == ["nh-3", "nh-4"]
+        assert second.next_cursor is None
+        assert [h.new_hire_id for h in filtered.items] == ["nh-3", "nh-4"]
+        assert '"nh-4"' in resource
+
+    async def test_search_onboardings_finds_hires_by_name(self, make_state):
+        """Test that assistants can resolve a name to a new_hire_id."""
+        from integrations.local_store import InMemoryOnboardingStore
+        from integrations.search import OnboardingSearch
+        from mcp_server import search_onboardings
+
+        store = InMemoryOnboardingStore()
+        store.create_state(make_state("nh-1", new_hire_name="Priya Sharma"))
+        store.create_state(make_state("nh-2", new_hire_name="Pat Lee"))
+
+        with patch("integrations.search._onboarding_search", OnboardingSearch(store)):
+            result = await search_onboardings("priya")
+
+        assert [h.new_hire_id for h in result.items] == ["nh-1"]
+        assert result.items[0].new_hire_name == "Priya Sharma"
+
+    async def test_search_finds_mcp_created_hires(self, store):
+        """Test that hires created over MCP are searchable and their IDs resolve."""
+        from mcp_server import create_onboardings, get_onboarding_status, search_onboardings
+
+        with patch("agents.graph.onboarding_graph", _graph_echo()):
+            await create_onboardings([_hire("Priya Sharma"), _hire("Pat Lee")])
+
+        (hit,) = (await search_onboardings("priya")).items
+        status = await get_onboarding_status(hit.new_hire_id)
+
+        assert status.new_hire_name == "Priya Sharma"
+
+
 class TestMCPServerResources:
     """Test MCP server resources."""
 
@@ -177,11 +549,11 @@ class TestMCPServerConfiguration:
         # FastMCP automatically registers tools via decorators
         # We can verify by checking the module has the expected functions
         from mcp_server import (
+            advance_phase,
             create_onboarding,
             get_onboarding_status,
-            list_tasks,
             get_phase_info,
-            advance_phase,
+            list_tasks,
         )
         
         assert callable(create_onboarding)
@@ -198,7 +570,7 @@ class TestMCPServerConfiguration:
 
     def test_server_has_prompts(self):
         """Test server has registered prompts."""
-        from mcp_server import create_onboarding_prompt, check_status_prompt
+        from mcp_server import check_status_prompt, create_onboarding_prompt
         
         assert callable(create_onboarding_prompt)
         assert callable(check_status_prompt)
@@ -0,0 +1,152 @@
+"""Tests for the transactional notification outbox."""
+
+from unittest.mock import MagicMock, patch
+
+from backend.integrations.email import EmailService
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.outbox import (
+    MANAGER_NOTIFICATION,
+    WELCOME_EMAIL,
+    OutboxRelay,
+    make_outbox_message,
+    onboarding_notifications,
+)
+
+
+class TestOutboxMessages:
+    """Tests for outbox document construction."""
+
+    def test_messages_share_the_hire_partition(self, make_state):
+        """Test that notifications live in the hire's partition."""
+        messages = onboarding_notifications(make_state("nh-001"))
+
+        assert [m["kind"] for m in messages] == [WELCOME_EMAIL, MANAGER_NOTIFICATION]
+        assert all(m["partitionKey"] == "nh-001" for m in messages)
+        assert messages[1]["payload"]["manager_email"] == "mgr-001@company.com"
+
+    def test_idempotency_key_is_stable(self):
+        """Test that the same hire and kind yield the same key."""
+        first = make_outbox_message("nh-001", WELCOME_EMAIL, {})
+        second = make_outbox_message("nh-001", WELCOME_EMAIL, {"changed": True})
+
+        assert first["id"] == second["id"]
+        assert (
+            first["idempotency_key"]
+            != make_outbox_message("nh-002", WELCOME_EMAIL, {})["idempotency_key"]
+        )
+
+
+class TestOutboxRelay:
+    """Tests for relay delivery."""
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_relay_delivers_once(self, make_state):
+        """Test messages are sent once even when the graph is re-run."""
+        store = InMemoryOnboardingStore()
+        state = make_state("nh-001")
+        store.save_state_with_outbox(state, onboarding_notifications(state))
+        store.save_state_with_outbox(state, onboarding_notifications(state))
+        service = EmailService()
+        relay = OutboxRelay(store, email_service=service)
+
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            assert relay.run_until_empty() == 2
+            assert relay.run_until_empty() == 0
+
+        assert mock_send.call_count == 2
+        assert store.get_state("nh-001") is not None
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_failed_delivery_is_retried_then_marked_failed(self, make_state):
+        """Test attempts are counted and capped."""
+        store = InMemoryOnboardingStore()
+        state = make_state("nh-001")
+        message = onboarding_notifications(state)[0]
+        store.save_state_with_outbox(state, [message])
+        service = EmailService()
+        relay = OutboxRelay(store, email_service=service, max_attempts=2)
+
+        with patch.object(service, "_send", return_value=False):
+            relay.poll_once()
+            assert store.get_outbox(message["id"])["status"] == "pending"
+            relay.poll_once()
+
+        assert store.get_outbox(message["id"])["status"] == "failed"
+        assert store.get_outbox(message["id"])["attempts"] == 2
+
+    def test_lost_claim_is_skipped(self, make_state):
+        """Test that a message claimed by another relay is not delivered."""
+        store = InMemoryOnboardingStore()
+        state = make_state("nh-001")
+        store.save_state_with_outbox(state, onboarding_notifications(state)[:1])
+        pending = store.list_pending_outbox(10, "2030-01-01T00:00:00")
+        store.claim_outbox(pending[0], "2030-01-01T00:01:00")  # another relay wins
+
+        email_service = MagicMock()
+        assert store.claim_outbox(pending[0], "2030-01-01T00:01:00") is None
+        assert OutboxRelay(store, email_service=email_service).poll_once() == 0
+        email_service.send_message.assert_not_called()
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_crash_mid_send_is_not_resent(self, make_state):
+        """Test a message marked delivering is not picked up by another relay."""
+        store = InMemoryOnboardingStore()
+        state = make_state("nh-001")
+        message = onboarding_notifications(state)[0]
+        store.save_state_with_outbox(state, [message])
+        crashed = EmailService()
+
+        with patch.object(crashed, "_send", side_effect=SystemExit):
+            try:
+                OutboxRelay(store, email_service=crashed, lease_seconds=-1).poll_once()
+            except SystemExit:
+                pass
+
+        assert store.get_outbox(message["id"])["status"] == "delivering"
+        email_service = MagicMock()
+        assert OutboxRelay(store, email_service=email_service).poll_once() == 0
+        email_service.send_message.assert_not_called()
+
+    def test_expired_claim_is_not_sent_by_the_old_relay(self, make_state):
+        """Test a relay whose lease was taken over does not send."""
+        store = InMemoryOnboardingStore()
+        state = make_state("nh-001")
+        message = onboarding_notifications(state)[0]
+        store.save_state_with_outbox(state, [message])
+        claimed = store.claim_outbox(store.get_outbox(message["id"]), "2000-01-01T00:00:00")
+        store.claim_outbox(claimed, "2030-01-01T00:00:00")  # lease expired, another relay wins
+
+        email_service = MagicMock()
+        assert OutboxRelay(store, email_service=email_service)._mark_delivering(claimed) is None
+        email_service.send_message.assert_not_called()
+
+
+class TestEmailIdempotency:
+    """Tests for duplicate suppression in EmailService."""
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_same_key_is_sent_once(self):
+        """Test that a repeated idempotency key is skipped."""
+        service = EmailService()
+
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            service.send_welcome_email("Jane", "jane@example.com", "2026-03-01", "key-1")
+            service.send_welcome_email("Jane", "jane@example.com", "2026-03-01", "key-1")
+
+        assert mock_send.call_count == 1
+
+    @patch.dict("os.environ", {"EMAIL_ENABLED": "false"})
+    def test_manager_notifications_in_a_batch_become_a_digest(self, make_state):
+        """Test that a cohort sharing a manager gets one manager email."""
+        store = InMemoryOnboardingStore()
+        for i in range(4):
+            state = make_state(f"nh-{i}")
+            store.save_state_with_outbox(state, onboarding_notifications(state))
+        service = EmailService()
+
+        with patch.object(service, "_send", return_value=True) as mock_send:
+            assert OutboxRelay(store, email_service=service).run_until_empty() == 8
+
+        subjects = [call[0][0].subject for call in mock_send.call_args_list]
+        assert subjects.count("New Team Members: 4 people joining your team") == 1
+        assert len(subjects) == 5
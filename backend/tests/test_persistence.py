@@ -0,0 +1,65 @@
+"""Tests for saving graph results."""
+
+from datetime import datetime
+
+import pytest
+from backend.integrations import ledger, search, store
+from backend.integrations.ledger import TaskLedger
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.persistence import after_run, persist_created, serialize_state
+from backend.integrations.scheduler import ManualClock, PhaseScheduler
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    """Fresh in-memory store behind the store, ledger and search singletons."""
+    memory = InMemoryOnboardingStore()
+    monkeypatch.setattr(store, "_store", memory)
+    monkeypatch.setattr(ledger, "_task_ledger", None)
+    monkeypatch.setattr(search, "_onboarding_search", None)
+    return memory
+
+
+@pytest.fixture
+def failing_ledger(monkeypatch):
+    """Task ledger whose every write fails."""
+
+    def record(self, before, after, actor=None):
+        raise RuntimeError("ledger unavailable")
+
+    monkeypatch.setattr(TaskLedger, "record", record)
+
+
+class TestPersistence:
+    """Tests for work done after a graph run is saved."""
+
+    def test_created_hire_kept_when_ledger_fails(self, memory_store, failing_ledger, make_state):
+        """Test a ledger failure after the save neither fails the create nor skips the index."""
+        state = make_state("nh-1", new_hire_name="Ada Lovelace", start_date="2099-03-01")
+        result = serialize_state({**state, "completed_tasks": ["hr-001"]})
+
+        assert persist_created(state, result) is result
+        assert memory_store.get_state("nh-1")["completed_tasks"] == ["hr-001"]
+        assert memory_store.get_timer("timer-nh-1") is not None
+        hits = search.get_onboarding_search().index.search("ada")
+        assert [hit["new_hire_id"] for hit in hits] == ["nh-1"]
+
+    def test_scheduler_advances_every_hire_when_ledger_fails(
+        self, memory_store, failing_ledger, make_state
+    ):
+        """Test a failing ledger write does not stop the rest of the batch."""
+        scheduler = PhaseScheduler(
+            memory_store,
+            lambda states: [{**s, "current_phase": "active_preparation"} for s in states],
+            clock=ManualClock(datetime(2026, 2, 1, 9)),
+            after_save=after_run,
+        )
+        for new_hire_id in ("nh-1", "nh-2"):
+            state = make_state(new_hire_id, start_date="2026-03-01")
+            memory_store.create_state(state)
+            scheduler.schedule(state)
+        scheduler.clock.advance(days=15)
+
+        assert scheduler.tick() == 2
+        assert memory_store.get_state("nh-1")["current_phase"] == "active_preparation"
+        assert memory_store.get_state("nh-2")["current_phase"] == "active_preparation"
@@ -0,0 +1,121 @@
+"""Tests for change-feed driven projections."""
+
+from datetime import date
+
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.projections import (
+    ChangeFeedProcessor,
+    InMemoryLeaseStore,
+    OnboardingProjections,
+)
+
+
+def _task(task_id, category, status, due_date):
+    return {
+        "id": task_id,
+        "name": task_id,
+        "category": category,
+        "status": status,
+        "assigned_to": None,
+        "due_date": due_date,
+        "completed_at": None,
+        "notes": "",
+    }
+
+
+class TestOnboardingProjections:
+    """Tests for incremental aggregate maintenance."""
+
+    def test_counts_per_phase_and_department(self, make_state):
+        """Test phase x department counts."""
+        projections = OnboardingProjections()
+        projections.apply(make_state("a", current_phase="immediate_prep"))
+        projections.apply(make_state("b", current_phase="immediate_prep", department="Sales"))
+        projections.apply(make_state("c"))
+
+        assert projections.count("immediate_prep") == 2
+        assert projections.count("immediate_prep", "Sales") == 1
+        assert projections.count("pre_onboarding", "Engineering") == 1
+
+    def test_update_replaces_previous_contribution(self, make_state):
+        """Test that re-applying a document moves its counts."""
+        projections = OnboardingProjections()
+        projections.apply(make_state("a", manager_id="mgr-1"))
+        projections.apply(make_state("a", manager_id="mgr-2", current_phase="post_start"))
+
+        assert projections.count("pre_onboarding") == 0
+        assert projections.count("post_start") == 1
+        assert dict(projections.hires_per_manager) == {"mgr-2": 1}
+
+    def test_overdue_tasks_per_category(self, make_state):
+        """Test overdue counts use open tasks due before the cutoff."""
+        projections = OnboardingProjections()
+        projections.apply(
+            make_state(
+                "a",
+                tasks=[
+                    _task("it-001", "it", "pending", "2026-01-10"),
+                    _task("it-002", "it", "completed", "2026-01-10"),
+                    _task("hr-001", "hr", "in_progress", "2026-03-01"),
+                ],
+            )
+        )
+
+        assert projections.overdue_tasks_per_category(date(2026, 2, 1)) == {"it": 1}
+        assert projections.overdue_tasks_per_category(date(2026, 4, 1)) == {"it": 1, "hr": 1}
+
+    def test_remove_drops_document(self, make_state):
+        """Test removing a deleted document."""
+        projections = OnboardingProjections()
+        projections.apply(make_state("a"))
+        projections.remove("a")
+
+        assert projections.snapshot()["hires_per_manager"] == {}
+
+
+class TestChangeFeedProcessor:
+    """Tests for the change feed consumer."""
+
+    def test_processes_feed_and_checkpoints(self, make_state):
+        """Test batches are applied and the lease advances."""
+        store = InMemoryOnboardingStore()
+        for i in range(5):
+            store.create_state(make_state(f"nh-{i}", department="Sales" if i % 2 else "IT"))
+        leases = InMemoryLeaseStore()
+        projections = OnboardingProjections()
+        processor = ChangeFeedProcessor(store, projections, lease_store=leases, batch_size=2)
+
+        applied = processor.run_until_caught_up()
+
+        assert applied == 5
+        assert projections.count("pre_onboarding", "IT") == 3
+        assert leases.load("onboarding-projections") is not None
+
+    def test_resumes_from_lease(self, make_state):
+        """Test a processor resumes from its checkpointed lease between batches."""
+        store = InMemoryOnboardingStore()
+        leases = InMemoryLeaseStore()
+        projections = OnboardingProjections()
+        processor = ChangeFeedProcessor(store, projections, lease_store=leases)
+        store.create_state(make_state("nh-1"))
+        processor.run_until_caught_up()
+
+        store.create_state(make_state("nh-2"))
+
+        assert processor.process_batch() == 1
+        assert projections.count("pre_onboarding") == 2
+
+    def test_new_processor_replays_from_the_beginning(self, make_state):
+        """Test a restarted processor rebuilds its empty projections despite a saved lease."""
+        store = InMemoryOnboardingStore()
+        leases = InMemoryLeaseStore()
+        store.create_state(make_state("nh-1"))
+        ChangeFeedProcessor(store, lease_store=leases).run_until_caught_up()
+
+        store.create_state(make_state("nh-2"))
+        projections = OnboardingProjections()
+        restarted = ChangeFeedProcessor(store, projections, lease_store=leases)
+
+        assert restarted.run_until_caught_up() == 2
+        assert projections.count("pre_onboarding") == 2
+        assert restarted.process_batch() == 0
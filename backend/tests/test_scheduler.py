@@ -0,0 +1,142 @@
+"""Tests for phase-boundary timers."""
+
+from datetime import datetime
+
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.scheduler import ManualClock, PhaseScheduler, make_phase_timer
+
+
+def _advance_to(phase):
+    """Graph stand-in that moves every state to ``phase``."""
+    calls = []
+
+    def advance(states):
+        calls.append([s["new_hire_id"] for s in states])
+        return [{**s, "current_phase": phase} for s in states]
+
+    advance.calls = calls
+    return advance
+
+
+def _scheduler(store, advance, now="2026-02-01T09:00:00"):
+    return PhaseScheduler(store, advance, clock=ManualClock(datetime.fromisoformat(now)))
+
+
+class TestPhaseTimers:
+    """Tests for timer documents and the in-memory timer heap."""
+
+    def test_timer_due_on_next_boundary(self, make_state):
+        """Test the timer points at the first boundary after today."""
+        timer = make_phase_timer(
+            make_state("nh-001", start_date="2026-03-01"), datetime(2026, 2, 1).date()
+        )
+
+        assert timer["id"] == "timer-nh-001"
+        assert timer["partitionKey"] == "nh-001"
+        assert timer["due_at"] == "2026-02-15"
+
+    def test_no_timer_after_last_boundary(self, make_state):
+        """Test post-start hires are not scheduled."""
+        state = make_state("nh-001", start_date="2026-01-01")
+
+        assert make_phase_timer(state, datetime(2026, 2, 1).date()) is None
+
+    def test_due_timers_earliest_first(self, make_state):
+        """Test only due timers are listed, in due order, skipping stale entries."""
+        store = InMemoryOnboardingStore()
+        scheduler = _scheduler(store, _advance_to("x"))
+        for new_hire_id, start in [
+            ("late", "2026-04-01"),
+            ("soon", "2026-03-05"),
+            ("sooner", "2026-02-10"),
+        ]:
+            scheduler.schedule(make_state(new_hire_id, start_date=start))
+        store.save_timer({**store.get_timer("timer-late"), "due_at": "2026-02-12"})
+
+        due = store.list_due_timers("2026-02-13", "2026-02-13T00:00:00", 10)
+
+        assert [t["new_hire_id"] for t in due] == ["sooner", "late"]
+        assert len(store.list_due_timers("2026-02-13", "2026-02-13T00:00:00", 10)) == 2
+
+
+class TestPhaseScheduler:
+    """Tests for waking and advancing due hires."""
+
+    def test_wakes_only_due_hires_and_rearms(self, make_state):
+        """Test a tick advances due hires in one batch and schedules the next boundary."""
+        store = InMemoryOnboardingStore()
+        advance = _advance_to("active_preparation")
+        scheduler = _scheduler(store, advance)
+        for new_hire_id, start in [
+            ("nh-1", "2026-03-01"),
+            ("nh-2", "2026-03-02"),
+            ("nh-3", "2026-04-01"),
+        ]:
+            state = make_state(new_hire_id, start_date=start)
+            store.create_state(state)
+            scheduler.schedule(state)
+
+        assert scheduler.tick() == 0
+        scheduler.clock.advance(days=15)
+
+        assert scheduler.run_until_idle() == 2
+        assert advance.calls == [["nh-1", "nh-2"]]
+        assert store.get_state("nh-1")["current_phase"] == "active_preparation"
+        assert store.get_state("nh-3")["current_phase"] == "pre_onboarding"
+        assert store.get_timer("timer-nh-1")["due_at"] == "2026-02-22"
+
+    def test_timer_deleted_after_last_boundary(self, make_state):
+        """Test hires past their start date drop out of the schedule."""
+        store = InMemoryOnboardingStore()
+        scheduler = _scheduler(store, _advance_to("post_start"), now="2026-02-27T09:00:00")
+        state = make_state("nh-1", start_date="2026-03-01")
+        store.create_state(state)
+        scheduler.schedule(state)
+
+        scheduler.clock.advance(days=3)
+
+        assert scheduler.tick() == 1
+        assert store.get_timer("timer-nh-1") is None
+
+    def test_failed_run_retried_after_lease(self, make_state):
+        """Test a failing hire is held by its lease, then retried."""
+        store = InMemoryOnboardingStore()
+        outcomes = [RuntimeError("graph failed"), None]
+
+        def advance(states):
+            outcome = outcomes.pop(0)
+            return [outcome or {**s, "current_phase": "immediate_prep"} for s in states]
+
+        scheduler = _scheduler(store, advance, now="2026-02-22T09:00:00")
+        state = make_state("nh-1", start_date="2026-03-01")
+        store.create_state(state)
+        store.save_timer(make_phase_timer(state, datetime(2026, 2, 20).date()))
+
+        assert scheduler.tick() == 0
+        assert store.get_timer("timer-nh-1")["attempts"] == 1
+        assert scheduler.tick() == 0
+
+        scheduler.clock.advance(seconds=scheduler.lease_seconds + 1)
+        assert scheduler.tick() == 1
+        assert store.get_state("nh-1")["current_phase"] == "immediate_prep"
+
+    def test_after_save_sees_saved_state(self, make_state):
+        """Test the after-save hook runs per hire, after its new state is stored."""
+        store = InMemoryOnboardingStore()
+        saved = []
+        scheduler = PhaseScheduler(
+            store,
+            _advance_to("active_preparation"),
+            clock=ManualClock(datetime(2026, 2, 1, 9)),
+            after_save=lambda before, after: saved.append(
+                (before["current_phase"], store.get_state(after["new_hire_id"])["current_phase"])
+            ),
+        )
+        state = make_state("nh-1", start_date="2026-03-01")
+        store.create_state(state)
+        scheduler.schedule(state)
+        scheduler.clock.advance(days=15)
+
+        scheduler.tick()
+
+        assert saved == [("pre_onboarding", "active_preparation")]
@@ -0,0 +1,148 @@
+"""Tests for the in-memory hire search index."""
+
+from backend.integrations.local_store import InMemoryOnboardingStore
+from backend.integrations.search import OnboardingSearch, PrefixTrie, SearchIndex, tokenize
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _index(make_state):
+    index = SearchIndex()
+    index.apply(
+        make_state(
+            "nh-1",
+            new_hire_name="Priya Sharma",
+            role="Software Engineer",
+            department="Engineering",
+            manager_id="mgr-001",
+        )
+    )
+    index.apply(
+        make_state(
+            "nh-2",
+            new_hire_name="Priyanka Rao",
+            role="Account Executive",
+            department="Sales",
+            manager_id="mgr-002",
+        )
+    )
+    index.apply(
+        make_state(
+            "nh-3",
+            new_hire_name="Sam Engel",
+            role="Recruiter",
+            department="HR",
+            manager_id="mgr-001",
+        )
+    )
+    return index
+
+
+def _ids(hits):
+    return [hit["new_hire_id"] for hit in hits]
+
+
+class TestPrefixTrie:
+    """Tests for word completion."""
+
+    def test_complete_shortest_first(self):
+        """Test completions are bounded and the exact word comes first."""
+        trie = PrefixTrie()
+        for word in ("priyanka", "priya", "pri", "sam"):
+            trie.add(word)
+
+        assert trie.complete("pri", 10) == ["pri", "priya", "priyanka"]
+        assert trie.complete("pri", 2) == ["pri", "priya"]
+        assert trie.complete("x", 10) == []
+
+    def test_discard_prunes(self):
+        """Test removed words stop completing while longer words remain."""
+        trie = PrefixTrie()
+        trie.add("priya")
+        trie.add("priyanka")
+
+        trie.discard("priya")
+        assert trie.complete("pri", 10) == ["priyanka"]
+        trie.discard("priyanka")
+        assert trie._root.children == {}
+
+
+class TestSearchIndex:
+    """Tests for ranking and incremental updates."""
+
+    def test_tokenize(self):
+        """Test words are lowercased and split on punctuation."""
+        assert tokenize("Jean-Luc O'Neil, mgr-001") == ["jean", "luc", "o", "neil", "mgr", "001"]
+
+    def test_exact_word_beats_prefix(self, make_state):
+        """Test a whole-word match outranks a longer name sharing the prefix."""
+        hits = _index(make_state).search("priya")
+
+        assert _ids(hits) == ["nh-1", "nh-2"]
+        assert hits[0]["score"] > hits[1]["score"]
+        assert hits[0]["new_hire_name"] == "Priya Sharma"
+
+    def test_every_word_must_match(self, make_state):
+        """Test multi-word queries intersect, across fields."""
+        index = _index(make_state)
+
+        assert _ids(index.search("pri sales")) == ["nh-2"]
+        assert _ids(index.search("mgr 001")) == ["nh-1", "nh-3"]
+        assert _ids(index.search("sam engel")) == ["nh-3"]
+        assert index.search("priya hr") == []
+        assert index.search("   ") == []
+
+    def test_name_outranks_other_fields(self, make_state):
+        """Test a name match scores above a role or department match."""
+        assert _ids(_index(make_state).search("eng")) == ["nh-3", "nh-1"]
+
+    def test_top_k(self, make_state):
+        """Test only the best k are returned."""
+        assert _ids(_index(make_state).search("mgr", k=1)) == ["nh-1"]
+
+    def test_updates_replace_entries(self, make_state):
+        """Test an updated hire is found by new values only, and stale versions are ignored."""
+        index = _index(make_state)
+        index.apply(
+            make_state(
+                "nh-1",
+                new_hire_name="Priya Patel",
+                department="Finance",
+                updated_at="2999-01-01T00:00:00",
+            )
+        )
+        index.apply(make_state("nh-1", new_hire_name="Priya Sharma"))
+
+        assert index.search("sharma") == []
+        assert _ids(index.search("patel finance")) == ["nh-1"]
+
+        index.remove("nh-1")
+        assert index.search("patel") == []
+        assert "patel" not in index._postings
+
+
+class TestOnboardingSearch:
+    """Tests for keeping the index current from the change feed."""
+
+    def test_catches_up_when_stale(self, make_state):
+        """Test writes appear after the staleness window, without a rebuild."""
+        store = InMemoryOnboardingStore()
+        clock = FakeClock()
+        search = OnboardingSearch(store, max_staleness=1.0, clock=clock)
+        store.create_state(make_state("nh-1", new_hire_name="Priya Sharma"))
+
+        assert _ids(search.search("priya")) == ["nh-1"]
+
+        store.create_state(make_state("nh-2", new_hire_name="Priyanka Rao"))
+        assert _ids(search.search("priya")) == ["nh-1"]
+
+        clock.now += 1.0
+        assert _ids(search.search("priya")) == ["nh-1", "nh-2"]
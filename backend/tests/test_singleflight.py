@@ -0,0 +1,105 @@
+"""Tests for single-flight read coalescing."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from backend.integrations.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for sharing in-flight fetches."""
+
+    def test_concurrent_calls_share_one_fetch(self):
+        """Test threads asking for one key while it is in flight share the result."""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {"current_phase": "pre_onboarding"}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flight.do("nh-001", fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while flight.requests < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.snapshot()["coalescing_ratio"] == pytest.approx(0.8)
+
+    def test_sequential_calls_fetch_again(self):
+        """Test nothing is cached once a fetch finishes."""
+        flight = SingleFlight()
+        values = iter([1, 2])
+
+        assert flight.do("nh-001", lambda: next(values)) == 1
+        assert flight.do("nh-001", lambda: next(values)) == 2
+        assert flight.snapshot()["coalesced"] == 0
+
+    def test_errors_are_shared(self):
+        """Test waiting callers see the leader's exception."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            started.set()
+            release.wait(timeout=5)
+            raise ValueError("Onboarding not found")
+
+        errors = []
+
+        def call():
+            try:
+                flight.do("nh-404", fetch)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(timeout=5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        while flight.requests < 2:
+            time.sleep(0.001)
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert len(errors) == 2
+
+    async def test_async_calls_share_one_fetch(self):
+        """Test tasks awaiting one key share a fetch and survive a cancelled caller."""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "state"
+
+        cancelled = asyncio.ensure_future(flight.do_async("nh-001", fetch))
+        others = [asyncio.ensure_future(flight.do_async("nh-001", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await asyncio.gather(*others) == ["state"] * 3
+        assert len(calls) == 1
+        assert flight.snapshot() == {
+            "requests": 4,
+            "executions": 1,
+            "coalesced": 3,
+            "coalescing_ratio": 0.75,
+        }
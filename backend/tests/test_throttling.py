@@ -0,0 +1,132 @@
+"""Tests for client-side rate limiting and 429 retries."""
+
+import pytest
+from backend.integrations.throttling import (
+    BULK,
+    INTERACTIVE,
+    AdaptiveRateLimiter,
+    RateLimitExceeded,
+    TokenBucket,
+    call_with_retry,
+)
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep moves time forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Throttled(Exception):
+    """Stand-in for CosmosHttpResponseError(429)."""
+
+    status_code = 429
+
+    def __init__(self, retry_after_ms="100"):
+        super().__init__("Request rate is large")
+        self.headers = {"x-ms-retry-after-ms": retry_after_ms}
+
+
+class TestTokenBucket:
+    """Tests for the token bucket."""
+
+    def test_acquire_waits_for_refill(self):
+        """Test that an empty bucket sleeps until refilled."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=1, clock=clock, sleep=clock.sleep)
+
+        assert bucket.acquire()
+        assert bucket.acquire()
+        assert clock.sleeps == [pytest.approx(0.1)]
+
+    def test_reserve_is_respected(self):
+        """Test that reserved tokens cannot be taken."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=4, clock=clock, sleep=clock.sleep)
+
+        assert bucket.try_acquire(reserve=3) == 0.0
+        assert bucket.try_acquire(reserve=3) > 0
+
+    def test_acquire_timeout(self):
+        """Test that acquire gives up at the deadline."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+
+        assert bucket.acquire(timeout=0.5) is False
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for AIMD adaptation and priorities."""
+
+    def test_throttle_halves_rate_and_success_recovers(self):
+        """Test multiplicative decrease and additive increase."""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=100, increase=5, clock=clock, sleep=clock.sleep)
+
+        limiter.on_throttle(0.1)
+        assert limiter.rate == 50
+        limiter.on_success()
+        assert limiter.rate == 55
+
+    def test_bulk_paused_longer_than_interactive(self):
+        """Test that bulk callers wait out twice the retry-after hint."""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+        limiter.on_throttle(1.0)
+
+        assert limiter.acquire(INTERACTIVE, timeout=1.5)
+        assert limiter.acquire(BULK, timeout=0.5) is False
+
+
+class TestCallWithRetry:
+    """Tests for the retry loop."""
+
+    def test_retries_throttled_calls(self):
+        """Test that 429s are retried after at least the retry-after hint."""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+        outcomes = [Throttled("200"), Throttled("200"), "ok"]
+
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert call_with_retry(call, limiter) == "ok"
+        assert sum(clock.sleeps) >= 0.4
+
+    def test_gives_up_after_max_attempts(self):
+        """Test RateLimitExceeded once attempts are exhausted."""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+
+        def call():
+            raise Throttled()
+
+        with pytest.raises(RateLimitExceeded):
+            call_with_retry(call, limiter, max_attempts=3)
+
+    def test_other_errors_propagate(self):
+        """Test that non-429 errors are not retried."""
+        clock = FakeClock()
+        limiter = AdaptiveRateLimiter(rate=100, clock=clock, sleep=clock.sleep)
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise KeyError("missing")
+
+        with pytest.raises(KeyError):
+            call_with_retry(call, limiter)
+        assert len(calls) == 1
@@ -0,0 +1,71 @@
+"""Tests for instance warm-up and readiness."""
+
+from backend.integrations.warmup import Warmup
+
+
+class FakeClock:
+    """Clock advancing one second per reading."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class TestWarmup:
+    """Tests for running steps and reporting readiness."""
+
+    def test_ready_after_every_step(self):
+        """Test steps run in order once, with durations recorded."""
+        calls = []
+        warmup = Warmup(
+            [("store", lambda: calls.append("store")), ("search", lambda: calls.append("search"))],
+            clock=FakeClock(),
+        )
+
+        assert not warmup.ready
+        assert warmup.run() is True
+        assert warmup.run() is True
+
+        assert calls == ["store", "search"]
+        assert warmup.snapshot() == {
+            "ready": True,
+            "steps": {
+                "store": {"status": "done", "seconds": 1.0, "error": None},
+                "search": {"status": "done", "seconds": 1.0, "error": None},
+            },
+        }
+
+    def test_failed_step_is_retried(self):
+        """Test a failing step keeps the instance unready and only it is retried."""
+        calls = []
+
+        def flaky():
+            calls.append("store")
+            if len(calls) == 1:
+                raise ConnectionError("handshake timed out")
+
+        warmup = Warmup([("store", flaky), ("email", lambda: calls.append("email"))])
+
+        assert warmup.run() is False
+        snapshot = warmup.snapshot()
+        assert snapshot["steps"]["store"]["status"] == "failed"
+        assert snapshot["steps"]["store"]["error"] == "handshake timed out"
+        assert snapshot["steps"]["email"]["status"] == "done"
+
+        assert warmup.run() is True
+        assert calls == ["store", "email", "store"]
+
+    def test_start_runs_in_background(self):
+        """Test start warms on a thread and is a no-op once ready."""
+        warmup = Warmup([("store", lambda: None)])
+
+        warmup.start()
+        warmup._thread.join(timeout=5)
+        assert warmup.ready
+
+        thread = warmup._thread
+        warmup.start()
+        assert warmup._thread is thread